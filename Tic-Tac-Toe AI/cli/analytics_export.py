@@ -0,0 +1,192 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Streaming analytics export
+
+Turns game history records into two flat tables that load straight into pandas:
+- <path>_games.<ext>      one row per game (move sequence, result, duration)
+- <path>_decisions.<ext>  one row per AI decision (move, score, states, time)
+
+Records flow through generators and are written in fixed-size chunks, so
+exporting millions of self-play games runs in constant memory. Parquet output
+needs the optional pyarrow package; CSV only uses the standard library.
+
+Author: Your Name
+"""
+
+import os
+import csv
+import json
+import time
+import random
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+GAME_COLUMNS = ['game_id', 'started_at', 'moves', 'num_moves', 'result', 'duration_ms']
+DECISION_COLUMNS = ['game_id', 'ply', 'player', 'difficulty', 'move', 'score', 'states', 'time_ms']
+
+# Parquet column types, fixed up front: a chunk whose scores happen to be all
+# integers (or all None) must not decide the file's schema
+COLUMN_TYPES = {
+    'game_id': 'int64', 'started_at': 'string', 'moves': 'string', 'num_moves': 'int64',
+    'result': 'string', 'duration_ms': 'float64', 'ply': 'int64', 'player': 'string',
+    'difficulty': 'string', 'move': 'int64', 'score': 'float64', 'states': 'int64',
+    'time_ms': 'float64'
+}
+
+FORMAT_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet'}
+
+
+def iter_history(path: str) -> Iterator[Dict]:
+    """Yield game records from a JSON-lines history file, one at a time"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_self_play(ai, games: int, seed: Optional[int] = None, random_plies: int = 1) -> Iterator[Dict]:
+    """Yield freshly generated AI-vs-AI game records"""
+    rng = random.Random(seed)
+    for _ in range(games):
+        yield ai.play_self_game(rng, random_plies=random_plies)
+
+
+def iter_rows(records: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+    """Flatten records into ('game', row) and ('decision', row) items"""
+    for game_id, record in enumerate(records):
+        moves = record.get('moves', [])
+        yield 'game', {
+            'game_id': game_id,
+            'started_at': record.get('started_at', ''),
+            'moves': ' '.join(str(m) for m in moves),
+            'num_moves': len(moves),
+            'result': record.get('result', ''),
+            'duration_ms': round(record.get('duration_ms', 0.0), 3)
+        }
+        for decision in record.get('decisions', []):
+            yield 'decision', {
+                'game_id': game_id,
+                'ply': decision.get('ply', 0),
+                'player': decision.get('player', 'O'),
+                'difficulty': decision.get('difficulty', 'hard'),
+                'move': decision['move'],
+                'score': decision['score'],
+                'states': decision['states'],
+                'time_ms': round(decision['time'], 3)
+            }
+
+
+class CSVTableWriter:
+    """Append row chunks to a CSV file"""
+
+    def __init__(self, path: str, columns: List[str], types: Optional[Dict[str, str]] = None):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write_chunk(self, rows: List[Dict]):
+        """Write a chunk of rows"""
+        self.writer.writerows(rows)
+
+    def close(self):
+        """Flush and close the file"""
+        self.file.close()
+
+
+class ParquetTableWriter:
+    """Append row chunks to a Parquet file as row groups"""
+
+    def __init__(self, path: str, columns: List[str], types: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            path: Output file
+            columns: Column names in file order
+            types: Arrow type names for columns not in COLUMN_TYPES (default: string)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.path = path
+        self.columns = columns
+        self.pq = pq
+        types = {**COLUMN_TYPES, **(types or {})}
+        self.schema = pa.schema([(col, pa.type_for_alias(types.get(col, 'string'))) for col in columns])
+        self.writer = None
+
+    def write_chunk(self, rows: List[Dict]):
+        """Write a chunk of rows as one row group"""
+        table = self.pa.Table.from_pydict({col: [row[col] for row in rows] for col in self.columns},
+                                          schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        """Finish the file"""
+        if self.writer is None:
+            # Nothing was written: still leave a valid, empty file behind
+            self.pq.write_table(self.schema.empty_table(), self.path)
+        else:
+            self.writer.close()
+
+
+WRITERS = {'csv': CSVTableWriter, 'parquet': ParquetTableWriter}
+
+
+def export_records(records: Iterable[Dict], path: str, fmt: str = 'csv',
+                   chunk_size: int = 10000) -> Dict:
+    """
+    Stream game records into a games table and a decisions table
+
+    Args:
+        records: Iterable of game records (see TicTacToeAI.game_record)
+        path: Output path prefix; '_games' and '_decisions' are appended
+        fmt: 'csv' or 'parquet'
+        chunk_size: Rows buffered per table before each write
+
+    Returns:
+        Dictionary with 'games', 'decisions', 'files' and 'time' (seconds)
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    start_time = time.time()
+    base, ext = os.path.splitext(path)
+    if ext.lower() not in FORMAT_EXTENSIONS.values():
+        base = path
+    ext = FORMAT_EXTENSIONS[fmt]
+    paths = {'game': f"{base}_games{ext}", 'decision': f"{base}_decisions{ext}"}
+
+    writers = {
+        'game': WRITERS[fmt](paths['game'], GAME_COLUMNS),
+        'decision': WRITERS[fmt](paths['decision'], DECISION_COLUMNS)
+    }
+    buffers = {'game': [], 'decision': []}
+    counts = {'game': 0, 'decision': 0}
+
+    try:
+        for table, row in iter_rows(records):
+            buffers[table].append(row)
+            counts[table] += 1
+            if len(buffers[table]) >= chunk_size:
+                writers[table].write_chunk(buffers[table])
+                buffers[table] = []
+
+        for table, rows in buffers.items():
+            if rows:
+                writers[table].write_chunk(rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        'games': counts['game'],
+        'decisions': counts['decision'],
+        'files': [paths['game'], paths['decision']],
+        'time': time.time() - start_time
+    }
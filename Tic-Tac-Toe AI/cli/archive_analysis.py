@@ -0,0 +1,405 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Bulk game analysis
+
+Annotates every move of a whole file of games with solved scores and a
+label (best, inaccuracy, blunder), solving each position only once:
+- the positions before every move of every game are packed into one int64
+  each (X bits, then O bits, so boards of up to 31 cells: 5x5), reduced to their symmetry class with NumPy
+  and deduplicated across the whole archive
+- every unique position has all its moves scored once (full-depth search
+  on 3x3, depth-capped on larger boards), in parallel on a process pool
+  whose workers keep their transposition tables between exact solves, or
+  share one in shared memory (--shared-tt)
+- solved positions can be kept in a cache file and reused by later runs
+- annotations are streamed out in chunks as CSV or Parquet
+
+A move is a blunder when it throws away the result (win to draw or loss,
+draw to loss), an inaccuracy when it keeps the result but scores worse
+than the best move (a slower win, a quicker loss, a worse heuristic score).
+
+Usage:
+    python cli/archive_analysis.py games.ttt --out games_analysis.csv
+    python cli/archive_analysis.py tictactoe_matrix_history.jsonl --out analysis.parquet --format parquet
+    python cli/archive_analysis.py selfplay_4x4 --size 4 --depth 4 --workers 4 --cache solved_4x4.npz
+
+Author: Your Name
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import analytics_export
+import game_records
+import self_play
+from search_cache import SharedTranspositionTable
+from state_space import permute, permute_tables
+from tic_tac_toe_matrix_cli import Colors, MatrixEffect, TicTacToeAI
+from zobrist import symmetry_permutations
+
+ANNOTATION_COLUMNS = ['game_id', 'ply', 'player', 'move', 'score', 'best_move', 'best_score', 'loss', 'label']
+ANNOTATION_TYPES = {'best_move': 'int64', 'best_score': 'float64', 'loss': 'float64', 'label': 'string'}
+LABELS = ('best', 'inaccuracy', 'blunder')
+
+# Unique positions solved per worker task
+SOLVE_CHUNK = 256
+
+# Largest board whose X and O bits fit together in one int64 key
+MAX_CELLS = 31
+
+# Engine of the current worker process, built by init_worker()
+worker_ai = None
+
+
+def load_games(path: str, size: int) -> np.ndarray:
+    """
+    Games as a structured record array (see game_records.record_dtype)
+
+    path may be a binary archive (memory-mapped), a JSON-lines history file
+    or a --generate directory of shards.
+    """
+    if os.path.isdir(path):
+        return game_records.encode_records(list(self_play.iter_shards(path)), size * size)
+    try:
+        archive = game_records.GameArchive(path)
+    except ValueError:
+        return game_records.encode_records(list(analytics_export.iter_history(path)), size * size)
+    if archive.max_moves != size * size:
+        raise ValueError(f"{path} holds {archive.max_moves}-cell games, not {size}x{size}")
+    return archive.records
+
+
+def position_keys(games: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Canonical key of the position before every move, and the symmetry used
+
+    Returns:
+        keys: (games, cells) int64, -1 after the last move of a game
+        symmetries: (games, cells) uint8, the symmetry s mapping the real
+                    board onto the canonical one (cell c -> perms[s][c])
+    """
+    cells = size * size
+    if cells > MAX_CELLS:
+        raise ValueError(f"Position keys hold at most {MAX_CELLS} cells, not {size}x{size}")
+    tables = [permute_tables(perm, cells) for perm in symmetry_permutations(size)]
+    moves = games['moves'].astype(np.int64)
+    num_moves = games['num_moves'].astype(np.int64)
+    keys = np.full((len(games), cells), -1, dtype=np.int64)
+    symmetries = np.zeros((len(games), cells), dtype=np.uint8)
+
+    x = np.zeros(len(games), dtype=np.int64)
+    o = np.zeros(len(games), dtype=np.int64)
+    rows = np.arange(len(games))
+    for ply in range(cells):
+        active = num_moves > ply
+        if not active.any():
+            break
+        transformed = np.stack([permute(x, table) | (permute(o, table) << cells) for table in tables])
+        best = transformed.argmin(axis=0)
+        keys[active, ply] = transformed[best, rows][active]
+        symmetries[active, ply] = best[active]
+
+        bit = np.where(active, np.left_shift(1, np.where(active, moves[:, ply], 0)), 0)
+        if ply % 2 == 0:
+            x |= bit
+        else:
+            o |= bit
+    return keys, symmetries
+
+
+def decode_position(key: int, cells: int) -> Tuple[List[str], str]:
+    """Board and side to move of a packed position"""
+    board = [''] * cells
+    for cell in range(cells):
+        if key >> cell & 1:
+            board[cell] = 'X'
+        elif key >> (cell + cells) & 1:
+            board[cell] = 'O'
+    return board, 'X' if board.count('X') == board.count('O') else 'O'
+
+
+def init_worker(size: int, win_length: Optional[int], max_depth: Optional[int], shared_tt: Optional[str] = None):
+    """Process pool initializer: build this worker's engine once"""
+    global worker_ai
+    worker_ai = TicTacToeAI(size=size, win_length=win_length, max_depth=max_depth)
+    if shared_tt is not None:
+        worker_ai.tt = SharedTranspositionTable(name=shared_tt)
+
+
+def solve_chunk(keys: List[int]) -> Tuple[np.ndarray, int]:
+    """
+    Score every move of each packed position
+
+    Returns:
+        (positions, cells) scores from O's point of view (NaN on occupied
+        cells) and the number of nodes searched
+    """
+    ai = worker_ai
+    scores = np.full((len(keys), ai.cells), np.nan)
+    states = [0]
+    for i, key in enumerate(keys):
+        board, player = decode_position(key, ai.cells)
+        # Exact scores never depend on the table; depth-capped ones would pick
+        # up deeper entries left by other positions, so a private table starts
+        # afresh to keep the annotations independent of the scheduling
+        if ai.max_depth is None:
+            ai.tt.new_search()
+        else:
+            ai.tt.clear()
+        for move, score in ai.score_root_moves(player, ai.max_depth, states, board).items():
+            scores[i, move] = score
+    return scores, states[0]
+
+
+def load_cache(path: str, variant: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted keys and scores of a solved-position cache (empty if missing or of another variant)"""
+    if path and os.path.exists(path):
+        data = np.load(path)
+        if all(int(data[name]) == value for name, value in variant.items()):
+            return data['keys'], data['scores']
+    return np.zeros(0, dtype=np.int64), np.zeros((0, variant['cells']))
+
+
+def save_cache(path: str, variant: Dict, keys: np.ndarray, scores: np.ndarray):
+    """Write solved positions (sorted by key) for later runs"""
+    order = np.argsort(keys)
+    np.savez_compressed(path, keys=keys[order], scores=scores[order], **variant)
+
+
+def solve_positions(unique: np.ndarray, size: int, win_length: Optional[int], max_depth: Optional[int],
+                    workers: int = 1, cache: Optional[str] = None, shared_tt_mb: Optional[float] = None,
+                    on_chunk: Optional[Callable[[int], None]] = None) -> Tuple[np.ndarray, Dict]:
+    """
+    Scores of every move of every unique position, solving each one once
+
+    Args:
+        unique: Sorted canonical position keys
+        size, win_length: Board variant
+        max_depth: Search depth cap (None = solve exactly)
+        workers: Worker processes (1 = solve in this process)
+        cache: Solved-position cache file, read and updated (optional)
+        shared_tt_mb: One shared transposition table for all workers (optional)
+        on_chunk: Called with the number of positions solved so far
+
+    Returns:
+        (positions, cells) scores from O's point of view, and a dictionary
+        with 'solved', 'cached', 'nodes' and 'time' (seconds)
+    """
+    cells = size * size
+    variant = {'cells': cells, 'win_length': win_length or size, 'depth': -1 if max_depth is None else max_depth}
+    scores = np.full((len(unique), cells), np.nan)
+    cached_keys, cached_scores = load_cache(cache, variant)
+
+    # Positions already in the cache
+    found = np.zeros(len(unique), dtype=bool)
+    if len(cached_keys):
+        slots = np.minimum(np.searchsorted(cached_keys, unique), len(cached_keys) - 1)
+        found = cached_keys[slots] == unique
+        scores[found] = cached_scores[slots[found]]
+    todo = np.flatnonzero(~found)
+
+    start = time.perf_counter()
+    chunks = [todo[lo:lo + SOLVE_CHUNK] for lo in range(0, len(todo), SOLVE_CHUNK)]
+    nodes = 0
+    solved = 0
+    parallel = workers > 1 and len(chunks) > 1
+    shared_tt = SharedTranspositionTable(shared_tt_mb) if shared_tt_mb and parallel else None
+    try:
+        if parallel:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(size, win_length, max_depth, shared_tt and shared_tt.name)) as pool:
+                results = pool.map(solve_chunk, [unique[chunk].tolist() for chunk in chunks])
+                for chunk, (chunk_scores, chunk_nodes) in zip(chunks, results):
+                    scores[chunk] = chunk_scores
+                    nodes += chunk_nodes
+                    solved += len(chunk)
+                    if on_chunk:
+                        on_chunk(solved)
+        else:
+            init_worker(size, win_length, max_depth)
+            for chunk in chunks:
+                chunk_scores, chunk_nodes = solve_chunk(unique[chunk].tolist())
+                scores[chunk] = chunk_scores
+                nodes += chunk_nodes
+                solved += len(chunk)
+                if on_chunk:
+                    on_chunk(solved)
+    finally:
+        if shared_tt is not None:
+            shared_tt.unlink()
+
+    if cache and len(todo):
+        save_cache(cache, variant, np.concatenate([cached_keys, unique[todo]]),
+                   np.concatenate([cached_scores, scores[todo]]))
+    return scores, {'solved': len(todo), 'cached': int(found.sum()), 'nodes': nodes,
+                    'time': time.perf_counter() - start}
+
+
+def outcome(score: np.ndarray) -> np.ndarray:
+    """+1 win, 0 draw or undecided, -1 loss (for the side whose point of view score is)"""
+    return np.where(score >= 1, 1, np.where(score <= -1, -1, 0))
+
+
+def iter_annotations(games: np.ndarray, size: int, keys: np.ndarray, symmetries: np.ndarray,
+                     unique: np.ndarray, scores: np.ndarray, chunk_size: int = 10000) -> Iterator[List[Dict]]:
+    """Yield chunks of annotation rows (ANNOTATION_COLUMNS), game by game"""
+    cells = size * size
+    perms = np.array(symmetry_permutations(size))
+    inverse = np.argsort(perms, axis=1)
+    games_per_chunk = max(1, chunk_size // cells)
+
+    for lo in range(0, len(games), games_per_chunk):
+        chunk_keys = keys[lo:lo + games_per_chunk]
+        game, ply = np.nonzero(chunk_keys >= 0)
+        ids = np.searchsorted(unique, chunk_keys[game, ply])
+        s = symmetries[lo:lo + games_per_chunk][game, ply]
+        move = games['moves'][lo:lo + games_per_chunk][game, ply].astype(np.int64)
+
+        # Scores are from O's point of view; sign turns them into the mover's
+        sign = np.where(ply % 2 == 0, -1.0, 1.0)
+        row_scores = scores[ids] * sign[:, None]
+        best_cell = np.nanargmax(row_scores, axis=1)
+        best = row_scores[np.arange(len(ids)), best_cell]
+        played = row_scores[np.arange(len(ids)), perms[s, move]]
+        loss = best - played
+        label = np.where(outcome(played) < outcome(best), 2, np.where(loss > 1e-9, 1, 0))
+        best_move = inverse[s, best_cell]
+
+        yield [{
+            'game_id': lo + int(game[i]),
+            'ply': int(ply[i]),
+            'player': 'X' if ply[i] % 2 == 0 else 'O',
+            'move': int(move[i]),
+            'score': float(played[i] * sign[i]),
+            'best_move': int(best_move[i]),
+            'best_score': float(best[i] * sign[i]),
+            'loss': round(float(loss[i]), 6),
+            'label': LABELS[label[i]]
+        } for i in range(len(ids))]
+
+
+def analyse_archive(path: str, out: str, size: int = 3, win_length: Optional[int] = None,
+                    max_depth: Optional[int] = None, fmt: str = 'csv', workers: int = 1,
+                    cache: Optional[str] = None, shared_tt_mb: Optional[float] = None,
+                    chunk_size: int = 10000, on_chunk: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    Annotate every move of a file of games
+
+    Args:
+        path: Binary archive, JSON-lines history file or --generate directory
+        out: Annotation file (CSV or Parquet)
+        size, win_length: Board variant of the games
+        max_depth: Search depth cap (None = solve exactly)
+        fmt: 'csv' or 'parquet'
+        workers: Worker processes for solving
+        cache: Solved-position cache file (optional)
+        shared_tt_mb: Shared transposition table size for the workers (optional)
+        chunk_size: Annotation rows per write
+        on_chunk: Called with the number of positions solved so far
+
+    Returns:
+        Dictionary with 'games', 'moves', 'unique' positions, 'dedup_ratio',
+        'solved', 'cached', 'nodes', 'positions_per_sec' (solving), the
+        'labels' counts and the 'time' of each stage
+    """
+    if fmt not in analytics_export.WRITERS:
+        raise ValueError(f"Unknown annotation format: {fmt}")
+    if size * size > MAX_CELLS:
+        raise ValueError(f"Bulk analysis supports boards of up to {MAX_CELLS} cells (5x5), not {size}x{size}")
+    timings = {}
+
+    start = time.perf_counter()
+    games = load_games(path, size)
+    keys, symmetries = position_keys(games, size)
+    unique = np.unique(keys[keys >= 0])
+    timings['dedup'] = time.perf_counter() - start
+
+    scores, solve = solve_positions(unique, size, win_length, max_depth, workers=workers, cache=cache,
+                                    shared_tt_mb=shared_tt_mb, on_chunk=on_chunk)
+    timings['solve'] = solve['time']
+
+    start = time.perf_counter()
+    labels = dict.fromkeys(LABELS, 0)
+    writer = analytics_export.WRITERS[fmt](out, ANNOTATION_COLUMNS, ANNOTATION_TYPES)
+    try:
+        for rows in iter_annotations(games, size, keys, symmetries, unique, scores, chunk_size):
+            if rows:
+                writer.write_chunk(rows)
+            for row in rows:
+                labels[row['label']] += 1
+    finally:
+        writer.close()
+    timings['annotate'] = time.perf_counter() - start
+
+    moves = int((keys >= 0).sum())
+    return {
+        'games': len(games),
+        'moves': moves,
+        'unique': len(unique),
+        'dedup_ratio': moves / len(unique) if len(unique) else 0.0,
+        'solved': solve['solved'],
+        'cached': solve['cached'],
+        'nodes': solve['nodes'],
+        'positions_per_sec': solve['solved'] / solve['time'] if solve['time'] > 0 else 0.0,
+        'labels': labels,
+        'time': timings
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Annotate a file of games from the command line"""
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe bulk game analysis")
+    parser.add_argument('games', help="binary archive, JSON-lines history file or --generate directory")
+    parser.add_argument('--out', default=None, help="annotation file (default: <games>_analysis.<format>)")
+    parser.add_argument('--format', choices=list(analytics_export.WRITERS), default='csv')
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, default=None)
+    parser.add_argument('--depth', type=int, default=None,
+                        help="search depth cap (default: exact on 3x3, 4 on larger boards)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--cache', default=None, metavar='PATH', help="solved-position cache (.npz) to reuse")
+    parser.add_argument('--shared-tt', type=float, default=None, metavar='MB',
+                        help="one transposition table of MB megabytes shared by the workers; with a "
+                             "depth cap, scores may then use deeper entries left by other positions")
+    args = parser.parse_args(argv)
+    if args.size * args.size > MAX_CELLS:
+        parser.error(f"--size {args.size}: boards of up to {MAX_CELLS} cells (5x5) are supported")
+
+    depth = args.depth if args.depth is not None or args.size == 3 else 4
+    out = args.out or f"{os.path.splitext(args.games.rstrip(os.sep))[0]}_analysis" \
+                      f"{analytics_export.FORMAT_EXTENSIONS[args.format]}"
+
+    MatrixEffect.print_status(f"ANALYSING {args.games} → {out}", Colors.NEON_GREEN)
+
+    def report(solved: int):
+        if solved % (SOLVE_CHUNK * 40) < SOLVE_CHUNK:
+            MatrixEffect.print_terminal_prompt(f"SOLVED {solved:,} POSITIONS")
+
+    summary = analyse_archive(args.games, out, size=args.size, win_length=args.win_length, max_depth=depth,
+                              fmt=args.format, workers=args.workers or os.cpu_count() or 1,
+                              cache=args.cache, shared_tt_mb=args.shared_tt, on_chunk=report)
+
+    timings = summary['time']
+    MatrixEffect.print_terminal_prompt(
+        f"{summary['games']:,} GAMES • {summary['moves']:,} MOVES • {summary['unique']:,} UNIQUE POSITIONS • "
+        f"DEDUP {Colors.NEON_GREEN}{summary['dedup_ratio']:.1f}x{Colors.RESET} ({timings['dedup']:.2f}s)"
+    )
+    MatrixEffect.print_terminal_prompt(
+        f"SOLVED {summary['solved']:,} • CACHED {summary['cached']:,} • {summary['nodes']:,} NODES • "
+        f"{Colors.NEON_GREEN}{summary['positions_per_sec']:,.0f} POSITIONS/S{Colors.RESET} ({timings['solve']:.2f}s)"
+    )
+    labels = summary['labels']
+    MatrixEffect.print_terminal_prompt(
+        f"BEST {labels['best']:,} • INACCURACY {labels['inaccuracy']:,} • "
+        f"{Colors.NEON_PINK}BLUNDER {labels['blunder']:,}{Colors.RESET} ({timings['annotate']:.2f}s)"
+    )
+    MatrixEffect.print_status(f"ANNOTATIONS WRITTEN → {out}", Colors.NEON_GREEN)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Benchmark suite
+
+Measures the engine on a fixed set of positions so that search changes can
+be compared run to run:
+- search:  nodes and time per position for minimax with and without pruning
+           and symmetry reduction
+- drivers: nodes and time per search strategy (alpha-beta, PVS, aspiration
+           windows, MTD(f)), checking every score against plain minimax
+- neural:  self-play data generation, training and inference throughput
+- hashing: Zobrist key collision rates and cost per node versus hashing
+           a tuple of the board
+- threats: forced wins found by threat-space search on k-in-a-row
+           positions: the threat line, and nodes versus the alpha-beta
+           search needed to prove the same win
+- ultimate: Ultimate tic-tac-toe move generation (perft) and engine
+           search speed on random mid-game positions, against the
+           published NPS_TARGET
+
+Usage:
+    python cli/benchmark.py                    # all suites on 3x3
+    python cli/benchmark.py --suite neural --size 4 --games 200
+    python cli/benchmark.py --suite drivers --size 4 --depth 5
+    python cli/benchmark.py --suite hashing --size 5
+    python cli/benchmark.py --suite threats --size 7 --win-length 5
+    python cli/benchmark.py --suite ultimate --depth 8
+
+Author: Your Name
+"""
+
+import time
+import random
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import neural_net
+import ultimate
+from threat_space import ThreatSpaceSearch
+from tic_tac_toe_matrix_cli import STRATEGIES, Colors, MatrixEffect, TicTacToeAI
+from zobrist import ZobristKeys
+
+# Fixed positions as move sequences from the empty board (X moves first)
+BENCH_POSITIONS = {
+    3: [[], [4], [0], [1], [4, 0], [0, 4], [0, 8], [4, 0, 8], [0, 4, 8, 2], [1, 4, 7, 3]],
+    4: [[5], [5, 6], [0, 5, 10], [5, 6, 9, 10], [0, 5, 10, 15, 3]]
+}
+
+
+def position_ai(size: int, moves: List[int], **kwargs) -> TicTacToeAI:
+    """Engine with the given moves played from the empty board"""
+    ai = TicTacToeAI(size=size, **kwargs)
+    player = 'X'
+    for move in moves:
+        ai.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+    ai.current_player = player
+    return ai
+
+
+def print_row(label: str, *values: str):
+    """One table row in Matrix colours"""
+    cells = ''.join(f"{value:>16}" for value in values)
+    print(f"    {Colors.NEON_CYAN}{label:<22}{Colors.NEON_GREEN}{cells}{Colors.RESET}")
+
+
+def bench_search(size: int, max_depth: Optional[int]) -> Dict:
+    """Nodes and time per position, with and without symmetry reduction and alpha-beta pruning"""
+    MatrixEffect.print_status("SEARCH SUITE", Colors.NEON_GREEN)
+    print_row("POSITION", "NODES", "TIME", "NODES (NO SYM)", "NODES (NO AB)", "TIME (NO AB)")
+
+    totals = {'nodes': 0, 'time': 0.0, 'nodes_nosym': 0, 'time_nosym': 0.0, 'nodes_full': 0, 'time_full': 0.0}
+    for moves in BENCH_POSITIONS.get(size, BENCH_POSITIONS[4]):
+        row = []
+        for pruning, symmetry, suffix in ((True, True, ''), (True, False, '_nosym'), (False, False, '_full')):
+            ai = position_ai(size, moves, max_depth=max_depth)
+            ai.use_pruning = pruning
+            ai.use_symmetry = symmetry
+            states = [0]
+            start = time.perf_counter()
+            ai.minimax(ai.board.copy(), ai.current_player, 0, float('-inf'), float('inf'), states)
+            elapsed = (time.perf_counter() - start) * 1000
+            row.append(f"{states[0]:,}")
+            if suffix != '_nosym':
+                row.append(f"{elapsed:.1f}ms")
+            totals['nodes' + suffix] += states[0]
+            totals['time' + suffix] += elapsed
+        print_row(' '.join(map(str, moves)) or '(empty)', *row)
+
+    print_row("TOTAL", f"{totals['nodes']:,}", f"{totals['time']:.1f}ms", f"{totals['nodes_nosym']:,}",
+              f"{totals['nodes_full']:,}", f"{totals['time_full']:.1f}ms")
+    return totals
+
+
+def bench_drivers(size: int, max_depth: Optional[int]) -> Dict:
+    """Nodes and time per search driver; every score must equal plain minimax"""
+    MatrixEffect.print_status("DRIVER SUITE", Colors.NEON_GREEN)
+    positions = BENCH_POSITIONS.get(size, BENCH_POSITIONS[4])
+
+    # Reference scores: no pruning, no symmetry, no table
+    expected = []
+    for moves in positions:
+        ai = position_ai(size, moves, max_depth=max_depth)
+        ai.use_pruning = False
+        ai.use_symmetry = False
+        ai.tt = None
+        result = ai.minimax(ai.board.copy(), ai.current_player, 0, float('-inf'), float('inf'), [0])
+        expected.append(result['score'])
+
+    print_row("STRATEGY", "NODES", "TIME", "SCORES OK")
+    results = {}
+    for strategy in STRATEGIES:
+        nodes, elapsed, matches = 0, 0.0, 0
+        for moves, score in zip(positions, expected):
+            ai = position_ai(size, moves, max_depth=max_depth, strategy=strategy)
+            states = [0]
+            start = time.perf_counter()
+            result = ai.minimax(ai.board.copy(), ai.current_player, 0, float('-inf'), float('inf'), states)
+            elapsed += (time.perf_counter() - start) * 1000
+            nodes += states[0]
+            matches += result['score'] == score
+        results[strategy] = {'nodes': nodes, 'time': elapsed, 'matches': matches}
+        print_row(strategy.upper(), f"{nodes:,}", f"{elapsed:.1f}ms", f"{matches}/{len(positions)}")
+    return results
+
+
+def bench_neural(size: int, max_depth: Optional[int], games: int, seed: int) -> Dict:
+    """Training data generation, training and inference throughput"""
+    MatrixEffect.print_status("NEURAL SUITE", Colors.NEON_GREEN)
+    ai = TicTacToeAI(size=size, max_depth=max_depth)
+    net, report = neural_net.train_from_self_play(ai, games, seed=seed)
+
+    print_row("SELF-PLAY LABELS", f"{report['samples']:,} pos", f"{report['generation_time']:.2f}s")
+    print_row("TRAINING", f"{report['positions_per_sec']:,.0f} pos/s",
+              f"v={report['value_loss']:.3f}", f"p={report['policy_loss']:.3f}")
+
+    rng = np.random.default_rng(seed)
+    boards = rng.integers(-1, 2, size=(4096, ai.cells)).astype(np.int8)
+    to_move = np.where(rng.random(4096) < 0.5, 1, -1).astype(np.int8)
+
+    results = {'train_pos_per_sec': report['positions_per_sec']}
+    for batch in (1, 64, 4096):
+        calls = max(1, 4096 // batch)
+        start = time.perf_counter()
+        for i in range(calls):
+            lo = (i * batch) % 4096
+            net.evaluate_batch(boards[lo:lo + batch], to_move[lo:lo + batch])
+        rate = calls * batch / (time.perf_counter() - start)
+        results[f'infer_batch_{batch}'] = rate
+        print_row(f"INFERENCE BATCH {batch}", f"{rate:,.0f} pos/s")
+    return results
+
+
+def sample_positions(ai: TicTacToeAI, count: int, seed: int) -> List[Tuple[str, ...]]:
+    """Distinct positions: all reachable ones on 3x3, else from random games"""
+    seen = set()
+    if ai.cells <= 9:
+        def walk(board: List[str], player: str):
+            position = tuple(board)
+            if position in seen:
+                return
+            seen.add(position)
+            if ai.check_winner(board, 'X') or ai.check_winner(board, 'O'):
+                return
+            for move in ai.get_available_moves(board):
+                board[move] = player
+                walk(board, 'O' if player == 'X' else 'X')
+                board[move] = ''
+        walk([''] * ai.cells, 'X')
+        return list(seen)
+    
+    rng = random.Random(seed)
+    while len(seen) < count:
+        board = [''] * ai.cells
+        player = 'X'
+        for move in rng.sample(range(ai.cells), ai.cells):
+            board[move] = player
+            seen.add(tuple(board))
+            if ai.check_winner(board, player) or len(seen) >= count:
+                break
+            player = 'O' if player == 'X' else 'X'
+    return list(seen)
+
+
+def slot_collision_rate(keys: List[int], bits: int) -> float:
+    """Share of keys landing on an index (low bits) that is already taken"""
+    mask = (1 << bits) - 1
+    return 1 - len({key & mask for key in keys}) / len(keys)
+
+
+def bench_hashing(size: int, positions: int, seed: int) -> Dict:
+    """Zobrist collision rates and per-node key cost against tuple hashing"""
+    MatrixEffect.print_status("HASHING SUITE", Colors.NEON_GREEN)
+    ai = TicTacToeAI(size=size)
+    zobrist = ZobristKeys(size)
+    boards = sample_positions(ai, positions, seed)
+    n = len(boards)
+    
+    # Collisions: full 64-bit keys should never collide; table indexes
+    # (low bits) should collide as often as for ideal uniform hashing
+    keys = [zobrist.key(board) for board in boards]
+    tuple_keys = [hash(board) for board in boards]
+    bits = max(8, (n - 1).bit_length())
+    expected = 1 - (2 ** bits / n) * (1 - (1 - 2 ** -bits) ** n)
+    print_row("POSITIONS", f"{n:,}", f"{bits}-BIT INDEX")
+    print_row("", "ZOBRIST", "TUPLE HASH", "UNIFORM")
+    print_row("64-BIT COLLISIONS", f"{n - len(set(keys)):,}", f"{n - len(set(tuple_keys)):,}", "0")
+    print_row("INDEX COLLISIONS", f"{slot_collision_rate(keys, bits):.2%}",
+              f"{slot_collision_rate(tuple_keys, bits):.2%}", f"{expected:.2%}")
+    
+    # Canonical keys must match exactly the classes of symmetric boards
+    classes = {min(tuple(board[perm.index(c)] for c in range(ai.cells)) for perm in zobrist.symmetries)
+               for board in boards}
+    canonical = {zobrist.canonical(zobrist.symmetric_keys(board)) for board in boards}
+    print_row("SYMMETRY CLASSES", f"{len(classes):,}", f"{len(canonical):,} KEYS")
+    
+    # Cost per node along random walks, net of the walk itself
+    rng = random.Random(seed)
+    walks = [rng.sample(range(ai.cells), ai.cells) for _ in range(max(1, 200000 // ai.cells))]
+    nodes = len(walks) * ai.cells
+    results = {'positions': n, 'collisions': n - len(set(keys))}
+    
+    def timed(label: str, step):
+        start = time.perf_counter()
+        for walk in walks:
+            board = [''] * ai.cells
+            state = 0 if label != 'symmetric' else [0] * len(zobrist.symmetries)
+            player = 'X'
+            for move in walk:
+                board[move] = player
+                state = step(state, board, move, player)
+                player = 'O' if player == 'X' else 'X'
+        return (time.perf_counter() - start) / nodes * 1e9
+    
+    values = zobrist.values
+    walk_ns = timed('walk', lambda state, board, move, player: state)
+    tuple_ns = timed('tuple', lambda state, board, move, player: hash(tuple(board))) - walk_ns
+    xor_ns = timed('zobrist', lambda state, board, move, player: state ^ values[player][move]) - walk_ns
+    sym_ns = timed('symmetric', lambda state, board, move, player: zobrist.toggle_symmetric(state, move, player)) - walk_ns
+    results.update(tuple_ns=tuple_ns, zobrist_ns=xor_ns, symmetric_ns=sym_ns)
+    print_row("NS PER NODE", f"{xor_ns:.0f}ns XOR", f"{tuple_ns:.0f}ns TUPLE", f"{sym_ns:.0f}ns 8-SYM")
+    return results
+
+
+def threat_positions(ai: TicTacToeAI, threats: ThreatSpaceSearch, count: int, seed: int,
+                     min_plies: int = 5, max_plies: int = 5) -> List[Tuple[List[str], str, Dict]]:
+    """Positions from random games where the side to move has a forced threat line of min..max plies"""
+    rng = random.Random(seed)
+    found = []
+    for _ in range(count * 500):
+        board = [''] * ai.cells
+        player = 'X'
+        for move in rng.sample(range(ai.cells), rng.randint(ai.cells // 4, ai.cells // 2)):
+            board[move] = player
+            if ai.check_winner(board, player):
+                break
+            player = 'O' if player == 'X' else 'X'
+        else:
+            win = threats.find_win(board, player)
+            if win is not None and min_plies <= win['plies'] <= max_plies:
+                found.append((board, player, win))
+                if len(found) == count:
+                    break
+    return found
+
+
+def bench_threats(size: int, win_length: int, count: int, seed: int) -> Dict:
+    """Threat-space search versus the depth alpha-beta needs to prove the same forced win"""
+    MatrixEffect.print_status(f"THREAT SUITE {size}x{size} K={win_length}", Colors.NEON_GREEN)
+    ai = TicTacToeAI(size=size, win_length=win_length)
+    threats = ThreatSpaceSearch(ai.win_patterns, ai.cells)
+    positions = threat_positions(ai, threats, count, seed)
+
+    print_row("THREAT LINE", "TSS NODES", "TSS TIME", "AB NODES", "AB TIME", "SAVED")
+    totals = {'positions': len(positions), 'tss_nodes': 0, 'tss_time': 0.0, 'ab_nodes': 0, 'ab_time': 0.0,
+              'proved': 0}
+    for board, player, _ in positions:
+        start = time.perf_counter()
+        win = threats.find_win(board, player)
+        tss_time = (time.perf_counter() - start) * 1000
+
+        # Plain alpha-beta (pruning, table, symmetry) capped at the line's length
+        ab = TicTacToeAI(size=size, win_length=win_length, max_depth=win['plies'])
+        states = [0]
+        start = time.perf_counter()
+        result = ab.minimax(board.copy(), player, 0, float('-inf'), float('inf'), states)
+        ab_time = (time.perf_counter() - start) * 1000
+        score = result['score'] if player == 'O' else -result['score']
+        totals['proved'] += score >= ab.win_score - win['plies']
+
+        totals['tss_nodes'] += win['nodes']
+        totals['tss_time'] += tss_time
+        totals['ab_nodes'] += states[0]
+        totals['ab_time'] += ab_time
+        print_row(f"{player}: " + ' '.join(map(str, win['line'])), f"{win['nodes']:,}", f"{tss_time:.1f}ms",
+                  f"{states[0]:,}", f"{ab_time:.1f}ms", f"{states[0] / win['nodes']:,.0f}x")
+
+    if positions:
+        print_row("TOTAL", f"{totals['tss_nodes']:,}", f"{totals['tss_time']:.1f}ms", f"{totals['ab_nodes']:,}",
+                  f"{totals['ab_time']:.1f}ms", f"{totals['ab_nodes'] / max(1, totals['tss_nodes']):,.0f}x")
+        print_row("WINS CONFIRMED", f"{totals['proved']}/{len(positions)}")
+    return totals
+
+
+def ultimate_positions(count: int, seed: int) -> List[ultimate.UltimateBoard]:
+    """Positions after 10-30 random moves of games still in progress"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = ultimate.UltimateBoard()
+        for _ in range(rng.randint(10, 30)):
+            if board.winner() is not None:
+                break
+            board.play(rng.choice(board.legal_moves()))
+        if board.winner() is None:
+            positions.append(board)
+    return positions
+
+
+def bench_ultimate(depth: int, count: int, seed: int) -> Dict:
+    """Perft from the empty board, then fixed-depth searches against NPS_TARGET"""
+    MatrixEffect.print_status("ULTIMATE SUITE", Colors.NEON_GREEN)
+    print_row("PERFT", "LEAVES", "TIME", "LEAVES/S")
+    for plies in range(1, 5):
+        start = time.perf_counter()
+        leaves = ultimate.perft(ultimate.UltimateBoard(), plies)
+        elapsed = time.perf_counter() - start
+        print_row(f"DEPTH {plies}", f"{leaves:,}", f"{elapsed * 1000:.1f}ms", f"{leaves / elapsed:,.0f}")
+
+    print_row("POSITION", "DEPTH", "NODES", "TIME", "NODES/S")
+    engine = ultimate.UltimateEngine()
+    totals = {'positions': count, 'nodes': 0, 'time': 0.0}
+    for i, board in enumerate(ultimate_positions(count, seed)):
+        engine.clear()
+        _, info = engine.search(board, time_ms=float('inf'), max_depth=depth)
+        totals['nodes'] += info['nodes']
+        totals['time'] += info['time_ms']
+        print_row(f"#{i} ({len(board.history)} PLIES)", str(info['depth']), f"{info['nodes']:,}",
+                  f"{info['time_ms']:.1f}ms", f"{info['nodes_per_sec']:,.0f}")
+
+    totals['nodes_per_sec'] = totals['nodes'] / totals['time'] * 1000 if totals['time'] else 0.0
+    print_row("TOTAL", "", f"{totals['nodes']:,}", f"{totals['time']:.1f}ms", f"{totals['nodes_per_sec']:,.0f}")
+    met = totals['nodes_per_sec'] >= ultimate.NPS_TARGET
+    MatrixEffect.print_status(f"NPS TARGET {ultimate.NPS_TARGET:,} {'MET' if met else 'MISSED'}",
+                              Colors.NEON_GREEN if met else Colors.NEON_PINK)
+    return totals
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the selected benchmark suites"""
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe engine benchmarks")
+    parser.add_argument('--suite', choices=['all', 'search', 'drivers', 'neural', 'hashing', 'threats',
+                                            'ultimate'],
+                        default='all')
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, default=None, metavar='K',
+                        help="marks in a row for the threats suite (default: 4, or 5 from 7x7 up)")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="search depth cap (default: full on 3x3, 4 on larger boards)")
+    parser.add_argument('--games', type=int, default=300, help="self-play games for the neural suite")
+    parser.add_argument('--positions', type=int, default=200000,
+                        help="distinct positions sampled by the hashing suite on boards above 3x3")
+    parser.add_argument('--threat-positions', type=int, default=8,
+                        help="positions with a forced threat line in the threats suite")
+    parser.add_argument('--ultimate-positions', type=int, default=8,
+                        help="mid-game positions searched by the ultimate suite")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    depth = args.depth if args.depth is not None or args.size == 3 else 4
+
+    if args.suite in ('all', 'search'):
+        bench_search(args.size, depth)
+    if args.suite in ('all', 'drivers'):
+        bench_drivers(args.size, depth)
+    if args.suite in ('all', 'neural'):
+        bench_neural(args.size, depth, args.games, args.seed)
+    if args.suite in ('all', 'hashing'):
+        bench_hashing(args.size, args.positions, args.seed)
+    if args.suite in ('all', 'threats'):
+        # Threats only matter with a win length below the board size; 3x3 runs on 6x6
+        size = args.size if args.size > 3 else 6
+        bench_threats(size, args.win_length or (4 if size < 7 else 5), args.threat_positions, args.seed)
+    if args.suite in ('all', 'ultimate'):
+        bench_ultimate(args.depth or 8, args.ultimate_positions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
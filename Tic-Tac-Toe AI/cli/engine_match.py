@@ -0,0 +1,420 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Engine match testing (SPRT)
+
+Plays a test engine against a base engine to check that a search change
+(pruning, move ordering, depth limits, ...) did not weaken play, with as few
+games as possible:
+- openings: every move sequence of --opening-plies plies, one per symmetry
+  class, kept only if a reference search finds no forced win for either
+  side (balanced), shuffled by the run seed
+- paired games: each opening is played twice with colours swapped, so an
+  opening that favours one side cancels out within the pair
+- pairs run on a process pool (one pair of engines per worker); results are
+  counted in pair order, so the run stops at the same pair whatever the
+  scheduling
+- a sequential probability ratio test on the pair scores stops the match as
+  soon as "test is at least elo1 better" (H1) or "test is at most elo0
+  better" (H0) is decided at the chosen error rates
+- reported: Elo difference with a 95% interval, the pentanomial counts and
+  the nodes and search time each engine used
+
+Engines are given as comma-separated settings, e.g. "depth=4,strategy=pvs".
+The default bounds elo0=-20, elo1=0 form a non-regression test: accepting H1
+means the test engine is not measurably weaker than the base.
+
+Usage:
+    python cli/engine_match.py --size 4 --base depth=3 --test depth=4
+    python cli/engine_match.py --size 4 --base depth=4 --test depth=4,strategy=mtdf --workers 4
+    python cli/engine_match.py --size 6 --win-length 4 --base depth=2 --test depth=2,threats=2
+    python cli/engine_match.py --base difficulty=medium --test difficulty=easy --elo0 0 --elo1 50
+
+Author: Your Name
+"""
+
+import os
+import math
+import time
+import random
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from symmetry import SymmetryTables
+from threat_space import ThreatSpaceSearch
+from tic_tac_toe_matrix_cli import DIFFICULTY_LEVELS, STRATEGIES, Colors, MatrixEffect, TicTacToeAI
+
+
+def parse_depth(value: str) -> Optional[int]:
+    """Depth cap: a number, or 'none' for full-depth search"""
+    return None if value.lower() == 'none' else int(value)
+
+
+def parse_switch(value: str) -> bool:
+    """on/off setting"""
+    if value.lower() not in ('on', 'off', 'true', 'false', '1', '0'):
+        raise ValueError(f"expected on/off, got {value!r}")
+    return value.lower() in ('on', 'true', '1')
+
+
+def parse_choice(choices: Sequence[str]) -> Callable[[str], str]:
+    """Setting restricted to choices"""
+    def parse(value: str) -> str:
+        if value not in choices:
+            raise ValueError(f"expected one of {', '.join(choices)}, got {value!r}")
+        return value
+    return parse
+
+
+# Engine settings: name -> (TicTacToeAI attribute, parser)
+ENGINE_SETTINGS = {
+    'depth': ('max_depth', parse_depth),
+    'difficulty': ('difficulty', parse_choice(list(DIFFICULTY_LEVELS))),
+    'engine': ('engine', parse_choice(['minimax', 'mcts'])),
+    'strategy': ('strategy', parse_choice(STRATEGIES)),
+    'pruning': ('use_pruning', parse_switch),
+    'symmetry': ('use_symmetry', parse_switch),
+    'symmetry_depth': ('symmetry_depth', int),
+    'playouts': ('mcts_iterations', int),
+    'think_ms': ('mcts_time_ms', float),
+    'playout': ('mcts_playout', parse_choice(['random', 'heuristic', 'batch'])),
+    'threats': ('threat_space', int)     # threes allowed; the searcher is built by build_engine()
+}
+
+# Engines of the current worker process, built by init_worker()
+worker_engines = {}
+
+
+def parse_engine(spec: str) -> Dict[str, Any]:
+    """
+    Engine settings from "name=value,name=value"
+
+    Raises:
+        ValueError: On an unknown setting or a bad value
+    """
+    settings = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        if name not in ENGINE_SETTINGS or not value:
+            raise ValueError(f"Bad engine setting {item!r}; use name=value with name one of "
+                             f"{', '.join(ENGINE_SETTINGS)}")
+        attribute, parse = ENGINE_SETTINGS[name]
+        settings[attribute] = parse(value)
+    return settings
+
+
+def build_engine(size: int, win_length: Optional[int], settings: Dict[str, Any]) -> TicTacToeAI:
+    """Engine for the board variant with the given settings applied"""
+    ai = TicTacToeAI(size=size, win_length=win_length, max_depth=4 if size > 3 else None)
+    for attribute, value in settings.items():
+        if attribute == 'threat_space':
+            value = ThreatSpaceSearch(ai.win_patterns, ai.cells, threat_depth=value)
+        setattr(ai, attribute, value)
+    return ai
+
+
+def balanced_openings(size: int, win_length: Optional[int], plies: int,
+                      max_depth: Optional[int]) -> List[List[int]]:
+    """
+    Openings of `plies` moves, one per symmetry class, without a forced win
+
+    A reference alpha-beta search (full depth on 3x3, else max_depth) scores
+    each opening; openings with a win score for either side are dropped.
+    """
+    ai = TicTacToeAI(size=size, win_length=win_length, max_depth=max_depth)
+    symmetry = SymmetryTables(size)
+    openings, seen = [], set()
+
+    def walk(moves: List[int], player: str):
+        if ai.check_game_over():
+            return
+        if len(moves) == plies:
+            board, _ = symmetry.canonical(ai.board)
+            if tuple(board) in seen:
+                return
+            seen.add(tuple(board))
+            result = ai.minimax(ai.board.copy(), player, 0, float('-inf'), float('inf'), [0])
+            if abs(result['score']) < 1:
+                openings.append(list(moves))
+            return
+        for move in ai.get_available_moves(ai.board):
+            ai.make_move(move, player)
+            walk(moves + [move], 'O' if player == 'X' else 'X')
+            ai.undo_move()
+
+    walk([], 'X')
+    return openings
+
+
+def play_game(engines: Dict[str, TicTacToeAI], opening: Sequence[int]) -> Tuple[str, Dict[str, Dict]]:
+    """
+    Play one game from an opening between the engines playing 'X' and 'O'
+
+    Returns:
+        The result ('X', 'O' or 'draw') and per side the 'nodes' searched,
+        search 'time' in ms and 'moves' played
+    """
+    for ai in engines.values():
+        ai.reset_game()
+    player = 'X'
+    for move in opening:
+        for ai in engines.values():
+            ai.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+
+    usage = {side: {'nodes': 0, 'time': 0.0, 'moves': 0} for side in engines}
+    result = engines['X'].check_game_over()
+    while result is None:
+        move, move_stats = engines[player].compute_move(player)
+        usage[player]['nodes'] += move_stats['states']
+        usage[player]['time'] += move_stats['time']
+        usage[player]['moves'] += 1
+        for ai in engines.values():
+            ai.make_move(move, player)
+        result = engines['X'].check_game_over()
+        player = 'O' if player == 'X' else 'X'
+    return result, usage
+
+
+def init_worker(size: int, win_length: Optional[int], base: Dict[str, Any], test: Dict[str, Any]):
+    """Process pool initializer: build this worker's two engines once"""
+    worker_engines['base'] = build_engine(size, win_length, base)
+    worker_engines['test'] = build_engine(size, win_length, test)
+
+
+def play_pair(pair: int, opening: Sequence[int], seed: int) -> Dict:
+    """
+    Play an opening twice with colours swapped (test as X, then as O)
+
+    Returns:
+        The pair's 'points' for the test engine (0 to 2), the game 'results'
+        and the 'nodes', 'time' (ms) and 'moves' used by each engine
+    """
+    base, test = worker_engines['base'], worker_engines['test']
+    points = 0.0
+    results = []
+    usage = {name: {'nodes': 0, 'time': 0.0, 'moves': 0} for name in ('base', 'test')}
+    for game, (x_name, o_name) in enumerate((('test', 'base'), ('base', 'test'))):
+        base.rng.seed(f"{seed}:{pair}:{game}:base")
+        test.rng.seed(f"{seed}:{pair}:{game}:test")
+        result, sides = play_game({'X': worker_engines[x_name], 'O': worker_engines[o_name]}, opening)
+        results.append(result)
+        for side, name in (('X', x_name), ('O', o_name)):
+            for field in ('nodes', 'time', 'moves'):
+                usage[name][field] += sides[side][field]
+        test_side = 'X' if x_name == 'test' else 'O'
+        points += 1.0 if result == test_side else 0.5 if result == 'draw' else 0.0
+    return {'pair': pair, 'points': points, 'results': results, 'usage': usage, 'worker': os.getpid()}
+
+
+def expected_score(elo: float) -> float:
+    """Expected score of a player elo points stronger (logistic model)"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score: float) -> float:
+    """Inverse of expected_score, clamped away from 0% and 100%"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class SPRT:
+    """Sequential probability ratio test on pentanomial pair results"""
+
+    def __init__(self, elo0: float = -20, elo1: float = 0, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Args:
+            elo0: Elo difference of H0 (the change is not good enough)
+            elo1: Elo difference of H1 (the change is good enough)
+            alpha: Chance of accepting H1 when H0 is true
+            beta: Chance of accepting H0 when H1 is true
+        """
+        self.elo0, self.elo1 = elo0, elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        # pentanomial[k]: pairs where the test engine scored k/2 points
+        self.pentanomial = [0] * 5
+
+    def add(self, points: float):
+        """Count one pair's points (0, 0.5, 1, 1.5 or 2)"""
+        self.pentanomial[int(points * 2)] += 1
+
+    @property
+    def pairs(self) -> int:
+        return sum(self.pentanomial)
+
+    def mean_variance(self) -> Tuple[float, float]:
+        """
+        Mean and variance of the per-pair score (points / 2)
+
+        One pseudo-pair is spread evenly over the five outcomes, so that a
+        match of nothing but draws still has a variance and is decided only
+        after enough of them.
+        """
+        counts = [count + 0.2 for count in self.pentanomial]
+        total = sum(counts)
+        scores = [k / 4 for k in range(5)]
+        mean = sum(c * s for c, s in zip(counts, scores)) / total
+        variance = sum(c * (s - mean) ** 2 for c, s in zip(counts, scores)) / total
+        return mean, variance
+
+    def llr(self) -> float:
+        """Log-likelihood ratio of H1 against H0 (normal approximation)"""
+        if not self.pairs:
+            return 0.0
+        mean, variance = self.mean_variance()
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return self.pairs * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def status(self) -> Optional[str]:
+        """'H1' or 'H0' once decided, else None"""
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+    def elo(self) -> Tuple[float, float, float]:
+        """Elo difference of the test engine with its 95% interval (low, estimate, high)"""
+        mean, variance = self.mean_variance()
+        margin = 1.96 * math.sqrt(variance / max(1, self.pairs))
+        return elo_from_score(mean - margin), elo_from_score(mean), elo_from_score(mean + margin)
+
+
+def run_match(size: int, win_length: Optional[int], base: Dict[str, Any], test: Dict[str, Any],
+              sprt: SPRT, openings: List[List[int]], max_pairs: int = 1000, workers: Optional[int] = None,
+              seed: int = 0, on_pair: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Play pairs until the SPRT decides or max_pairs are counted
+
+    Args:
+        size, win_length: Board variant
+        base, test: Engine settings (see parse_engine)
+        sprt: Test updated with every counted pair
+        openings: Openings cycled through in order
+        max_pairs: Pair budget
+        workers: Worker processes (default: one per CPU)
+        seed: Seed of the engines' random streams (noise of easy/medium)
+        on_pair: Called with each counted pair's result
+
+    Returns:
+        Dictionary with the SPRT 'status', 'pairs' counted, per-engine
+        'usage' over the counted pairs and the wall 'time'
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, max_pairs))
+    usage = {name: {'nodes': 0, 'time': 0.0, 'moves': 0} for name in ('base', 'test')}
+    finished = {}
+    counted = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(size, win_length, base, test)) as pool:
+        queue = iter(range(max_pairs))
+        running = set()
+
+        def submit_next():
+            pair = next(queue, None)
+            if pair is not None:
+                running.add(pool.submit(play_pair, pair, openings[pair % len(openings)], seed))
+
+        # Bounded queue: two pairs per worker, refilled as they finish
+        for _ in range(2 * workers):
+            submit_next()
+
+        while running and sprt.status() is None:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                finished[result['pair']] = result
+                submit_next()
+
+            # Count in pair order so the stopping point ignores scheduling
+            while counted in finished and sprt.status() is None:
+                result = finished.pop(counted)
+                sprt.add(result['points'])
+                for name in usage:
+                    for field in usage[name]:
+                        usage[name][field] += result['usage'][name][field]
+                counted += 1
+                if on_pair:
+                    on_pair(result)
+
+        for future in running:
+            future.cancel()
+
+    return {'status': sprt.status(), 'pairs': counted, 'usage': usage,
+            'time': time.perf_counter() - start}
+
+
+def print_row(label: str, *values: str):
+    """One table row in Matrix colours"""
+    cells = ''.join(f"{value:>16}" for value in values)
+    print(f"    {Colors.NEON_CYAN}{label:<22}{Colors.NEON_GREEN}{cells}{Colors.RESET}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run an SPRT match between the base and test engines"""
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe engine-vs-engine SPRT match")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, default=None)
+    parser.add_argument('--base', default='', help="base engine settings, e.g. depth=4,strategy=alphabeta")
+    parser.add_argument('--test', default='', help="test engine settings, e.g. depth=4,strategy=pvs")
+    parser.add_argument('--elo0', type=float, default=-20, help="Elo difference of H0 (default: -20)")
+    parser.add_argument('--elo1', type=float, default=0, help="Elo difference of H1 (default: 0)")
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--max-pairs', type=int, default=1000, help="stop after this many pairs (default: 1000)")
+    parser.add_argument('--opening-plies', type=int, default=2, help="moves per opening (default: 2)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        base, test = parse_engine(args.base), parse_engine(args.test)
+    except ValueError as e:
+        parser.error(str(e))
+
+    reference_depth = None if args.size == 3 else 4
+    openings = balanced_openings(args.size, args.win_length, args.opening_plies, reference_depth)
+    if not openings:
+        parser.error("no balanced openings; try another --opening-plies")
+    random.Random(args.seed).shuffle(openings)
+
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    MatrixEffect.print_status(
+        f"MATCH {args.test or 'default'} VS {args.base or 'default'} • {len(openings)} OPENINGS • "
+        f"SPRT [{args.elo0:g}, {args.elo1:g}] • LLR BOUNDS [{sprt.lower:.2f}, {sprt.upper:.2f}]",
+        Colors.NEON_GREEN
+    )
+
+    def report(result: Dict):
+        if sprt.pairs % 10 and sprt.status() is None:
+            return
+        low, elo, high = sprt.elo()
+        MatrixEffect.print_terminal_prompt(
+            f"PAIR {sprt.pairs} • LLR {Colors.NEON_GREEN}{sprt.llr():+.2f}{Colors.RESET} • "
+            f"ELO {elo:+.1f} [{low:+.1f}, {high:+.1f}]"
+        )
+
+    summary = run_match(args.size, args.win_length, base, test, sprt, openings, max_pairs=args.max_pairs,
+                        workers=args.workers, seed=args.seed, on_pair=report)
+
+    low, elo, high = sprt.elo()
+    verdict = {'H1': "H1 ACCEPTED (TEST PASSES)", 'H0': "H0 ACCEPTED (TEST FAILS)",
+               None: "INCONCLUSIVE (PAIR BUDGET USED)"}[summary['status']]
+    MatrixEffect.print_status(verdict, Colors.NEON_GREEN if summary['status'] == 'H1' else Colors.NEON_PINK)
+    print_row("PAIRS / GAMES", f"{summary['pairs']:,}", f"{2 * summary['pairs']:,}")
+    print_row("PENTANOMIAL 0-2", ' '.join(str(count) for count in sprt.pentanomial))
+    print_row("ELO (95%)", f"{elo:+.1f}", f"[{low:+.1f}, {high:+.1f}]")
+    print_row("LLR", f"{sprt.llr():+.2f}")
+    print_row("", "NODES", "SEARCH TIME", "NODES/MOVE")
+    for name in ('test', 'base'):
+        usage = summary['usage'][name]
+        per_move = usage['nodes'] / usage['moves'] if usage['moves'] else 0
+        print_row(name.upper(), f"{usage['nodes']:,}", f"{usage['time'] / 1000:.2f}s", f"{per_move:,.0f}")
+    print_row("WALL TIME", f"{summary['time']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Persistent experience cache (LEARNING mode)
+
+Remembers, across sessions:
+- searched positions: the move and score the search returned
+- opponent habits: how often each reply was played from a position
+
+The file is only read the first time the cache is consulted, so startup does
+not pay for it. Both tables are LRU-ordered and capped at max_entries; the
+least recently used entries are evicted first and the order survives saving.
+
+Author: Your Name
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+
+
+def position_key(board: List[str], player: str, variant: str = '') -> str:
+    """Compact key for a board with player to move, e.g. '3x3:X-O------:X'"""
+    cells = ''.join(cell or '-' for cell in board)
+    return f"{variant}:{cells}:{player}"
+
+
+class ExperienceCache:
+    """LRU-capped position and opponent-move cache persisted as JSON"""
+
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.positions = OrderedDict()   # key -> [move, score]
+        self.opponent = OrderedDict()    # key -> {move: count}
+        self.loaded = False
+        self.dirty = False
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'load_ms': 0.0}
+
+    def load(self):
+        """Read the cache file (once); a missing or unreadable file starts empty"""
+        if self.loaded:
+            return
+        self.loaded = True
+        start = time.perf_counter()
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == FORMAT_VERSION:
+                    self.positions = OrderedDict(data.get('positions', {}))
+                    self.opponent = OrderedDict(
+                        (key, {int(move): count for move, count in moves.items()})
+                        for key, moves in data.get('opponent', {}).items()
+                    )
+                    self.trim(self.positions)
+                    self.trim(self.opponent)
+        except (OSError, ValueError):
+            self.positions = OrderedDict()
+            self.opponent = OrderedDict()
+        self.stats['load_ms'] = (time.perf_counter() - start) * 1000
+
+    def save(self):
+        """Write the cache file if anything changed"""
+        if not self.loaded or not self.dirty:
+            return
+        data = {
+            'version': FORMAT_VERSION,
+            'positions': self.positions,
+            'opponent': {key: {str(m): c for m, c in moves.items()} for key, moves in self.opponent.items()}
+        }
+        with open(self.path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        self.dirty = False
+
+    def trim(self, table: OrderedDict):
+        """Evict least recently used entries above the size cap"""
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def lookup(self, key: str) -> Optional[Tuple[int, float]]:
+        """Return (move, score) for a previously searched position"""
+        self.load()
+        entry = self.positions.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.positions.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[0], entry[1]
+
+    def store(self, key: str, move: int, score: float):
+        """Remember the search result for a position"""
+        self.load()
+        self.positions[key] = [move, score]
+        self.positions.move_to_end(key)
+        self.trim(self.positions)
+        self.dirty = True
+
+    def observe(self, key: str, move: int):
+        """Count an opponent reply played from a position"""
+        self.load()
+        moves = self.opponent.setdefault(key, {})
+        moves[move] = moves.get(move, 0) + 1
+        self.opponent.move_to_end(key)
+        self.trim(self.opponent)
+        self.dirty = True
+
+    def likely_replies(self, key: str) -> List[Tuple[int, int]]:
+        """Opponent replies seen from a position, most frequent first"""
+        self.load()
+        moves = self.opponent.get(key, {})
+        return sorted(moves.items(), key=lambda item: -item[1])
+
+    def clear(self):
+        """Forget everything, on disk as well"""
+        self.positions.clear()
+        self.opponent.clear()
+        self.loaded = True
+        self.dirty = True
+        self.stats.update(hits=0, misses=0, evictions=0)
+        self.save()
+
+    def summary(self) -> Dict:
+        """Entries, hit rate and load time for the stats displays"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'positions': len(self.positions),
+            'opponent_positions': len(self.opponent),
+            'hit_rate': self.stats['hits'] / lookups * 100 if lookups else 0.0,
+            'evictions': self.stats['evictions'],
+            'load_ms': self.stats['load_ms']
+        }
@@ -0,0 +1,296 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Compact binary game records
+
+Archive layout (little endian):
+- 16-byte file header: magic 'TTTR', version, move slots per record
+- fixed-width records: result, move count, flags, duration and one byte
+  per move (0xFF marks an unused slot)
+
+GameArchive memory-maps the file and exposes zero-copy NumPy views of the
+record fields. GameIndex sorts records by (final result, opening sequence)
+so that queries like "corner openings the AI drew" are a handful of binary
+searches instead of a full pass over the archive.
+
+Author: Your Name
+"""
+
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ARCHIVE_MAGIC = b'TTTR'
+INDEX_MAGIC = b'TTTI'
+FORMAT_VERSION = 1
+INDEX_VERSION = 2
+HEADER = struct.Struct('<4sHH8x')         # magic, version, move slots
+INDEX_HEADER = struct.Struct('<4sHHQQq')  # magic, version, opening plies, record count,
+                                          # archive size and mtime (ns) it was built from
+
+EMPTY_MOVE = 0xFF
+FLAG_SELF_PLAY = 0x01
+
+RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'draw': 3}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+CORNERS = (0, 2, 6, 8)
+EDGES = (1, 3, 5, 7)
+CENTER = (4,)
+
+
+def record_dtype(max_moves: int = 9) -> np.dtype:
+    """Fixed-width record layout for boards with max_moves cells"""
+    return np.dtype([
+        ('result', 'u1'),
+        ('num_moves', 'u1'),
+        ('flags', 'u1'),
+        ('reserved', 'u1'),
+        ('duration_ms', '<u4'),
+        ('moves', 'u1', (max_moves,))
+    ])
+
+
+def encode_records(records: Sequence[Dict], max_moves: int = 9) -> np.ndarray:
+    """Pack game record dicts into a structured array"""
+    packed = np.zeros(len(records), dtype=record_dtype(max_moves))
+    packed['moves'] = EMPTY_MOVE
+    for i, record in enumerate(records):
+        moves = record['moves']
+        packed['result'][i] = RESULT_CODES[record.get('result')]
+        packed['num_moves'][i] = len(moves)
+        packed['flags'][i] = FLAG_SELF_PLAY if record.get('mode') == 'self-play' else 0
+        packed['duration_ms'][i] = min(int(record.get('duration_ms', 0)), 0xFFFFFFFF)
+        packed['moves'][i, :len(moves)] = moves
+    return packed
+
+
+def write_records(path: str, records: Iterable[Dict], max_moves: int = 9,
+                  chunk_size: int = 65536, append: bool = False) -> int:
+    """
+    Write game records to a binary archive in bulk
+
+    Args:
+        path: Archive file path
+        records: Iterable of game records (see TicTacToeAI.game_record)
+        max_moves: Move slots per record (number of board cells)
+        chunk_size: Records packed per write
+        append: Add to an existing archive instead of replacing it
+
+    Returns:
+        Number of records written
+    """
+    if append and os.path.exists(path):
+        slots = read_header(path)
+        if slots != max_moves:
+            raise ValueError(f"Archive has {slots} move slots, expected {max_moves}")
+        f = open(path, 'ab')
+    else:
+        f = open(path, 'wb')
+        f.write(HEADER.pack(ARCHIVE_MAGIC, FORMAT_VERSION, max_moves))
+
+    written = 0
+    chunk = []
+    with f:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                f.write(encode_records(chunk, max_moves).tobytes())
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            f.write(encode_records(chunk, max_moves).tobytes())
+            written += len(chunk)
+    return written
+
+
+def archive_stamp(path: str) -> Tuple[int, int]:
+    """Size and modification time (ns) of an archive; an index is only valid for the same stamp"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_header(path: str) -> int:
+    """Validate an archive header and return its move slots per record"""
+    with open(path, 'rb') as f:
+        magic, version, max_moves = HEADER.unpack(f.read(HEADER.size))
+    if magic != ARCHIVE_MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a game record archive")
+    return max_moves
+
+
+class GameArchive:
+    """Read-only, memory-mapped view of a binary game archive"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.max_moves = read_header(path)
+        self.dtype = record_dtype(self.max_moves)
+
+        count = (os.path.getsize(path) - HEADER.size) // self.dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r',
+                                     offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def moves(self) -> np.ndarray:
+        """(games, max_moves) uint8 view of all move sequences"""
+        return self.records['moves']
+
+    @property
+    def results(self) -> np.ndarray:
+        """Result code per game (see RESULT_CODES)"""
+        return self.records['result']
+
+    @property
+    def num_moves(self) -> np.ndarray:
+        """Number of moves played per game"""
+        return self.records['num_moves']
+
+    def game(self, i: int) -> Dict:
+        """Decode a single record back into a game dict"""
+        rec = self.records[i]
+        n = int(rec['num_moves'])
+        return {
+            'moves': [int(m) for m in rec['moves'][:n]],
+            'result': RESULT_NAMES[int(rec['result'])],
+            'duration_ms': int(rec['duration_ms']),
+            'mode': 'self-play' if rec['flags'] & FLAG_SELF_PLAY else 'human'
+        }
+
+    def replay(self, i: int) -> Iterator[List[str]]:
+        """Yield the board after every move of game i"""
+        board = [''] * self.max_moves
+        player = 'X'
+        for move in self.game(i)['moves']:
+            board[move] = player
+            yield board.copy()
+            player = 'O' if player == 'X' else 'X'
+
+    def close(self):
+        """Release the memory map"""
+        mm = getattr(self.records, '_mmap', None)
+        self.records = np.zeros(0, dtype=self.dtype)
+        if mm is not None:
+            mm.close()
+
+
+class GameIndex:
+    """
+    Sorted (result, opening) index over a GameArchive
+
+    Each game gets the key result * base**plies + opening, where the opening
+    encodes its first `plies` moves as base-(cells + 1) digits (0 = no move).
+    Games sharing a result and an opening prefix are therefore contiguous in
+    key order and found with two binary searches.
+    """
+
+    def __init__(self, keys: np.ndarray, order: np.ndarray, opening_plies: int, base: int,
+                 stamp: Tuple[int, int] = (0, 0)):
+        self.keys = keys
+        self.order = order
+        self.opening_plies = opening_plies
+        self.base = base
+        self.stamp = stamp
+
+    @classmethod
+    def build(cls, archive: GameArchive, opening_plies: int = 2) -> 'GameIndex':
+        """Index an archive by result and its first opening_plies moves"""
+        base = archive.max_moves + 1
+        moves = archive.moves[:, :opening_plies].astype(np.uint64)
+        digits = np.where(moves == EMPTY_MOVE, 0, moves + 1)
+
+        codes = np.zeros(len(archive), dtype=np.uint64)
+        for ply in range(opening_plies):
+            codes = codes * np.uint64(base) + digits[:, ply]
+        keys = archive.results.astype(np.uint64) * np.uint64(base ** opening_plies) + codes
+
+        order = np.argsort(keys, kind='stable').astype(np.uint32)
+        return cls(keys[order], order, opening_plies, base, archive_stamp(archive.path))
+
+    @classmethod
+    def for_archive(cls, archive: GameArchive, opening_plies: int = 2) -> 'GameIndex':
+        """Load the archive's sidecar index, rebuilding it when stale"""
+        path = archive.path + '.idx'
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+            except ValueError:
+                index = None
+            if (index is not None and index.stamp == archive_stamp(archive.path)
+                    and len(index.keys) == len(archive) and index.opening_plies == opening_plies):
+                return index
+        index = cls.build(archive, opening_plies)
+        index.save(path)
+        return index
+
+    def save(self, path: str):
+        """Write the index next to its archive"""
+        with open(path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.opening_plies, len(self.keys),
+                                      *self.stamp))
+            f.write(np.uint32(self.base).tobytes())
+            f.write(np.ascontiguousarray(self.keys, dtype='<u8').tobytes())
+            f.write(np.ascontiguousarray(self.order, dtype='<u4').tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'GameIndex':
+        """Memory-map a saved index"""
+        with open(path, 'rb') as f:
+            header = f.read(INDEX_HEADER.size + 4)
+        if len(header) < INDEX_HEADER.size + 4:
+            raise ValueError(f"{path} is not a game record index")
+        magic, version, plies, count, size, mtime = INDEX_HEADER.unpack_from(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{path} is not a game record index")
+        base = int(np.frombuffer(header, dtype='<u4', offset=INDEX_HEADER.size)[0])
+        offset = INDEX_HEADER.size + 4
+        if count == 0:
+            return cls(np.zeros(0, '<u8'), np.zeros(0, '<u4'), plies, base, (size, mtime))
+        keys = np.memmap(path, dtype='<u8', mode='r', offset=offset, shape=(count,))
+        order = np.memmap(path, dtype='<u4', mode='r', offset=offset + 8 * count, shape=(count,))
+        return cls(keys, order, plies, base, (size, mtime))
+
+    def _range(self, result_code: int, opening: Sequence[int]) -> np.ndarray:
+        """Record numbers matching one result and one opening prefix"""
+        if len(opening) > self.opening_plies:
+            raise ValueError(f"Index only covers the first {self.opening_plies} moves")
+        prefix = 0
+        for move in opening:
+            prefix = prefix * self.base + move + 1
+        span = self.base ** (self.opening_plies - len(opening))
+        low = result_code * self.base ** self.opening_plies + prefix * span
+        lo = np.searchsorted(self.keys, np.uint64(low), side='left')
+        hi = np.searchsorted(self.keys, np.uint64(low + span), side='left')
+        return self.order[lo:hi]
+
+    def query(self, openings: Optional[Sequence[Sequence[int]]] = None,
+              result: Optional[str] = None, finished_only: bool = True) -> np.ndarray:
+        """
+        Find games by opening prefix and/or final result
+
+        Args:
+            openings: Opening prefixes to accept, e.g. [[c] for c in CORNERS];
+                      None matches any opening
+            result: 'X', 'O' or 'draw'; None matches any result
+            finished_only: Skip unfinished games when result is None
+
+        Returns:
+            Sorted array of record numbers into the archive
+        """
+        if result is not None:
+            codes = [RESULT_CODES[result]]
+        else:
+            codes = [code for code in RESULT_NAMES if code or not finished_only]
+        openings = openings if openings is not None else [[]]
+
+        hits = [self._range(code, opening) for code in codes for opening in openings]
+        if not hits:
+            return np.zeros(0, dtype=np.uint32)
+        return np.sort(np.concatenate(hits))
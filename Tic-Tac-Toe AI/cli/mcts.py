@@ -0,0 +1,311 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Monte Carlo Tree Search engine
+
+An alternative to full-width minimax for boards where minimax cannot reach
+the end of the game:
+- UCT selection (mean value + exploration bonus)
+- random, heuristic (win/block-first) or batched NumPy playouts
+- tree reuse between consecutive moves of the same game
+- budget in iterations or milliseconds
+
+Positions are two integer bitboards (one bit per cell per player) and every
+win pattern is a precomputed bitmask, so a playout is a handful of integer
+operations per move.
+
+Author: Your Name
+"""
+
+import math
+import time
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rollouts import BatchPlayouts
+
+
+class Node:
+    """Search tree node: the position reached after `move` by `mover`"""
+
+    __slots__ = ('move', 'mover', 'parent', 'children', 'untried', 'visits', 'value', 'winner')
+
+    def __init__(self, move: Optional[int], mover: str, parent: Optional['Node'],
+                 untried: List[int], winner: Optional[str]):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = {}
+        self.untried = untried
+        self.visits = 0
+        self.value = 0.0      # playout results from the mover's point of view
+        self.winner = winner  # 'X', 'O', 'draw' or None for non-terminal nodes
+
+
+class MCTSEngine:
+    """UCT search over bitboards built from a list of win patterns"""
+
+    def __init__(self, win_patterns: Sequence[Sequence[int]], cells: int,
+                 exploration: float = 1.41, playout: str = 'random',
+                 rng: Optional[random.Random] = None, batch_size: int = 64):
+        if playout not in ('random', 'heuristic', 'batch'):
+            raise ValueError(f"Unknown playout policy: {playout}")
+        self.cells = cells
+        self.full_mask = (1 << cells) - 1
+        self.exploration = exploration
+        self.playout = playout
+        self.rng = rng or random.Random()
+        
+        # 'batch' runs batch_size vectorised playouts from every new leaf
+        self.batch_size = batch_size
+        self.batch = None
+        if playout == 'batch':
+            self.batch = BatchPlayouts(win_patterns, cells, seed=self.rng.randrange(2 ** 32))
+
+        masks = [sum(1 << i for i in pattern) for pattern in win_patterns]
+        self.cell_masks = [[m for m in masks if m >> cell & 1] for cell in range(cells)]
+
+        self.root = None
+        self.root_history = ()
+
+        # Optional progress.SearchProgress: ticked every 64 iterations, with
+        # the most visited root move every 1024
+        self.progress = None
+
+    def is_win(self, bits: int, cell: int) -> bool:
+        """Whether the mark just placed on cell completes a line"""
+        for mask in self.cell_masks[cell]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def empty_cells(self, occupied: int) -> List[int]:
+        """Cells not covered by the occupied bitmask"""
+        return [cell for cell in range(self.cells) if not occupied >> cell & 1]
+
+    def reset(self):
+        """Forget the search tree (e.g. on a new game)"""
+        self.root = None
+        self.root_history = ()
+
+    def reuse_root(self, history: Sequence[int], player: str) -> Optional[Node]:
+        """Descend the previous tree along the moves played since the last search"""
+        root = self.root
+        n = len(self.root_history)
+        if root is None or tuple(history[:n]) != self.root_history:
+            return None
+        for move in history[n:]:
+            root = root.children.get(move)
+            if root is None:
+                return None
+        if root.winner is not None or (root.mover == player):
+            return None
+        root.parent = None
+        return root
+
+    def search(self, board: List[str], player: str, history: Sequence[int] = (),
+               iterations: Optional[int] = None, time_ms: Optional[float] = None) -> Tuple[int, Dict]:
+        """
+        Run UCT from board with player to move
+
+        Args:
+            board: Board as a list of 'X', 'O' and ''
+            player: Player to move
+            history: Moves played so far, used to reuse the previous tree
+            iterations: Iteration budget (default 10000 if no time budget);
+                        each iteration runs one playout, or batch_size
+                        playouts with the 'batch' policy
+            time_ms: Wall-clock budget in milliseconds
+
+        Returns:
+            Tuple of (move, info) where info has 'score' (expected result
+            for O in [-1, 1]), 'iterations', 'playouts', 'playouts_per_sec',
+            'tree_size' and 'reused' (visits inherited from the previous search)
+        """
+        if iterations is None and time_ms is None:
+            iterations = 10000
+        if iterations is not None:
+            iterations = max(1, iterations)
+
+        x_root = sum(1 << i for i, cell in enumerate(board) if cell == 'X')
+        o_root = sum(1 << i for i, cell in enumerate(board) if cell == 'O')
+        opponent = 'X' if player == 'O' else 'O'
+
+        root = self.reuse_root(history, player)
+        reused = root.visits if root else 0
+        if root is None:
+            root = Node(None, opponent, None, self.empty_cells(x_root | o_root), None)
+        self.root = root
+        self.root_history = tuple(history)
+
+        start = time.perf_counter()
+        deadline = start + time_ms / 1000.0 if time_ms is not None else None
+        done = 0
+        playouts = 0
+
+        while True:
+            if iterations is not None and done >= iterations:
+                break
+            if deadline is not None and done and done % 64 == 0 and time.perf_counter() >= deadline:
+                break
+            if self.progress is not None and done and done % 64 == 0:
+                if done % 1024 == 0:
+                    self.progress.update(move=max(root.children.values(), key=lambda child: child.visits).move)
+                self.progress.tick(playouts)
+            playouts += self.iterate(root, x_root, o_root)
+            done += 1
+
+        elapsed = time.perf_counter() - start
+
+        best = max(root.children.values(), key=lambda child: child.visits)
+        mean = best.value / best.visits
+        value_for_o = 2 * mean - 1 if player == 'O' else 1 - 2 * mean
+
+        info = {
+            'score': round(value_for_o, 3),
+            'iterations': done,
+            'playouts': playouts,
+            'playouts_per_sec': playouts / elapsed if elapsed > 0 else 0.0,
+            'tree_size': self.tree_size(root),
+            'reused': reused
+        }
+        return best.move, info
+
+    def iterate(self, root: Node, x_bits: int, o_bits: int) -> int:
+        """One selection / expansion / playout / backpropagation pass; returns playouts run"""
+        node = root
+        log = math.log
+        sqrt = math.sqrt
+        c = self.exploration
+
+        # Selection
+        while not node.untried and node.children:
+            log_n = log(node.visits)
+            node = max(
+                node.children.values(),
+                key=lambda ch: ch.value / ch.visits + c * sqrt(log_n / ch.visits)
+            )
+            if node.mover == 'X':
+                x_bits |= 1 << node.move
+            else:
+                o_bits |= 1 << node.move
+
+        # Expansion
+        if node.untried and node.winner is None:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            mover = 'X' if node.mover == 'O' else 'O'
+            if mover == 'X':
+                x_bits |= 1 << move
+                won = self.is_win(x_bits, move)
+            else:
+                o_bits |= 1 << move
+                won = self.is_win(o_bits, move)
+            occupied = x_bits | o_bits
+            if won:
+                winner = mover
+            elif occupied == self.full_mask:
+                winner = 'draw'
+            else:
+                winner = None
+            child = Node(move, mover, node, [] if winner else self.empty_cells(occupied), winner)
+            node.children[move] = child
+            node = child
+
+        # Simulation
+        winner = node.winner
+        if winner is None and self.batch is not None:
+            return self.backpropagate_batch(node, *self.simulate_batch(x_bits, o_bits, node.mover))
+        if winner is None:
+            winner = self.simulate(x_bits, o_bits, node.mover)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.mover:
+                node.value += 1.0
+            elif winner == 'draw':
+                node.value += 0.5
+            node = node.parent
+        return 1
+
+    def simulate_batch(self, x_bits: int, o_bits: int, last_mover: str) -> Tuple[int, int, int]:
+        """Run batch_size vectorised playouts; returns (X wins, O wins, draws)"""
+        board = [1 if x_bits >> c & 1 else -1 if o_bits >> c & 1 else 0 for c in range(self.cells)]
+        boards = np.tile(np.array(board, dtype=np.int8), (self.batch_size, 1))
+        to_move = np.full(self.batch_size, -1 if last_mover == 'X' else 1, dtype=np.int8)
+        result = self.batch.play(boards, to_move)
+        x_wins = int((result == 1).sum())
+        o_wins = int((result == -1).sum())
+        return x_wins, o_wins, len(result) - x_wins - o_wins
+
+    @staticmethod
+    def backpropagate_batch(node: Node, x_wins: int, o_wins: int, draws: int) -> int:
+        """Add a batch of playout results along the path to the root"""
+        total = x_wins + o_wins + draws
+        while node is not None:
+            node.visits += total
+            node.value += (x_wins if node.mover == 'X' else o_wins) + 0.5 * draws
+            node = node.parent
+        return total
+
+    def simulate(self, x_bits: int, o_bits: int, last_mover: str) -> str:
+        """Play the position out to the end and return 'X', 'O' or 'draw'"""
+        empty = self.empty_cells(x_bits | o_bits)
+        mover = 'X' if last_mover == 'O' else 'O'
+
+        if self.playout == 'heuristic':
+            return self.simulate_heuristic(x_bits, o_bits, mover, empty)
+
+        self.rng.shuffle(empty)
+        cell_masks = self.cell_masks
+        for cell in empty:
+            if mover == 'X':
+                x_bits |= 1 << cell
+                bits = x_bits
+            else:
+                o_bits |= 1 << cell
+                bits = o_bits
+            for mask in cell_masks[cell]:
+                if bits & mask == mask:
+                    return mover
+            mover = 'O' if mover == 'X' else 'X'
+        return 'draw'
+
+    def simulate_heuristic(self, x_bits: int, o_bits: int, mover: str, empty: List[int]) -> str:
+        """Playout that takes immediate wins and blocks immediate losses"""
+        while empty:
+            own, other = (x_bits, o_bits) if mover == 'X' else (o_bits, x_bits)
+            move = None
+            for target in (own, other):
+                for cell in empty:
+                    if self.is_win(target | 1 << cell, cell):
+                        move = cell
+                        break
+                if move is not None:
+                    break
+            if move is None:
+                move = empty[self.rng.randrange(len(empty))]
+            empty.remove(move)
+
+            if mover == 'X':
+                x_bits |= 1 << move
+                won = self.is_win(x_bits, move)
+            else:
+                o_bits |= 1 << move
+                won = self.is_win(o_bits, move)
+            if won:
+                return mover
+            mover = 'O' if mover == 'X' else 'X'
+        return 'draw'
+
+    @staticmethod
+    def tree_size(root: Node) -> int:
+        """Number of nodes in the tree below (and including) root"""
+        count = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
@@ -0,0 +1,229 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+NumPy value/policy network
+
+A small multilayer perceptron (no GPU, no framework) trained from positions
+the existing minimax search labelled during self-play:
+- input: two planes per cell (marks of the player to move, of the opponent)
+- hidden: one ReLU layer
+- value head: tanh score in [-1, 1] for the player to move
+- policy head: softmax over the legal cells
+
+The search uses it as the leaf evaluator (all leaves below a frontier node
+are evaluated in one batched forward pass) and as a move-ordering policy.
+
+Author: Your Name
+"""
+
+import time
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MARKS = {'X': 1, 'O': -1, '': 0}
+
+
+def encode(boards: np.ndarray, to_move: np.ndarray) -> np.ndarray:
+    """(N, cells) int8 boards + (N,) side to move -> (N, 2 * cells) float32 inputs"""
+    own = boards == to_move[:, None]
+    opp = boards == -to_move[:, None]
+    return np.concatenate([own, opp], axis=1).astype(np.float32)
+
+
+def boards_to_array(boards: Sequence[Sequence[str]]) -> np.ndarray:
+    """Lists of 'X'/'O'/'' -> (N, cells) int8 array"""
+    return np.array([[MARKS[c] for c in board] for board in boards], dtype=np.int8)
+
+
+class NeuralEvaluator:
+    """Two-headed MLP with batched inference and Adam training"""
+
+    def __init__(self, cells: int, hidden: int = 64, seed: Optional[int] = None):
+        self.cells = cells
+        self.hidden = hidden
+        rng = np.random.default_rng(seed)
+        inputs = 2 * cells
+        self.params = {
+            'w1': (rng.standard_normal((inputs, hidden)) * np.sqrt(2.0 / inputs)).astype(np.float32),
+            'b1': np.zeros(hidden, dtype=np.float32),
+            'wv': (rng.standard_normal((hidden, 1)) * np.sqrt(1.0 / hidden)).astype(np.float32),
+            'bv': np.zeros(1, dtype=np.float32),
+            'wp': (rng.standard_normal((hidden, cells)) * np.sqrt(1.0 / hidden)).astype(np.float32),
+            'bp': np.zeros(cells, dtype=np.float32)
+        }
+        self.positions_evaluated = 0
+
+    def forward(self, boards: np.ndarray, to_move: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (hidden activations, values, policy probabilities) for a batch"""
+        p = self.params
+        x = encode(boards, to_move)
+        h = np.maximum(x @ p['w1'] + p['b1'], 0.0)
+        values = np.tanh(h @ p['wv'] + p['bv'])[:, 0]
+        logits = h @ p['wp'] + p['bp']
+        logits = np.where(boards == 0, logits, -1e9)
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return h, values, probs
+
+    def evaluate_batch(self, boards: np.ndarray, to_move: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Values (for the side to move) and move probabilities for a batch of positions"""
+        _, values, probs = self.forward(boards, to_move)
+        self.positions_evaluated += len(boards)
+        return values, probs
+
+    def train(self, boards: np.ndarray, to_move: np.ndarray, value_targets: np.ndarray,
+              move_targets: np.ndarray, epochs: int = 20, batch_size: int = 256,
+              learning_rate: float = 1e-3, seed: Optional[int] = None) -> Dict:
+        """
+        Fit both heads with Adam on (position, value, best move) samples
+
+        Args:
+            boards: (N, cells) int8 positions
+            to_move: (N,) +1 (X) / -1 (O) side to move
+            value_targets: (N,) target values in [-1, 1] for the side to move
+            move_targets: (N,) index of the teacher's chosen move
+            epochs: Passes over the data
+            batch_size: Samples per gradient step
+            learning_rate: Adam step size
+            seed: Shuffling seed
+
+        Returns:
+            Dictionary with final 'value_loss', 'policy_loss', 'samples',
+            'time' (seconds) and 'positions_per_sec'
+        """
+        rng = np.random.default_rng(seed)
+        n = len(boards)
+        moments = {k: (np.zeros_like(v), np.zeros_like(v)) for k, v in self.params.items()}
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        value_loss = policy_loss = 0.0
+        start = time.perf_counter()
+
+        for _ in range(epochs):
+            order = rng.permutation(n)
+            value_sum = policy_sum = 0.0
+            for lo in range(0, n, batch_size):
+                idx = order[lo:lo + batch_size]
+                b, m, z, a = boards[idx], to_move[idx], value_targets[idx], move_targets[idx]
+                k = len(idx)
+
+                x = encode(b, m)
+                h, v, probs = self.forward(b, m)
+
+                value_sum += float(((v - z) ** 2).sum())
+                policy_sum += float(-np.log(probs[np.arange(k), a] + 1e-9).sum())
+
+                # Backward pass: MSE on the value head, cross-entropy on the policy head
+                dv = (2.0 / k) * (v - z) * (1.0 - v ** 2)
+                dlogits = probs.copy()
+                dlogits[np.arange(k), a] -= 1.0
+                dlogits /= k
+                dh = dv[:, None] @ self.params['wv'].T + dlogits @ self.params['wp'].T
+                dh *= h > 0
+
+                grads = {
+                    'w1': x.T @ dh, 'b1': dh.sum(axis=0),
+                    'wv': h.T @ dv[:, None], 'bv': np.array([dv.sum()], dtype=np.float32),
+                    'wp': h.T @ dlogits, 'bp': dlogits.sum(axis=0)
+                }
+
+                step += 1
+                for name, grad in grads.items():
+                    m1, m2 = moments[name]
+                    m1 *= beta1
+                    m1 += (1 - beta1) * grad
+                    m2 *= beta2
+                    m2 += (1 - beta2) * grad * grad
+                    m1_hat = m1 / (1 - beta1 ** step)
+                    m2_hat = m2 / (1 - beta2 ** step)
+                    self.params[name] -= (learning_rate * m1_hat / (np.sqrt(m2_hat) + eps)).astype(np.float32)
+
+            value_loss = value_sum / n
+            policy_loss = policy_sum / n
+
+        elapsed = time.perf_counter() - start
+        return {
+            'value_loss': value_loss,
+            'policy_loss': policy_loss,
+            'samples': n,
+            'time': elapsed,
+            'positions_per_sec': n * epochs / elapsed if elapsed > 0 else 0.0
+        }
+
+    def save(self, path: str):
+        """Write weights to an .npz file"""
+        np.savez(path, cells=self.cells, hidden=self.hidden, **self.params)
+
+    @classmethod
+    def load(cls, path: str) -> 'NeuralEvaluator':
+        """Read weights written by save()"""
+        data = np.load(path)
+        net = cls(int(data['cells']), int(data['hidden']))
+        for name in net.params:
+            net.params[name] = data[name].astype(np.float32)
+        return net
+
+
+def generate_training_data(ai, games: int, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Label positions with the engine's own search during self-play
+
+    Every AI decision of ai.play_self_game() becomes one sample: the position
+    before the move, the chosen move and the search score, turned into a value
+    for the side to move and clipped to [-1, 1]. A random number of opening
+    plies per game spreads the samples over many positions.
+    """
+    rng = random.Random(seed)
+    boards, to_move, values, moves = [], [], [], []
+
+    for _ in range(games):
+        record = ai.play_self_game(rng, random_plies=rng.randint(0, ai.cells // 2))
+        for decision in record['decisions']:
+            board = [''] * ai.cells
+            player = 'X'
+            for move in record['moves'][:decision['ply']]:
+                board[move] = player
+                player = 'O' if player == 'X' else 'X'
+            score = decision['score'] if decision['player'] == 'O' else -decision['score']
+            boards.append([MARKS[c] for c in board])
+            to_move.append(MARKS[decision['player']])
+            values.append(max(-1.0, min(1.0, float(score))))
+            moves.append(decision['move'])
+
+    return {
+        'boards': np.array(boards, dtype=np.int8).reshape(-1, ai.cells),
+        'to_move': np.array(to_move, dtype=np.int8),
+        'values': np.array(values, dtype=np.float32),
+        'moves': np.array(moves, dtype=np.int64)
+    }
+
+
+def train_from_self_play(ai, games: int, hidden: int = 64, epochs: int = 20,
+                         seed: Optional[int] = None) -> Tuple[NeuralEvaluator, Dict]:
+    """Generate minimax-labelled self-play data and fit a fresh network to it"""
+    start = time.perf_counter()
+    data = generate_training_data(ai, games, seed)
+    generation_time = time.perf_counter() - start
+
+    net = NeuralEvaluator(ai.cells, hidden=hidden, seed=seed)
+    report = net.train(data['boards'], data['to_move'], data['values'], data['moves'],
+                       epochs=epochs, seed=seed)
+    report['generation_time'] = generation_time
+    return net, report
+
+
+def frontier_scores(net: NeuralEvaluator, boards: List[List[str]], to_move: str) -> List[float]:
+    """Batch-evaluate leaf positions, returning scores from O's point of view"""
+    values, _ = net.evaluate_batch(boards_to_array(boards),
+                                   np.full(len(boards), MARKS[to_move], dtype=np.int8))
+    # Keep network scores strictly inside (-1, 1) so any forced win outranks them
+    sign = 1.0 if to_move == 'O' else -1.0
+    return [sign * max(-0.999, min(0.999, float(v))) for v in values]
+
+
+def policy_order(net: NeuralEvaluator, board: List[str], player: str, moves: List[int]) -> List[int]:
+    """Sort moves by the policy head's probability, most promising first"""
+    _, probs = net.evaluate_batch(boards_to_array([board]), np.array([MARKS[player]], dtype=np.int8))
+    return sorted(moves, key=lambda move: -probs[0, move])
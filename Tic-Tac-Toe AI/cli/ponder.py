@@ -0,0 +1,159 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Pondering (searching on the opponent's time)
+
+While the human thinks, the AI searches its answers to their likely replies
+and keeps them, so the answer to the actual move is usually ready at once:
+- replies are searched likeliest first (as ordered by the caller)
+- the CLI ponders on a background thread while input() waits; the GUI
+  ponders one reply per after() callback so the window stays responsive
+- pondering stops at its time budget, after max_replies replies, or as soon
+  as the human moves; a search in progress is interrupted through
+  interrupted(), which the search polls
+- ponder hits, misses and the search time saved are counted
+
+Author: Your Name
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+class SearchInterrupted(Exception):
+    """Raised inside a search when pondering is stopped"""
+
+
+class Ponderer:
+    """Searches the answers to the opponent's replies ahead of time"""
+
+    def __init__(self, search: Callable[[List[str], str], Dict], budget_ms: float = 5000,
+                 max_replies: Optional[int] = None):
+        """
+        Args:
+            search: Returns the answer of player on a board ({'index', 'score',
+                    ...}); may raise SearchInterrupted when interrupted() is true
+            budget_ms: Wall time allowed per pondering session
+            max_replies: Replies searched per session (default: all)
+        """
+        self.search = search
+        self.budget_ms = budget_ms
+        self.max_replies = max_replies
+        self.answers = {}
+        self.pending = []
+        self.player = None
+        self.active = False
+        self.deadline = 0.0
+        self.cancel = threading.Event()
+        self.thread = None
+        self.stats = {'sessions': 0, 'searched': 0, 'interrupted': 0, 'hits': 0, 'misses': 0,
+                      'saved_ms': 0.0, 'ponder_ms': 0.0}
+
+    def begin(self, board: Sequence[str], replies: Sequence[int], opponent: str, player: str):
+        """
+        Queue a pondering session: player's answers after each of opponent's replies
+
+        Args:
+            board: Position with opponent to move
+            replies: Opponent's moves to prepare for, likeliest first
+            opponent: Side about to move ('X' or 'O')
+            player: Side whose answers are searched
+        """
+        self.stop()
+        self.cancel.clear()
+        if self.max_replies is not None:
+            replies = replies[:self.max_replies]
+        self.pending = []
+        for move in replies:
+            child = list(board)
+            child[move] = opponent
+            self.pending.append(child)
+        self.answers = {}
+        self.player = player
+        self.active = True
+        self.deadline = time.perf_counter() + self.budget_ms / 1000
+        self.stats['sessions'] += 1
+
+    def interrupted(self) -> bool:
+        """Whether the running search must stop: the opponent moved or time is up"""
+        return self.cancel.is_set() or time.perf_counter() > self.deadline
+
+    def step(self) -> bool:
+        """Search the next queued position; False once the session is over"""
+        if not self.pending or self.interrupted():
+            self.pending = []
+            return False
+
+        board = self.pending.pop(0)
+        start = time.perf_counter()
+        try:
+            answer = self.search(board, self.player)
+        except SearchInterrupted:
+            self.stats['interrupted'] += 1
+            self.pending = []
+            return False
+        finally:
+            self.stats['ponder_ms'] += (time.perf_counter() - start) * 1000
+
+        answer.setdefault('time', (time.perf_counter() - start) * 1000)
+        self.answers[tuple(board)] = answer
+        self.stats['searched'] += 1
+        return bool(self.pending)
+
+    def run(self):
+        """Thread body: step through the session until it is over"""
+        while self.step():
+            pass
+
+    def start(self, board: Sequence[str], replies: Sequence[int], opponent: str, player: str):
+        """begin() a session and ponder it on a background thread"""
+        self.begin(board, replies, opponent, player)
+        self.thread = threading.Thread(target=self.run, name='ponder', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop pondering and wait until the engine is free again"""
+        self.cancel.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.pending = []
+
+    def discard(self):
+        """Stop pondering and drop the session uncounted (the game ended first)"""
+        self.stop()
+        self.active = False
+        self.answers = {}
+
+    def ready(self, board: Sequence[str]) -> bool:
+        """Whether an answer for board has been prepared"""
+        return tuple(board) in self.answers
+
+    def take(self, board: Sequence[str]) -> Optional[Dict]:
+        """
+        Stop pondering and return the answer prepared for board
+
+        Counts a hit or a miss once per session; the other answers are
+        dropped. Returns None on a miss or when no session was started.
+        """
+        self.stop()
+        if not self.active:
+            return None
+        self.active = False
+        answer = self.answers.get(tuple(board))
+        self.answers = {}
+        if answer is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+            self.stats['saved_ms'] += answer['time']
+        return answer
+
+    def summary(self) -> Dict:
+        """Hit rate and latency saved for the stats displays"""
+        taken = self.stats['hits'] + self.stats['misses']
+        return {
+            'hit_rate': self.stats['hits'] / taken * 100 if taken else 0.0,
+            'saved_per_move_ms': self.stats['saved_ms'] / taken if taken else 0.0,
+            **self.stats
+        }
@@ -0,0 +1,398 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Proof-number search
+
+Decides positions (win, loss or draw) instead of scoring them. The search
+always expands a most-proving node: a leaf whose result would settle the
+most of what is still open about the root:
+- proof number (pn): how many leaves still have to be proved for the
+  claim "claimant wins" to hold; disproof number (dn): the same to refute it
+- OR nodes (claimant to move) take the smallest pn and the sum of dn of
+  their children, AND nodes the sum of pn and the smallest dn
+- 'pns': best-first search over an explicit tree, which grows with every
+  expansion; 'dfpn': depth-first proof-number search, the same expansion
+  order driven by pn/dn thresholds, recomputing subtrees from a table that
+  is capped in memory (least-worked entries are evicted first)
+- a result takes up to two proofs: "the side to move wins", then "the
+  opponent wins"; disproving both means a draw
+- every call is bounded by a node budget; calling solve() again on the same
+  position resumes from the tree or table where the last call stopped
+- the pns tree cannot evict part of itself: when it fills its memory cap,
+  the trees of other positions are dropped, and if that is not enough the
+  call reports 'memory' (resuming cannot help; dfpn can)
+
+Author: Your Name
+"""
+
+import time
+from math import isqrt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from search_cache import MEGABYTE
+from win_lines import WinLines
+from zobrist import ZobristKeys
+
+INF = 10 ** 9               # proof/disproof number of a settled claim
+TABLE_ENTRY_BYTES = 160     # dict slot, key and (pn, dn, work) tuple
+TREE_NODE_BYTES = 200       # PNNode with its slots and place in the parent's list
+METHODS = ('pns', 'dfpn')
+OTHER = {'X': 'O', 'O': 'X'}
+
+
+class BudgetExhausted(Exception):
+    """Raised when a solve() call runs out of nodes"""
+
+
+class TreeFull(Exception):
+    """Raised when the pns tree of the position being solved fills the memory cap"""
+
+
+class PNNode:
+    """Node of the explicit proof-number tree"""
+
+    __slots__ = ('move', 'parent', 'children', 'pn', 'dn', 'or_node')
+
+    def __init__(self, move: int, parent: Optional['PNNode'], pn: int, dn: int, or_node: bool):
+        self.move = move
+        self.parent = parent
+        self.children = None
+        self.pn = pn
+        self.dn = dn
+        self.or_node = or_node
+
+
+class ProofNumberSearch:
+    """PNS / df-pn solver over generalised win patterns"""
+
+    def __init__(self, win_patterns: List[List[int]], cells: int, method: str = 'dfpn',
+                 memory_mb: float = 64, symmetry=None, symmetry_depth: int = 3):
+        """
+        Args:
+            win_patterns: Cell lists of every winning line
+            cells: Number of cells on the board
+            method: 'pns' (explicit tree) or 'dfpn' (memory-capped table)
+            memory_mb: Cap on the tree or table size in megabytes
+            symmetry: Optional symmetry.SymmetryTables; symmetric moves are
+                      then expanded once in the first symmetry_depth plies
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown proof-number method {method!r}; use one of {', '.join(METHODS)}")
+        self.win_patterns = win_patterns
+        self.cells = cells
+        self.lines = WinLines(win_patterns, cells)
+        self.zobrist = ZobristKeys(isqrt(cells))
+        self.method = method
+        self.symmetry = symmetry
+        self.symmetry_depth = symmetry_depth
+        entry_bytes = TABLE_ENTRY_BYTES if method == 'dfpn' else TREE_NODE_BYTES
+        self.capacity = max(1024, int(memory_mb * MEGABYTE) // entry_bytes)
+
+        # dfpn: one table per claimant (half the capacity each), key -> (pn, dn, work);
+        # pns: one tree per question, all trees sharing the capacity
+        self.tables = {'X': {}, 'O': {}}
+        self.trees = {}
+        self.tree_nodes = 0
+        self.root_key = 0
+
+        # Working position of the current solve() call
+        self.board = []
+        self.counts = {}
+        self.key = 0
+        self.empty = 0
+        self.claimant = 'X'
+        self.nodes = 0
+        self.budget = 0
+        self.work = {}
+        self.stats = {'solves': 0, 'nodes': 0, 'proved': 0, 'evictions': 0}
+
+    # ----- board state -----
+
+    def set_position(self, board: Sequence[str]):
+        """Make board the working position"""
+        self.board = list(board)
+        self.counts = self.lines.count_lines(self.board)
+        self.key = self.zobrist.key(self.board)
+        self.empty = self.board.count('')
+
+    def place(self, cell: int, player: str) -> bool:
+        """Place a mark on the working position and report whether it completes a line"""
+        self.key ^= self.zobrist.values[player][cell]
+        self.empty -= 1
+        return self.lines.place(self.board, self.counts, cell, player)
+
+    def unplace(self, cell: int, player: str):
+        """Take back a mark placed with place()"""
+        self.key ^= self.zobrist.values[player][cell]
+        self.empty += 1
+        self.lines.unplace(self.board, self.counts, cell, player)
+
+    def moves(self, depth: int) -> List[int]:
+        """Legal moves of the working position, symmetric ones once near the root"""
+        moves = [cell for cell, mark in enumerate(self.board) if mark == '']
+        if self.symmetry is not None and depth < self.symmetry_depth:
+            moves = self.symmetry.unique_moves(self.board, moves)
+        return moves
+
+    def leaf_numbers(self, won: bool, mover: str) -> Tuple[int, int]:
+        """
+        (pn, dn) of the position after mover's move, before it is expanded
+
+        Settled if the move won or filled the board; otherwise 1 for the side
+        to move there and the number of its moves for the other side.
+        """
+        if won:
+            return (0, INF) if mover == self.claimant else (INF, 0)
+        if self.empty == 0:
+            return INF, 0
+        if mover == self.claimant:        # AND node next: every reply must be proved
+            return self.empty, 1
+        return 1, self.empty
+
+    def count_node(self):
+        """Count one node against the budget"""
+        if self.nodes >= self.budget:
+            raise BudgetExhausted()
+        self.nodes += 1
+
+    # ----- df-pn -----
+
+    def lookup(self, move: int, player: str) -> Tuple[int, int]:
+        """(pn, dn) of the child after player's move, from the table or as a new leaf"""
+        won = self.place(move, player)
+        entry = self.tables[self.claimant].get(self.key)
+        numbers = entry[:2] if entry is not None and not won else self.leaf_numbers(won, player)
+        self.unplace(move, player)
+        return numbers
+
+    def store(self, pn: int, dn: int, work: int):
+        """Record the working position's numbers, evicting the least-worked half when full"""
+        table = self.tables[self.claimant]
+        table[self.key] = (pn, dn, work)
+        if len(table) > self.capacity // 2:
+            keep = sorted(table.items(), key=lambda item: item[1][2], reverse=True)[:self.capacity // 4]
+            self.stats['evictions'] += len(table) - len(keep)
+            table.clear()
+            table.update(keep)
+
+    def mid(self, player: str, depth: int, pn_limit: int, dn_limit: int) -> Tuple[int, int]:
+        """
+        Expand below the working position until its pn or dn reaches its limit
+
+        Returns:
+            The position's (pn, dn), also stored in the table
+        """
+        self.count_node()
+        start = self.nodes
+        or_node = player == self.claimant
+        moves = self.moves(depth)
+        while True:
+            numbers = [self.lookup(move, player) for move in moves]
+            if or_node:
+                pn = min(child_pn for child_pn, _ in numbers)
+                dn = min(INF, sum(child_dn for _, child_dn in numbers))
+            else:
+                pn = min(INF, sum(child_pn for child_pn, _ in numbers))
+                dn = min(child_dn for _, child_dn in numbers)
+            if pn >= pn_limit or dn >= dn_limit:
+                break
+
+            # Most-proving child, and the thresholds under which it stays so
+            order = sorted(range(len(moves)), key=lambda i: numbers[i][0 if or_node else 1])
+            best = order[0]
+            second = numbers[order[1]][0 if or_node else 1] if len(order) > 1 else INF
+            child_pn, child_dn = numbers[best]
+            if or_node:
+                child_pn_limit = min(pn_limit, second + 1)
+                child_dn_limit = dn_limit - dn + child_dn
+            else:
+                child_pn_limit = pn_limit - pn + child_pn
+                child_dn_limit = min(dn_limit, second + 1)
+
+            move = moves[best]
+            self.place(move, player)
+            try:
+                self.mid(OTHER[player], depth + 1, child_pn_limit, child_dn_limit)
+            except BudgetExhausted:
+                # Keep this call's numbers so the next solve() resumes past them
+                self.unplace(move, player)
+                self.store(pn, dn, self.nodes - start + 1)
+                raise
+            self.unplace(move, player)
+
+        self.store(pn, dn, self.nodes - start + 1)
+        return pn, dn
+
+    def prove_dfpn(self, player: str) -> bool:
+        """Whether the claimant wins the working position (player to move)"""
+        entry = self.tables[self.claimant].get(self.key)
+        if entry is None or (entry[0] and entry[1]):
+            pn, _ = self.mid(player, 0, INF, INF)
+        else:
+            pn = entry[0]
+        return pn == 0
+
+    # ----- best-first PNS -----
+
+    def expand(self, node: PNNode, player: str, depth: int):
+        """Create node's children with their leaf numbers"""
+        if self.nodes >= self.budget:
+            raise BudgetExhausted()
+        if self.tree_nodes >= self.capacity:
+            self.drop_other_trees()
+            if self.tree_nodes >= self.capacity:
+                raise TreeFull()
+        children = []
+        for move in self.moves(depth):
+            won = self.place(move, player)
+            pn, dn = self.leaf_numbers(won, player)
+            self.unplace(move, player)
+            children.append(PNNode(move, node, pn, dn, not node.or_node))
+        node.children = children
+        self.nodes += len(children)
+        self.tree_nodes += len(children)
+
+    def update(self, node: PNNode):
+        """Recompute node's numbers from its children; a settled node's subtree is freed"""
+        if node.or_node:
+            node.pn = min(child.pn for child in node.children)
+            node.dn = min(INF, sum(child.dn for child in node.children))
+        else:
+            node.pn = min(INF, sum(child.pn for child in node.children))
+            node.dn = min(child.dn for child in node.children)
+        if node.pn == 0 or node.dn == 0:
+            stack = list(node.children)
+            freed = len(stack)
+            while stack:
+                child = stack.pop()
+                if child.children:
+                    freed += len(child.children)
+                    stack.extend(child.children)
+            self.tree_nodes -= freed
+            node.children = []
+
+    def drop_other_trees(self):
+        """Free the trees of every position but the one being solved"""
+        self.trees = {question: root for question, root in self.trees.items() if question[0] == self.root_key}
+        self.tree_nodes = 0
+        for root in self.trees.values():
+            stack = list(root.children or ())
+            while stack:
+                node = stack.pop()
+                self.tree_nodes += 1
+                stack.extend(node.children or ())
+
+    def prove_pns(self, player: str) -> bool:
+        """Whether the claimant wins the working position (player to move)"""
+        question = (self.key, self.claimant)
+        root = self.trees.get(question)
+        if root is None:
+            root = self.trees[question] = PNNode(-1, None, 1, 1, player == self.claimant)
+
+        while root.pn and root.dn:
+            # Descend to a most-proving leaf, playing its moves on the working board
+            node, mover, depth = root, player, 0
+            while node.children:
+                node = min(node.children, key=lambda child: child.pn if child.parent.or_node else child.dn)
+                self.place(node.move, mover)
+                mover = OTHER[mover]
+                depth += 1
+            self.expand(node, mover, depth)
+
+            # Back up the new numbers to the root, taking the moves back
+            while node is not None:
+                self.update(node)
+                if node.parent is not None:
+                    mover = OTHER[mover]
+                    self.unplace(node.move, mover)
+                node = node.parent
+        return root.pn == 0
+
+    # ----- entry points -----
+
+    def prove(self, board: Sequence[str], player: str, claimant: str) -> bool:
+        """Whether claimant wins board with player to move"""
+        self.set_position(board)
+        self.claimant = claimant
+        self.root_key = self.key
+        if self.method == 'dfpn':
+            return self.prove_dfpn(player)
+        return self.prove_pns(player)
+
+    def terminal_result(self, board: Sequence[str], player: str) -> Optional[str]:
+        """'win'/'loss'/'draw' for player if board is already decided, else None"""
+        self.set_position(board)
+        winner = self.lines.winner_from_counts(self.counts)
+        if winner is not None:
+            return 'win' if winner == player else 'loss'
+        return 'draw' if self.empty == 0 else None
+
+    def solve(self, board: Sequence[str], player: str, max_nodes: int = 1000000) -> Dict:
+        """
+        Decide board with player to move
+
+        Args:
+            board: Position to decide
+            player: Side to move ('X' or 'O')
+            max_nodes: Nodes this call may expand (at least cells + 1: a
+                       resumed dfpn call first walks back down from the
+                       root, one node per ply)
+
+        Returns:
+            {'result': 'win'/'loss'/'draw' for player, 'unknown' when the
+            budget ran out (call again to resume) or 'memory' when the pns
+            tree is full (raise memory_mb or use dfpn), 'nodes' (this call),
+            'total_nodes' (all calls on this position), 'time_ms', 'entries'}
+        """
+        self.stats['solves'] += 1
+        self.nodes = 0
+        self.budget = max(max_nodes, self.cells + 1)
+        position = (tuple(board), player)
+        start = time.perf_counter()
+
+        result = self.terminal_result(board, player)
+        if result is None:
+            try:
+                if self.prove(board, player, player):
+                    result = 'win'
+                elif self.prove(board, player, OTHER[player]):
+                    result = 'loss'
+                else:
+                    result = 'draw'
+            except BudgetExhausted:
+                result = 'unknown'
+            except TreeFull:
+                result = 'memory'
+
+        self.stats['nodes'] += self.nodes
+        self.stats['proved'] += result in ('win', 'loss', 'draw')
+        self.work[position] = self.work.get(position, 0) + self.nodes
+        return {
+            'result': result,
+            'nodes': self.nodes,
+            'total_nodes': self.work[position],
+            'time_ms': (time.perf_counter() - start) * 1000,
+            'entries': self.entries()
+        }
+
+    def entries(self) -> int:
+        """Table entries (dfpn) or tree nodes (pns) held in memory"""
+        if self.method == 'dfpn':
+            return sum(len(table) for table in self.tables.values())
+        return self.tree_nodes
+
+    def clear(self):
+        """Drop every table, tree and per-position node count"""
+        self.tables = {'X': {}, 'O': {}}
+        self.trees = {}
+        self.tree_nodes = 0
+        self.work = {}
+
+    def summary(self) -> Dict:
+        """Solve counts and memory use for the stats displays"""
+        entry_bytes = TABLE_ENTRY_BYTES if self.method == 'dfpn' else TREE_NODE_BYTES
+        return {
+            'entries': self.entries(),
+            'capacity': self.capacity,
+            'megabytes': self.entries() * entry_bytes / MEGABYTE,
+            **self.stats
+        }
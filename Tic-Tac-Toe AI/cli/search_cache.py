@@ -0,0 +1,387 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Bounded search caches
+
+Memory-capped caches for positions, so a long-running session cannot grow
+without bound:
+- TranspositionTable: fixed-capacity open-addressing table for alpha-beta
+  results with depth/age replacement, as chess engines use
+- SharedTranspositionTable: the same table in a multiprocessing shared
+  memory block, attached by name from every worker process, so a position
+  searched by one worker is a hit for all the others
+- LRUCache: least-recently-used cache for whole analysis results
+
+All take a memory cap in megabytes and count hits, misses and evictions
+for the stats displays (per process for the shared table); the hashed
+tables also count collisions. The LRU stores exact keys, so it has none.
+
+Author: Your Name
+"""
+
+import struct
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+# Bound types of a stored alpha-beta score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Approximate bytes per table slot: six list references plus the key and
+# score objects (small ints for draft/age/flag/move are shared by Python)
+ENTRY_BYTES = 104
+
+MEGABYTE = 1024 * 1024
+
+# Shared table layout: a header (magic, capacity, bucket size) followed by
+# fixed-size entries of three little-endian 64-bit words:
+#   check = key ^ score bits ^ meta, score (float64), meta
+# meta packs OCCUPIED | draft << 34 | age << 18 | flag << 16 | (move + 1)
+SHARED_MAGIC = 0x5454_4D41_5452_4958
+SHARED_HEADER = struct.Struct('<QQQ')
+SHARED_HEADER_BYTES = 64
+SHARED_ENTRY = struct.Struct('<QQQ')
+SHARED_ENTRY_BYTES = SHARED_ENTRY.size
+OCCUPIED = 1 << 63
+FLOAT_BITS = struct.Struct('<d')
+WORD = struct.Struct('<Q')
+
+
+def score_to_table(score: float, depth: int) -> float:
+    """
+    Make a win score relative to the node it is stored at
+
+    Win scores are win_score - depth counted from the root; stored relative
+    to the node they stay correct when the position recurs at another depth.
+    Heuristic and draw scores lie strictly inside (-1, 1) and pass unchanged.
+    """
+    if score >= 1:
+        return score + depth
+    if score <= -1:
+        return score - depth
+    return score
+
+
+def score_from_table(score: float, depth: int) -> float:
+    """Inverse of score_to_table for a node at the given depth"""
+    if score >= 1:
+        return score - depth
+    if score <= -1:
+        return score + depth
+    return score
+
+
+class TranspositionTable:
+    """Fixed-size open-addressing table of alpha-beta results"""
+
+    def __init__(self, megabytes: float = 16, bucket_size: int = 4):
+        slots = max(bucket_size, int(megabytes * MEGABYTE) // ENTRY_BYTES)
+        capacity = 1 << (slots.bit_length() - 1)   # power of two for masking
+        self.capacity = capacity
+        self.bucket_size = bucket_size
+        self.mask = (capacity - 1) & ~(bucket_size - 1)
+        self.generation = 0
+        self.used = 0
+        self.stats = {'hits': 0, 'misses': 0, 'collisions': 0, 'evictions': 0, 'stores': 0}
+        self.clear()
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        capacity = self.capacity
+        self.keys = [None] * capacity
+        self.drafts = [0] * capacity
+        self.ages = [0] * capacity
+        self.scores = [0.0] * capacity
+        self.flags = [EXACT] * capacity
+        self.moves = [-1] * capacity
+        self.generation = 0
+        self.used = 0
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def new_search(self):
+        """Age the table: entries from earlier searches become preferred victims"""
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def probe(self, key: int) -> Optional[Tuple[int, float, int, int]]:
+        """Return (draft, score, flag, move) stored for key, or None"""
+        keys = self.keys
+        base = key & self.mask
+        for slot in range(base, base + self.bucket_size):
+            stored = keys[slot]
+            if stored == key:
+                self.stats['hits'] += 1
+                self.ages[slot] = self.generation
+                return self.drafts[slot], self.scores[slot], self.flags[slot], self.moves[slot]
+            if stored is None:
+                break
+        if keys[base] is not None:
+            self.stats['collisions'] += 1
+        self.stats['misses'] += 1
+        return None
+
+    def store(self, key: int, draft: int, score: float, flag: int, move: int = -1):
+        """
+        Save a search result, replacing within the key's bucket
+
+        The slot already holding key is updated; otherwise an empty slot is
+        taken; otherwise the entry with the lowest draft minus age penalty
+        (stale and shallow entries first) is evicted.
+        """
+        keys = self.keys
+        base = key & self.mask
+        victim = base
+        victim_worth = None
+        generation = self.generation
+
+        for slot in range(base, base + self.bucket_size):
+            stored = keys[slot]
+            if stored == key or stored is None:
+                victim = slot
+                break
+            worth = self.drafts[slot] - 8 * ((generation - self.ages[slot]) & 0xFFFF)
+            if victim_worth is None or worth < victim_worth:
+                victim, victim_worth = slot, worth
+        else:
+            self.stats['evictions'] += 1
+
+        if keys[victim] is None:
+            self.used += 1
+        keys[victim] = key
+        self.drafts[victim] = draft
+        self.ages[victim] = generation
+        self.scores[victim] = score
+        self.flags[victim] = flag
+        self.moves[victim] = move
+        self.stats['stores'] += 1
+
+    def footprint_bytes(self) -> int:
+        """Approximate memory held by the table"""
+        return self.capacity * ENTRY_BYTES
+
+    def summary(self) -> Dict:
+        """Occupancy, footprint and counters for the stats displays"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': self.used,
+            'capacity': self.capacity,
+            'megabytes': self.footprint_bytes() / MEGABYTE,
+            'hit_rate': self.stats['hits'] / lookups * 100 if lookups else 0.0,
+            **self.stats
+        }
+
+
+def score_bits(score: float) -> int:
+    """The float64 bit pattern of a score as an unsigned integer"""
+    return WORD.unpack(FLOAT_BITS.pack(score))[0]
+
+
+def bits_score(bits: int) -> float:
+    """Inverse of score_bits"""
+    return FLOAT_BITS.unpack(WORD.pack(bits))[0]
+
+
+class SharedTranspositionTable:
+    """
+    TranspositionTable in shared memory, readable and writable by many processes
+
+    Writes take no lock. Each entry stores its key XORed with the rest of the
+    entry, so an entry read while another process is rewriting it (a torn
+    read) or overwritten by another position no longer verifies against the
+    probed key and counts as a miss instead of returning a wrong score.
+
+    Hits, misses and the other counters are kept per process; entries(),
+    capacity and megabytes describe the one shared block.
+    """
+
+    def __init__(self, megabytes: float = 16, bucket_size: int = 4, name: Optional[str] = None):
+        """
+        Args:
+            megabytes: Size of a new block (ignored when attaching)
+            bucket_size: Slots per bucket of a new block (ignored when attaching)
+            name: Shared memory block to attach to; None creates a new one,
+                  which this process owns and must unlink()
+        """
+        if name is None:
+            slots = max(bucket_size, int(megabytes * MEGABYTE) // SHARED_ENTRY_BYTES)
+            capacity = 1 << (slots.bit_length() - 1)
+            self.shm = shared_memory.SharedMemory(create=True,
+                                                  size=SHARED_HEADER_BYTES + capacity * SHARED_ENTRY_BYTES)
+            SHARED_HEADER.pack_into(self.shm.buf, 0, SHARED_MAGIC, capacity, bucket_size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            magic, capacity, bucket_size = SHARED_HEADER.unpack_from(self.shm.buf, 0)
+            if magic != SHARED_MAGIC:
+                self.shm.close()
+                raise ValueError(f"Shared memory block {name} is not a transposition table")
+            self.owner = False
+
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.capacity = capacity
+        self.bucket_size = bucket_size
+        self.mask = (capacity - 1) & ~(bucket_size - 1)
+        self.generation = 0
+        self.stats = {'hits': 0, 'misses': 0, 'collisions': 0, 'evictions': 0, 'stores': 0}
+
+    def clear(self):
+        """
+        Start a new game in this process
+
+        Entries stay: they are shared with the other workers and remain
+        valid across games, so they are only aged like a new search.
+        """
+        self.new_search()
+
+    def wipe(self):
+        """Drop every entry for all processes"""
+        self.buf[SHARED_HEADER_BYTES:] = bytes(self.capacity * SHARED_ENTRY_BYTES)
+
+    def new_search(self):
+        """Age this process's stores: older entries become preferred victims"""
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def read(self, slot: int) -> Tuple[Optional[int], int, int]:
+        """(key, score bits, meta) of a slot; key is None for an empty slot"""
+        check, bits, meta = SHARED_ENTRY.unpack_from(self.buf, SHARED_HEADER_BYTES + slot * SHARED_ENTRY_BYTES)
+        if not meta & OCCUPIED:
+            return None, bits, meta
+        return check ^ bits ^ meta, bits, meta
+
+    def probe(self, key: int) -> Optional[Tuple[int, float, int, int]]:
+        """Return (draft, score, flag, move) stored for key, or None"""
+        base = key & self.mask
+        occupied = False
+        for slot in range(base, base + self.bucket_size):
+            stored, bits, meta = self.read(slot)
+            if stored == key:
+                self.stats['hits'] += 1
+                return ((meta >> 34) & 0xFFFF, bits_score(bits), (meta >> 16) & 0x3,
+                        (meta & 0xFFFF) - 1)
+            occupied = occupied or stored is not None
+        if occupied:
+            self.stats['collisions'] += 1
+        self.stats['misses'] += 1
+        return None
+
+    def store(self, key: int, draft: int, score: float, flag: int, move: int = -1):
+        """
+        Save a search result, replacing within the key's bucket
+
+        Same policy as TranspositionTable.store(). Two processes storing into
+        one slot at once leave one of the entries, or a torn one that never
+        verifies; either way no probe returns a wrong result.
+        """
+        base = key & self.mask
+        victim = base
+        victim_worth = None
+        generation = self.generation
+
+        for slot in range(base, base + self.bucket_size):
+            stored, _, meta = self.read(slot)
+            if stored == key or stored is None:
+                victim = slot
+                break
+            worth = ((meta >> 34) & 0xFFFF) - 8 * ((generation - ((meta >> 18) & 0xFFFF)) & 0xFFFF)
+            if victim_worth is None or worth < victim_worth:
+                victim, victim_worth = slot, worth
+        else:
+            self.stats['evictions'] += 1
+
+        bits = score_bits(score)
+        meta = OCCUPIED | (draft & 0xFFFF) << 34 | generation << 18 | flag << 16 | (move + 1) & 0xFFFF
+        SHARED_ENTRY.pack_into(self.buf, SHARED_HEADER_BYTES + victim * SHARED_ENTRY_BYTES,
+                               (key ^ bits ^ meta) & 0xFFFFFFFFFFFFFFFF, bits, meta)
+        self.stats['stores'] += 1
+
+    def entries(self) -> int:
+        """Occupied slots of the shared block"""
+        words = np.frombuffer(self.buf, dtype='<u8', offset=SHARED_HEADER_BYTES)
+        count = int(np.count_nonzero(words[2::3] >> np.uint64(63)))
+        del words
+        return count
+
+    def footprint_bytes(self) -> int:
+        """Size of the shared block (held once, whatever the number of processes)"""
+        return self.shm.size
+
+    def summary(self) -> Dict:
+        """Occupancy, footprint and this process's counters for the stats displays"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': self.entries(),
+            'capacity': self.capacity,
+            'megabytes': self.footprint_bytes() / MEGABYTE,
+            'hit_rate': self.stats['hits'] / lookups * 100 if lookups else 0.0,
+            **self.stats
+        }
+
+    def close(self):
+        """Detach this process from the block"""
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """Detach and free the block (creating process, after the workers are done)"""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class LRUCache:
+    """Size-capped least-recently-used cache for analysis results"""
+
+    def __init__(self, megabytes: float = 4, entry_bytes: int = 1024):
+        self.entry_bytes = entry_bytes
+        self.max_entries = max(1, int(megabytes * MEGABYTE) // entry_bytes)
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'stores': 0}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it most recently used"""
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.stats['misses'] += 1
+            return default
+        self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Cache a value, evicting the least recently used entries above the cap"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.stats['stores'] += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self.entries.clear()
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def footprint_bytes(self) -> int:
+        """Approximate memory held by the cached entries"""
+        return len(self.entries) * self.entry_bytes
+
+    def summary(self) -> Dict:
+        """Occupancy, footprint and counters for the stats displays"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': len(self.entries),
+            'capacity': self.max_entries,
+            'megabytes': self.footprint_bytes() / MEGABYTE,
+            'hit_rate': self.stats['hits'] / lookups * 100 if lookups else 0.0,
+            **self.stats
+        }
@@ -0,0 +1,208 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Parallel self-play generation
+
+Fans AI-vs-AI games out over a process pool and writes them as sharded
+JSON-lines files in the history format (shard_00000.jsonl, ...):
+- one engine per worker process, built once, so its caches stay warm
+- at most two shards per worker are queued; workers write their own shard
+  files and send back only a small summary
+- every shard has its own seed derived from the run seed, so a shard holds
+  the same games whichever worker plays it and in whatever order
+- finished shards are renamed into place; re-running the same command
+  skips them, so an interrupted run resumes where it stopped
+- optionally all workers share one transposition table in shared memory,
+  so a position searched by one worker is a hit for the others
+
+Author: Your Name
+"""
+
+import os
+import json
+import time
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import analytics_export
+from search_cache import SharedTranspositionTable
+
+MANIFEST_FILE = 'manifest.json'
+
+# Engine of the current worker process, built by init_worker()
+worker_ai = None
+
+
+def shard_path(out_dir: str, shard: int) -> str:
+    """File holding one finished shard"""
+    return os.path.join(out_dir, f"shard_{shard:05d}.jsonl")
+
+
+def shard_seed(seed: int, shard: int, stream: str = 'openings') -> str:
+    """Seed of one shard's random stream, independent of scheduling"""
+    return f"{seed}:{shard}:{stream}"
+
+
+def init_worker(factory: Callable[[Any], Any], factory_args: Any, shared_tt: Optional[str] = None):
+    """Process pool initializer: build this worker's engine once, attached to the shared table if any"""
+    global worker_ai
+    worker_ai = factory(factory_args)
+    if shared_tt is not None:
+        worker_ai.tt = SharedTranspositionTable(name=shared_tt)
+
+
+def play_shard(shard: int, games: int, seed: int, path: str, random_plies: int) -> Dict:
+    """Play one shard of games in a worker and write it to path"""
+    ai = worker_ai
+    rng = random.Random(shard_seed(seed, shard))
+    ai.rng.seed(shard_seed(seed, shard, 'engine'))
+
+    start = time.perf_counter()
+    moves = 0
+    partial = path + '.tmp'
+    with open(partial, 'w') as f:
+        for _ in range(games):
+            record = ai.play_self_game(rng, random_plies=random_plies)
+            moves += len(record['moves'])
+            f.write(json.dumps(record) + '\n')
+    os.replace(partial, path)
+
+    return {
+        'shard': shard,
+        'games': games,
+        'moves': moves,
+        'time': time.perf_counter() - start,
+        'worker': os.getpid(),
+        'tt': ai.tt.summary() if isinstance(ai.tt, SharedTranspositionTable) else None
+    }
+
+
+def load_manifest(out_dir: str, settings: Dict) -> Dict:
+    """Create the run manifest, or check that a resumed run matches it"""
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        for name, value in settings.items():
+            if name == 'seed' and value is None:
+                continue
+            if manifest.get(name) != value:
+                raise ValueError(f"{out_dir} holds a run with {name}={manifest.get(name)!r}, "
+                                 f"not {value!r}; use a new directory")
+        return manifest
+
+    manifest = dict(settings)
+    if manifest['seed'] is None:
+        manifest['seed'] = random.randrange(2 ** 32)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def run_self_play(factory: Callable[[Any], Any], factory_args: Any, out_dir: str, games: int,
+                  shard_size: int = 100, workers: Optional[int] = None, seed: Optional[int] = None,
+                  random_plies: int = 1, config: Optional[Dict] = None,
+                  on_shard: Optional[Callable[[Dict], None]] = None,
+                  shared_tt_mb: Optional[float] = None) -> Dict:
+    """
+    Generate self-play games in parallel into sharded history files
+
+    Args:
+        factory: Picklable function building an engine from factory_args,
+                 called once in every worker process
+        factory_args: Argument passed to factory
+        out_dir: Directory for the shards and the run manifest
+        games: Total number of games
+        shard_size: Games per shard (the unit of work and of resuming)
+        workers: Worker processes (default: one per CPU)
+        seed: Run seed; shard seeds are derived from it (default: random,
+              recorded in the manifest)
+        random_plies: Random opening moves per game
+        config: Engine settings recorded in the manifest; resuming with
+                different settings is refused
+        on_shard: Called with each finished shard's summary
+        shared_tt_mb: Size of a transposition table shared by all workers
+                      (default: each engine keeps its own)
+
+    Returns:
+        Dictionary with 'games' played, 'shards', 'skipped_shards', 'seed',
+        'time', overall 'games_per_sec', per-worker 'workers' stats (with
+        'tt_hit_rate' when the table is shared) and the shared table's
+        'tt' summary or None
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    settings = {'games': games, 'shard_size': shard_size, 'random_plies': random_plies,
+                'seed': seed, 'config': config or {}}
+    manifest = load_manifest(out_dir, settings)
+    seed = manifest['seed']
+
+    shards = (games + shard_size - 1) // shard_size
+    pending = [shard for shard in range(shards) if not os.path.exists(shard_path(out_dir, shard))]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+
+    per_worker = {}
+    played = 0
+    start = time.perf_counter()
+    shared_tt = SharedTranspositionTable(shared_tt_mb) if shared_tt_mb and pending else None
+
+    try:
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(factory, factory_args, shared_tt and shared_tt.name)) as pool:
+                queue = iter(pending)
+                running = set()
+
+                def submit_next():
+                    shard = next(queue, None)
+                    if shard is not None:
+                        count = min(shard_size, games - shard * shard_size)
+                        running.add(pool.submit(play_shard, shard, count, seed,
+                                                shard_path(out_dir, shard), random_plies))
+
+                # Bounded queue: two shards per worker, refilled as they finish
+                for _ in range(2 * workers):
+                    submit_next()
+
+                while running:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        played += result['games']
+                        stats = per_worker.setdefault(result['worker'], {'shards': 0, 'games': 0, 'time': 0.0})
+                        stats['shards'] += 1
+                        stats['games'] += result['games']
+                        stats['time'] += result['time']
+                        if result['tt'] is not None:
+                            stats['tt_hits'] = result['tt']['hits']
+                            stats['tt_hit_rate'] = result['tt']['hit_rate']
+                        if on_shard:
+                            on_shard(result)
+                        submit_next()
+
+        tt_summary = shared_tt.summary() if shared_tt is not None else None
+    finally:
+        if shared_tt is not None:
+            shared_tt.unlink()
+
+    elapsed = time.perf_counter() - start
+    for stats in per_worker.values():
+        stats['games_per_sec'] = stats['games'] / stats['time'] if stats['time'] > 0 else 0.0
+
+    return {
+        'games': played,
+        'shards': shards,
+        'skipped_shards': shards - len(pending),
+        'seed': seed,
+        'time': elapsed,
+        'games_per_sec': played / elapsed if elapsed > 0 else 0.0,
+        'workers': per_worker,
+        'tt': tt_summary
+    }
+
+
+def iter_shards(out_dir: str) -> Iterator[Dict]:
+    """Yield the game records of every finished shard, in shard order"""
+    names = sorted(name for name in os.listdir(out_dir)
+                   if name.startswith('shard_') and name.endswith('.jsonl'))
+    for name in names:
+        yield from analytics_export.iter_history(os.path.join(out_dir, name))
@@ -0,0 +1,345 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+State-space enumeration
+
+Measures the real game graph against what the search visits:
+- walks every reachable position layer by layer (one layer = one ply),
+  deduplicated by position and by symmetry class
+- per ply: positions, symmetry classes, terminal outcomes, game-tree nodes
+  (move sequences) and branching factors
+- the minimal alpha-beta tree that proves the engine's score, next to the
+  nodes minimax actually visits with and without pruning (and with the
+  transposition table and symmetry reduction)
+
+Positions are packed into one int64 (X bits, then O bits) and each layer is
+expanded and deduplicated with NumPy, so only two layers are ever held in
+memory: 3x3 takes well under a second and 4x4 streams its ~10M positions
+in seconds. The engine's check_game_over() is replayed on a sample of the
+enumerated positions to confirm the terminal classification.
+
+Usage:
+    python cli/state_space.py                     # 3x3 from the empty board
+    python cli/state_space.py --size 4            # full 4x4 enumeration
+    python cli/state_space.py --size 4 --moves 5,6,9,10,0,15,3
+
+Author: Your Name
+"""
+
+import sys
+import time
+import argparse
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tic_tac_toe_matrix_cli import Colors, MatrixEffect, TicTacToeAI
+from zobrist import symmetry_permutations
+
+# The minimal tree and the minimax comparison need the full subtree
+MAX_COMPARE_EMPTY = 10
+
+
+def has_line(masks: np.ndarray, line_masks: Sequence[int]) -> np.ndarray:
+    """Which bitmasks contain a complete win pattern"""
+    found = np.zeros(masks.shape, dtype=bool)
+    for line in line_masks:
+        found |= (masks & line) == line
+    return found
+
+
+def permute_tables(perm: Sequence[int], cells: int) -> List[np.ndarray]:
+    """Lookup tables mapping each byte of a bitmask to its permuted bits"""
+    tables = []
+    for low in range(0, cells, 8):
+        table = np.zeros(256, dtype=np.int64)
+        for byte in range(256):
+            for bit in range(8):
+                if byte >> bit & 1 and low + bit < cells:
+                    table[byte] |= 1 << perm[low + bit]
+        tables.append(table)
+    return tables
+
+
+def permute(masks: np.ndarray, tables: List[np.ndarray]) -> np.ndarray:
+    """Apply a cell permutation (as permute_tables) to an array of bitmasks"""
+    result = np.zeros_like(masks)
+    for chunk, table in enumerate(tables):
+        result |= table[(masks >> (8 * chunk)) & 255]
+    return result
+
+
+def canonical(packed: np.ndarray, cells: int, symmetries: List[List[np.ndarray]]) -> np.ndarray:
+    """Smallest packed position over all symmetries of each position"""
+    full = (1 << cells) - 1
+    x, o = packed & full, packed >> cells
+    smallest = packed
+    for tables in symmetries[1:]:
+        smallest = np.minimum(smallest, permute(x, tables) | (permute(o, tables) << cells))
+    return smallest
+
+
+def count(value: int) -> str:
+    """Thousands-separated count, scientific once it outgrows a table column"""
+    return f"{value:,}" if value < 10 ** 10 else f"{value:.4e}"
+
+
+def print_row(label: str, *values: str):
+    """One table row in Matrix colours"""
+    cells = ''.join(f"{value:>13}" for value in values)
+    print(f"    {Colors.NEON_CYAN}{label:<10}{Colors.NEON_GREEN}{cells}{Colors.RESET}")
+
+
+def enumerate_layers(ai: TicTacToeAI, moves: Sequence[int] = ()):
+    """
+    Yield per-ply statistics of every position reachable from a start position
+
+    Each yielded dict has 'ply', 'positions', 'classes', 'x_wins', 'o_wins',
+    'draws' (terminal positions), 'nodes' and 'games' (move sequences
+    reaching the ply / ending on it), 'terminal' and 'open' sample arrays,
+    and 'graph_branching' (distinct children per open position).
+    """
+    cells = ai.cells
+    if 2 * cells > 62:
+        raise ValueError("Enumeration packs a position into 64 bits: boards up to 5x5")
+    full = (1 << cells) - 1
+    line_masks = [sum(1 << c for c in pattern) for pattern in ai.win_patterns]
+    symmetries = [permute_tables(perm, cells) for perm in symmetry_permutations(ai.size)]
+
+    x0 = sum(1 << m for i, m in enumerate(moves) if i % 2 == 0)
+    o0 = sum(1 << m for i, m in enumerate(moves) if i % 2 == 1)
+    layer = np.array([x0 | (o0 << cells)], dtype=np.int64)
+    counts = np.ones(1, dtype=np.int64)
+
+    for ply in range(len(moves), cells + 1):
+        x, o = layer & full, layer >> cells
+        x_won = has_line(x, line_masks)
+        o_won = has_line(o, line_masks)
+        filled = (x | o) == full
+        terminal = x_won | o_won | filled
+        stats = {
+            'ply': ply,
+            'positions': len(layer),
+            'classes': len(np.unique(canonical(layer, cells, symmetries))),
+            'x_wins': int(x_won.sum()),
+            'o_wins': int(o_won.sum()),
+            'draws': int((filled & ~x_won & ~o_won).sum()),
+            'nodes': int(counts.sum()),
+            'games': int(counts[terminal].sum()),
+            'x_games': int(counts[x_won].sum()),
+            'o_games': int(counts[o_won].sum()),
+            'terminal': layer[terminal],
+            'open': layer[~terminal]
+        }
+
+        # Expand the open positions by every empty cell of the side to move
+        layer, counts = layer[~terminal], counts[~terminal]
+        shift = 0 if ply % 2 == 0 else cells
+        children, child_counts = [], []
+        for cell in range(cells):
+            free = (((layer | (layer >> cells)) >> cell) & 1) == 0
+            children.append(layer[free] | np.int64(1 << (cell + shift)))
+            child_counts.append(counts[free])
+        children = np.concatenate(children) if children else layer
+        child_counts = np.concatenate(child_counts) if child_counts else counts
+
+        layer, inverse = np.unique(children, return_inverse=True)
+        counts = np.zeros(len(layer), dtype=np.int64)
+        np.add.at(counts, inverse.reshape(-1), child_counts)
+        stats['graph_branching'] = len(layer) / len(stats['open']) if len(stats['open']) else 0.0
+        yield stats
+        if not len(layer):
+            break
+
+
+def check_with_engine(ai: TicTacToeAI, packed: Sequence[int], expect_terminal: bool) -> int:
+    """Replay positions with make_move and count disagreements of check_game_over"""
+    cells = ai.cells
+    mismatches = 0
+    for position in packed:
+        x_cells = [c for c in range(cells) if position >> c & 1]
+        o_cells = [c for c in range(cells) if position >> (c + cells) & 1]
+        plies = len(x_cells) + len(o_cells)
+        for i in range(plies):
+            if i % 2 == 0:
+                ai.make_move(x_cells[i // 2], 'X')
+            else:
+                ai.make_move(o_cells[i // 2], 'O')
+        if (ai.check_game_over() is not None) != expect_terminal:
+            mismatches += 1
+        for _ in range(plies):
+            ai.undo_move()
+    return mismatches
+
+
+def solve_tree(ai: TicTacToeAI, moves: Sequence[int]) -> Tuple[int, int, Dict]:
+    """
+    Value of the start position and the size of its minimal alpha-beta tree
+
+    Values are negamax utilities on the engine's scale (faster wins and
+    slower losses are better): 1000 - n = win in n plies, -1000 + n = loss
+    in n plies, 0 = draw. The minimal tree proves the exact root value: the
+    best child exactly, every other child only as "not better" (one
+    refutation at cut nodes, all children at all-nodes).
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    cells = ai.cells
+    full = (1 << cells) - 1
+    line_masks = [sum(1 << c for c in pattern) for pattern in ai.win_patterns]
+    values = {}
+    memo = {}
+
+    def sign(u: int) -> int:
+        return (u > 0) - (u < 0)
+
+    def children(own: int, other: int) -> List[Tuple[int, int]]:
+        """Positions after each move, as (side to move, opponent) bitmasks"""
+        free = full & ~(own | other)
+        return [(other, own | 1 << c) for c in range(cells) if free >> c & 1]
+
+    def value(own: int, other: int) -> int:
+        key = (own, other)
+        if key not in values:
+            if any(other & m == m for m in line_masks):
+                values[key] = -1000
+            elif own | other == full:
+                values[key] = 0
+            else:
+                best = -1000
+                for child in children(own, other):
+                    u = value(*child)
+                    best = max(best, -u + sign(u))
+                values[key] = best
+        return values[key]
+
+    def terminal(own: int, other: int) -> bool:
+        return any(other & m == m for m in line_masks) or own | other == full
+
+    # neg(u) = -u + sign(u) maps a child's utility to the parent's, and
+    # neg(u_child) >= v  <=>  u_child <= bound(v), likewise for <= / >=
+    def bound(v: int) -> int:
+        return -v - sign(v)
+
+    def prove_ge(own: int, other: int, v: int) -> int:
+        key = ('ge', own, other, v)
+        if key not in memo:
+            if terminal(own, other):
+                memo[key] = 1
+            else:
+                memo[key] = 1 + min(prove_le(*child, bound(v)) for child in children(own, other)
+                                    if value(*child) <= bound(v))
+        return memo[key]
+
+    def prove_le(own: int, other: int, v: int) -> int:
+        key = ('le', own, other, v)
+        if key not in memo:
+            if terminal(own, other):
+                memo[key] = 1
+            else:
+                memo[key] = 1 + sum(prove_ge(*child, bound(v)) for child in children(own, other))
+        return memo[key]
+
+    def exact(own: int, other: int) -> int:
+        if terminal(own, other):
+            return 1
+        v = value(own, other)
+        kids = children(own, other)
+        rest = {child: prove_ge(*child, bound(v)) for child in kids}
+        total = sum(rest.values())
+        return 1 + min(exact(*child) + total - rest[child] for child in kids if value(*child) == bound(v))
+
+    x = sum(1 << m for i, m in enumerate(moves) if i % 2 == 0)
+    o = sum(1 << m for i, m in enumerate(moves) if i % 2 == 1)
+    own, other = (x, o) if len(moves) % 2 == 0 else (o, x)
+    root_value = value(own, other)
+    return root_value, exact(own, other), {'positions_solved': len(values)}
+
+
+def count_minimax(ai: TicTacToeAI, moves: Sequence[int], pruning: bool, table: bool,
+                  symmetry: bool) -> Tuple[int, float]:
+    """Nodes and milliseconds of one full-depth minimax call from the start position"""
+    ai.reset_game()
+    player = 'X'
+    for move in moves:
+        ai.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+    ai.use_pruning = pruning
+    ai.use_symmetry = symmetry
+    saved_tt = ai.tt
+    if not table:
+        ai.tt = None
+    states = [0]
+    start = time.perf_counter()
+    try:
+        ai.minimax(ai.board.copy(), player, 0, float('-inf'), float('inf'), states)
+    finally:
+        ai.tt = saved_tt
+        ai.use_pruning = True
+        ai.use_symmetry = True
+    return states[0], (time.perf_counter() - start) * 1000
+
+
+def main(argv: Optional[List[str]] = None):
+    """Enumerate the state space and compare it with the search"""
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe state-space statistics")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, default=None)
+    parser.add_argument('--moves', default='', help="comma-separated opening moves (X first) to start from")
+    parser.add_argument('--sample', type=int, default=2000,
+                        help="positions per ply re-checked with the engine's check_game_over (default: 2000)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    moves = [int(m) for m in args.moves.split(',') if m.strip()]
+    ai = TicTacToeAI(size=args.size, win_length=args.win_length)
+    rng = np.random.default_rng(args.seed)
+
+    MatrixEffect.print_status(f"STATE SPACE {ai.size}x{ai.size} (WIN {ai.win_length})"
+                              + (f" FROM {moves}" if moves else ""), Colors.NEON_GREEN)
+    print_row("PLY", "POSITIONS", "CLASSES", "X WINS", "O WINS", "DRAWS", "TREE NODES", "BRANCHING")
+
+    totals = {'positions': 0, 'classes': 0, 'x_wins': 0, 'o_wins': 0, 'draws': 0,
+              'nodes': 0, 'games': 0, 'x_games': 0, 'o_games': 0}
+    mismatches = 0
+    start = time.perf_counter()
+    for stats in enumerate_layers(ai, moves):
+        for name in totals:
+            totals[name] += stats[name]
+        for group, expect_terminal in (('terminal', True), ('open', False)):
+            sample = stats[group]
+            if len(sample) > args.sample:
+                sample = rng.choice(sample, args.sample, replace=False)
+            mismatches += check_with_engine(ai, sample.tolist(), expect_terminal)
+        print_row(str(stats['ply']), f"{stats['positions']:,}", f"{stats['classes']:,}",
+                  f"{stats['x_wins']:,}", f"{stats['o_wins']:,}", f"{stats['draws']:,}",
+                  count(stats['nodes']), f"{stats['graph_branching']:.2f}")
+    elapsed = time.perf_counter() - start
+
+    print_row("TOTAL", f"{totals['positions']:,}", f"{totals['classes']:,}", f"{totals['x_wins']:,}",
+              f"{totals['o_wins']:,}", f"{totals['draws']:,}", count(totals['nodes']))
+    draw_games = totals['games'] - totals['x_games'] - totals['o_games']
+    MatrixEffect.print_terminal_prompt(
+        f"GAMES {totals['games']:,} • X {totals['x_games']:,} • O {totals['o_games']:,} • "
+        f"DRAW {draw_games:,} • {elapsed:.2f}s • ENGINE MISMATCHES {mismatches}"
+    )
+
+    empty = ai.cells - len(moves)
+    if empty > MAX_COMPARE_EMPTY:
+        MatrixEffect.print_status(f"SEARCH COMPARISON SKIPPED: {empty} EMPTY CELLS "
+                                  f"(full-depth minimax needs <= {MAX_COMPARE_EMPTY}; use --moves)")
+        return
+
+    MatrixEffect.print_status("SEARCH TREE VERSUS MINIMAL ALPHA-BETA TREE", Colors.NEON_GREEN)
+    root_value, minimal, info = solve_tree(ai, moves)
+    print_row("", "NODES", "TIME", "VS MINIMAL")
+    print_row("MINIMAL", f"{minimal:,}", "", "1.00x")
+    for label, pruning, table, symmetry in (("AB+TT+SYM", True, True, True), ("AB+TT", True, True, False),
+                                            ("AB", True, False, False), ("MINIMAX", False, False, False)):
+        nodes, ms = count_minimax(ai, moves, pruning, table, symmetry)
+        print_row(label, f"{nodes:,}", f"{ms:.1f}ms", f"{nodes / minimal:.2f}x")
+    outcome = 'WIN' if root_value > 0 else 'LOSS' if root_value < 0 else 'DRAW'
+    MatrixEffect.print_terminal_prompt(f"VALUE FOR SIDE TO MOVE: {outcome} • "
+                                       f"{info['positions_solved']:,} POSITIONS SOLVED")
+
+
+if __name__ == "__main__":
+    main()
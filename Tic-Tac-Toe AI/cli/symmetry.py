@@ -0,0 +1,89 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Board symmetry tables
+
+Precomputed permutation tables for the 8 rotations and reflections of an
+N x N board (win patterns of any length are invariant under all of them):
+- stabilizer: the symmetries that leave a position unchanged
+- move orbits: moves that lead to symmetric positions; only one per orbit
+  has to be searched (the empty 3x3 board has 3: centre, corner, edge)
+- canonical form: one representative board for all symmetric positions,
+  with the transform needed to map a move back to the real board
+
+Author: Your Name
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from zobrist import symmetry_permutations
+
+
+class SymmetryTables:
+    """Dihedral transforms of one board size as cell permutation tables"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+
+        # perms[s][cell]: where symmetry s sends cell; inverse[s] undoes it
+        self.perms = symmetry_permutations(size)
+        self.inverse = []
+        for perm in self.perms:
+            inverse = [0] * self.cells
+            for cell, target in enumerate(perm):
+                inverse[target] = cell
+            self.inverse.append(inverse)
+
+        # Cells each symmetry moves: a board is unchanged by s if every such
+        # cell holds the same mark as its image
+        self.moved = [[(cell, target) for cell, target in enumerate(perm) if cell != target]
+                      for perm in self.perms]
+
+    def stabilizer(self, board: Sequence[str]) -> List[int]:
+        """Symmetries other than the identity that leave board unchanged"""
+        return [s for s in range(1, len(self.perms))
+                if all(board[cell] == board[target] for cell, target in self.moved[s])]
+
+    def move_orbits(self, board: Sequence[str], moves: Sequence[int]) -> Dict[int, List[int]]:
+        """
+        Group moves that lead to symmetric positions
+
+        Returns:
+            {representative: [equivalent moves]} in the order of moves; the
+            representative is the first move of its group
+        """
+        group = self.stabilizer(board)
+        orbits = {}
+        owner = {}
+        for move in moves:
+            if move in owner:
+                orbits[owner[move]].append(move)
+                continue
+            orbits[move] = [move]
+            for s in group:
+                owner.setdefault(self.perms[s][move], move)
+        return orbits
+
+    def unique_moves(self, board: Sequence[str], moves: List[int]) -> List[int]:
+        """One move per group of symmetric moves, in the order of moves"""
+        if not any(all(board[cell] == board[target] for cell, target in self.moved[s])
+                   for s in range(1, len(self.perms))):
+            return moves
+        return list(self.move_orbits(board, moves))
+
+    def canonical(self, board: Sequence[str]) -> Tuple[List[str], int]:
+        """Smallest transformed board and the symmetry s that produces it"""
+        best, best_s = None, 0
+        for s, inverse in enumerate(self.inverse):
+            transformed = [board[cell] for cell in inverse]
+            if best is None or transformed < best:
+                best, best_s = transformed, s
+        return best, best_s
+
+    def to_canonical(self, move: int, s: int) -> int:
+        """Cell of the canonical board corresponding to move on the real board"""
+        return self.perms[s][move]
+
+    def from_canonical(self, move: int, s: int) -> int:
+        """Cell of the real board corresponding to move on the canonical board"""
+        return self.inverse[s][move]
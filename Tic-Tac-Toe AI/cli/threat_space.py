@@ -0,0 +1,263 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Threat-space search
+
+Forced wins on k-in-a-row boards found by searching only forcing moves,
+run before the full-width search:
+- a four is a move leaving a win pattern with k-1 own marks and no
+  opponent mark: the opponent must take its last cell (or win at once)
+- VCF (victory by continuous fours): the attacker plays fours only and every
+  reply is forced, so the tree is a single line per attacker choice; two
+  fours at once win. Exact.
+- VCT (victory by continuous threats): the attacker may also play threes,
+  moves after which it would have a VCF if the defender passed. The
+  defender's replies are limited to the cells of that VCF plus every cell
+  that gives the defender a four along it; any other reply leaves the VCF
+  intact, so a VCT found this way is a proven win too.
+- forced defence: if the opponent has a VCF when we pass, only moves in
+  the same reply set can stop it; the main search is restricted to them
+
+Threat patterns and line counts come from the same win_lines.WinLines as
+the search, so every board size and win length works. Searches stop after node_limit nodes.
+
+Author: Your Name
+"""
+
+from math import isqrt
+from typing import Dict, List, Optional, Sequence, Set
+
+from win_lines import WinLines
+from zobrist import ZobristKeys
+
+OTHER = {'X': 'O', 'O': 'X'}
+
+
+class ThreatLimitReached(Exception):
+    """Raised when a threat search exceeds its node limit"""
+
+
+class ThreatSpaceSearch:
+    """VCF/VCT prover over generalised win patterns"""
+
+    def __init__(self, win_patterns: List[List[int]], cells: int, threat_depth: int = 2,
+                 node_limit: int = 200000):
+        """
+        Args:
+            win_patterns: Cell lists of every winning line
+            cells: Number of cells on the board
+            threat_depth: Threes allowed in a VCT line (0: VCF only)
+            node_limit: Nodes per search before giving up
+        """
+        self.win_patterns = win_patterns
+        self.win_length = len(win_patterns[0])
+        self.cells = cells
+        self.lines = WinLines(win_patterns, cells)
+        self.zobrist = ZobristKeys(isqrt(cells))
+        self.threat_depth = threat_depth
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.vcf_failed = set()
+        self.vct_results = {}
+        self.stats = {'searches': 0, 'wins': 0, 'defences': 0, 'nodes': 0, 'aborted': 0}
+
+    # ----- board state -----
+
+    def win_cells(self, board: Sequence[str], counts: Dict[str, List[int]], player: str) -> Set[int]:
+        """Empty cells that complete a line of player"""
+        own, other = counts[player], counts[OTHER[player]]
+        cells = set()
+        for line, pattern in enumerate(self.win_patterns):
+            if own[line] == self.win_length - 1 and other[line] == 0:
+                cells.update(cell for cell in pattern if board[cell] == '')
+        return cells
+
+    def threat_moves(self, board: Sequence[str], counts: Dict[str, List[int]], player: str,
+                     marks: int) -> List[int]:
+        """
+        Empty cells that leave an open line (no opponent mark) with at least
+        `marks` marks of player, most such lines first
+        """
+        own, other = counts[player], counts[OTHER[player]]
+        weight = {}
+        for line, pattern in enumerate(self.win_patterns):
+            if other[line] == 0 and own[line] >= marks - 1:
+                for cell in pattern:
+                    if board[cell] == '':
+                        weight[cell] = weight.get(cell, 0) + 1 + own[line]
+        return sorted(weight, key=lambda cell: (-weight[cell], cell))
+
+    # ----- provers -----
+
+    def vcf(self, board: List[str], counts: Dict[str, List[int]], attacker: str, key: int) -> Optional[List[int]]:
+        """
+        Winning line of fours for attacker (to move), or None
+
+        The line alternates attacker and defender moves and ends with the
+        winning move.
+        """
+        self.nodes += 1
+        if self.nodes > self.node_limit:
+            raise ThreatLimitReached()
+
+        wins = self.win_cells(board, counts, attacker)
+        if wins:
+            return [min(wins)]
+        if key in self.vcf_failed:
+            return None
+
+        defender = OTHER[attacker]
+        values = self.zobrist.values
+        forced = self.win_cells(board, counts, defender)
+        if len(forced) > 1:
+            candidates = []
+        elif forced:
+            candidates = list(forced)   # must block; only useful if the block is a four too
+        else:
+            candidates = self.threat_moves(board, counts, attacker, self.win_length - 1)
+
+        for move in candidates:
+            self.lines.place(board, counts, move, attacker)
+            replies = self.win_cells(board, counts, attacker)
+            line = None
+            if len(replies) > 1:
+                block, win = sorted(replies)[:2]
+                line = [move, block, win]
+            elif replies:
+                reply = replies.pop()
+                if not self.lines.place(board, counts, reply, defender):
+                    rest = self.vcf(board, counts, attacker, key ^ values[attacker][move] ^ values[defender][reply])
+                    if rest is not None:
+                        line = [move, reply] + rest
+                self.lines.unplace(board, counts, reply, defender)
+            self.lines.unplace(board, counts, move, attacker)
+            if line is not None:
+                return line
+
+        self.vcf_failed.add(key)
+        return None
+
+    def defences(self, board: Sequence[str], counts: Dict[str, List[int]], attacker: str,
+                 line: List[int]) -> List[int]:
+        """
+        Every defender move that might stop the winning line of fours `line`
+
+        The cells of the line, plus any cell giving the defender a four on an
+        open line once the line's forced replies are added. Other moves leave
+        the line playable as it is.
+        """
+        defender = OTHER[attacker]
+        replies = set(line[1::2])
+        own, other = counts[defender], counts[attacker]
+        moves = set(line)
+        for cell in range(self.cells):
+            if board[cell] != '' or cell in moves:
+                continue
+            for line_index in self.lines.cell_lines[cell]:
+                if other[line_index] == 0:
+                    pattern = self.win_patterns[line_index]
+                    marks = own[line_index] + 1 + sum(1 for c in pattern if c in replies)
+                    if marks >= self.win_length - 1:
+                        moves.add(cell)
+                        break
+        return sorted(moves)
+
+    def vct(self, board: List[str], counts: Dict[str, List[int]], attacker: str, key: int,
+            depth: int) -> Optional[List[int]]:
+        """
+        Winning line for attacker (to move) with up to `depth` threes, or None
+
+        For a three the returned line follows the defence that holds out longest.
+        """
+        line = self.vcf(board, counts, attacker, key)
+        if line is not None or depth == 0:
+            return line
+        if (key, depth) in self.vct_results:
+            return self.vct_results[(key, depth)]
+
+        defender = OTHER[attacker]
+        values = self.zobrist.values
+        result = None
+        if not self.win_cells(board, counts, defender):
+            for move in self.threat_moves(board, counts, attacker, self.win_length - 2):
+                self.lines.place(board, counts, move, attacker)
+                move_key = key ^ values[attacker][move]
+                threat = self.vcf(board, counts, attacker, move_key)     # as if the defender passed
+                longest = None
+                if threat is not None:
+                    for reply in self.defences(board, counts, attacker, threat):
+                        rest = None
+                        if not self.lines.place(board, counts, reply, defender):
+                            rest = self.vct(board, counts, attacker, move_key ^ values[defender][reply], depth - 1)
+                        self.lines.unplace(board, counts, reply, defender)
+                        if rest is None:
+                            longest = None
+                            break
+                        if longest is None or len(rest) >= len(longest):
+                            longest = [reply] + rest
+                self.lines.unplace(board, counts, move, attacker)
+                if longest is not None:
+                    result = [move] + longest
+                    break
+
+        self.vct_results[(key, depth)] = result
+        return result
+
+    # ----- entry points -----
+
+    def start(self):
+        """Reset the per-search node count and tables"""
+        self.nodes = 0
+        self.vcf_failed = set()
+        self.vct_results = {}
+        self.stats['searches'] += 1
+
+    def find_win(self, board: Sequence[str], player: str) -> Optional[Dict]:
+        """
+        Forced win for player (to move) by continuous threats
+
+        Returns:
+            {'line', 'plies', 'nodes'}, or None if none was found within the
+            threat depth and node limit
+        """
+        self.start()
+        board = list(board)
+        counts = self.lines.count_lines(board)
+        try:
+            line = self.vct(board, counts, player, self.zobrist.key(board), self.threat_depth)
+        except ThreatLimitReached:
+            line = None
+            self.stats['aborted'] += 1
+        self.stats['nodes'] += self.nodes
+        if line is None:
+            return None
+        self.stats['wins'] += 1
+        return {'line': line, 'plies': len(line), 'nodes': self.nodes}
+
+    def find_defence(self, board: Sequence[str], player: str) -> Optional[Dict]:
+        """
+        Moves of player (to move) that can stop an opponent line of fours
+
+        Returns:
+            {'line' (the opponent's fours if we passed), 'moves', 'nodes'}, or
+            None when the opponent has no such line
+        """
+        self.start()
+        board = list(board)
+        counts = self.lines.count_lines(board)
+        try:
+            line = self.vcf(board, counts, OTHER[player], self.zobrist.key(board))
+        except ThreatLimitReached:
+            line = None
+            self.stats['aborted'] += 1
+        self.stats['nodes'] += self.nodes
+        if line is None:
+            return None
+        self.stats['defences'] += 1
+        return {'line': line, 'moves': self.defences(board, counts, OTHER[player], line), 'nodes': self.nodes}
+
+    def summary(self) -> Dict:
+        """Search counts and average nodes for the stats displays"""
+        return {
+            'nodes_per_search': self.stats['nodes'] / self.stats['searches'] if self.stats['searches'] else 0.0,
+            **self.stats
+        }
@@ -15,11 +15,53 @@ Author: Your Name
 
 import os
 import sys
+import math
 import time
 import json
 import random
+import argparse
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional, Iterator
+
+import analytics_export
+import game_records
+import neural_net
+import self_play
+from mcts import MCTSEngine
+from endgame import EndgameTable
+from experience import ExperienceCache, position_key
+from ponder import Ponderer, SearchInterrupted
+from progress import SearchProgress
+from proof_number import METHODS as SOLVER_METHODS, ProofNumberSearch
+from search_cache import EXACT, LOWER, UPPER, LRUCache, TranspositionTable, score_from_table, score_to_table
+from symmetry import SymmetryTables
+from threat_space import ThreatSpaceSearch
+from win_lines import WinLines, generate_win_patterns
+from ultimate import UltimateBoard, UltimateEngine
+from zobrist import ZobristKeys
+
+HISTORY_FILE = 'tictactoe_matrix_history.jsonl'
+
+# Difficulty levels as cheaper search modes:
+#   max_depth   - search depth cap (None = full minimax)
+#   noise       - std. deviation of Gaussian noise added to root scores
+#   temperature - softmax temperature for picking among root moves (0 = best)
+DIFFICULTY_LEVELS = {
+    'easy': {'max_depth': 1, 'noise': 1.0, 'temperature': 1.0},
+    'medium': {'max_depth': 2, 'noise': 0.3, 'temperature': 0.25},
+    'hard': {'max_depth': None, 'noise': 0.0, 'temperature': 0.0}
+}
+
+# Search drivers (the hard level's root search):
+#   alphabeta  - one full-window alpha-beta search
+#   pvs        - principal variation search: every move after the first is
+#                tried with a null window and re-searched only if it is better
+#   aspiration - iterative deepening; each iteration searches a window of
+#                +-ASPIRATION_WINDOW around the previous score, widened on failure
+#   mtdf       - iterative deepening; each iteration is MTD(f): null-window
+#                searches through the transposition table from the previous score
+STRATEGIES = ('alphabeta', 'pvs', 'aspiration', 'mtdf')
+ASPIRATION_WINDOW = 0.5
 
 # ANSI color codes for terminal
 class Colors:
@@ -98,6 +140,20 @@ class MatrixEffect:
             time.sleep(0.3)
         sys.stdout.write(f"]{Colors.RESET}\n")
     
+    @staticmethod
+    def print_progress(event: Dict):
+        """Overwrite the status line with a search progress event (the final one clears it)"""
+        if event['final']:
+            sys.stdout.write("\r\033[K")
+        else:
+            fields = {name: '-' if event[name] is None else event[name] for name in ('depth', 'move', 'score')}
+            sys.stdout.write(
+                f"\r{Colors.NEON_YELLOW}[SEARCH] DEPTH {fields['depth']} • BEST {fields['move']} • "
+                f"SCORE {fields['score']} • {event['nodes']:,} NODES • "
+                f"{event['nodes_per_sec']:,.0f} NODES/S{Colors.RESET}\033[K"
+            )
+        sys.stdout.flush()
+    
     @staticmethod
     def print_explosion():
         """Print win explosion effect"""
@@ -120,13 +176,88 @@ class MatrixEffect:
 class TicTacToeAI:
     """Tic-Tac-Toe game with AI using Minimax algorithm"""
     
-    def __init__(self):
-        self.board = [''] * 9
+    def __init__(self, size: int = 3, win_length: Optional[int] = None,
+                 max_depth: Optional[int] = None, difficulty: str = 'hard',
+                 engine: str = 'minimax', cache_mb: float = 16, strategy: str = 'alphabeta'):
+        self.size = size
+        self.win_length = size if win_length is None else win_length
+        if not 1 <= self.win_length <= size:
+            raise ValueError(f"Win length must be between 1 and the board size {size}, got {self.win_length}")
+        self.cells = size * size
+        self.board = [''] * self.cells
         self.current_player = 'X'
         self.game_active = True
         self.use_pruning = True
         self.learning_mode = False
         
+        # LEARNING mode: searched positions and opponent replies persist
+        # across sessions; the file is read on first use
+        self.experience = ExperienceCache(f"tictactoe_experience_{size}x{size}.json")
+        
+        # Search depth cap (None = search to the end); positions at the cap
+        # are scored by evaluate(). Wins always outrank heuristic scores.
+        self.max_depth = max_depth
+        self.win_score = max(10, self.cells + 1)
+        
+        self.difficulty = difficulty
+        self.strategy = strategy
+        self.rng = random.Random()
+        
+        # Memory-capped caches: a transposition table for alpha-beta (cleared
+        # every game) and an LRU of root analyses for the easy/medium levels
+        # (kept across games: entries are keyed by board, player and depth
+        # and stay valid, and the memory cap bounds it; the GUI's stats reset
+        # clears it)
+        self.tt = TranspositionTable(cache_mb * 0.75)
+        self.analysis_cache = LRUCache(cache_mb * 0.25)
+        
+        # Search engine: 'minimax' (alpha-beta) or 'mcts' (UCT, for large boards).
+        # The MCTS budget is mcts_iterations playouts and/or mcts_time_ms.
+        self.engine = engine
+        self.mcts = None
+        self.mcts_iterations = None
+        self.mcts_time_ms = None
+        self.mcts_playout = 'random'
+        
+        # Optional neural_net.NeuralEvaluator: with a depth cap, it scores the
+        # leaves below each frontier node in one batch and orders moves
+        self.evaluator = None
+        
+        # Optional endgame.EndgameTable: positions with few enough empty
+        # cells are scored exactly from the table instead of searched
+        self.endgame = None
+        
+        # Optional threat_space.ThreatSpaceSearch: run before the hard level's
+        # search to play forced wins by continuous threats at once, and to
+        # limit the root moves (root_moves) to those stopping the opponent's
+        self.threat_space = None
+        self.root_moves = None
+        
+        # proof_number.ProofNumberSearch behind the 's' command (built on first
+        # use): decides the current position within solve_nodes nodes per
+        # call; asking again resumes where the previous call stopped
+        self.solver = None
+        self.solver_method = 'dfpn'
+        self.solver_mb = 64
+        self.solve_nodes = 1000000
+        
+        # Optional ponder.Ponderer: answers to the human's likely replies are
+        # searched on a background thread while input() waits. interrupt is
+        # polled every 1024 nodes and stops the search when it returns True.
+        self.ponderer = None
+        self.interrupt = None
+        
+        # Optional progress.SearchProgress, set up by play_game(): depth, best
+        # move so far and nodes/s of the running search, polled with interrupt
+        # and sent at most once per progress_ms to the status line
+        self.progress = None
+        self.progress_ms = 100
+        
+        # Per-game history (moves and AI decisions), kept for analytics export
+        self.move_history = []
+        self.decision_log = []
+        self.game_start_time = time.time()
+        
         # Statistics
         self.stats = {
             'games': 0,
@@ -135,15 +266,27 @@ class TicTacToeAI:
             'draws': 0,
             'total_states': 0,
             'total_time': 0,
-            'decisions': 0
+            'decisions': 0,
+            'levels': {}
         }
         
-        # Win patterns
-        self.win_patterns = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-            [0, 4, 8], [2, 4, 6]              # Diagonals
-        ]
+        # Win patterns with per-line mark counts (shared with the threat and
+        # proof-number searches); line_counts is kept in step with self.board
+        self.win_patterns = generate_win_patterns(self.size, self.win_length)
+        self.lines = WinLines(self.win_patterns, self.cells)
+        self.line_counts = self.lines.count_lines(self.board)
+        
+        # Zobrist key of self.board, updated with one XOR per move
+        self.zobrist = ZobristKeys(self.size)
+        self.key = 0
+        
+        # Rotations and reflections: moves leading to symmetric positions are
+        # searched once, at the root and down to symmetry_depth plies
+        # (symmetric positions are rare deeper, the check costs more than it saves)
+        self.symmetry = SymmetryTables(self.size)
+        self.use_symmetry = True
+        self.symmetry_depth = 3
+        self.symmetric_moves = 0
         
         self.load_stats()
     
@@ -153,25 +296,26 @@ class TicTacToeAI:
         print(f"{Colors.NEON_GREEN}{Colors.BOLD}[GAME INTERFACE]{Colors.RESET}\n")
         
         # Board display with colored pieces
-        for i in range(0, 9, 3):
+        width = len(str(self.cells - 1)) + 2
+        for i in range(0, self.cells, self.size):
             row = []
-            for j in range(3):
+            for j in range(self.size):
                 idx = i + j
                 cell = self.board[idx]
                 if cell == 'X':
-                    row.append(f"{Colors.NEON_CYAN}{Colors.BOLD} X {Colors.RESET}")
+                    row.append(f"{Colors.NEON_CYAN}{Colors.BOLD}{'X':^{width}}{Colors.RESET}")
                 elif cell == 'O':
-                    row.append(f"{Colors.NEON_PINK}{Colors.BOLD} O {Colors.RESET}")
+                    row.append(f"{Colors.NEON_PINK}{Colors.BOLD}{'O':^{width}}{Colors.RESET}")
                 else:
-                    row.append(f"{Colors.DARK_GRAY} {idx} {Colors.RESET}")
+                    row.append(f"{Colors.DARK_GRAY}{idx:^{width}}{Colors.RESET}")
             
             # Print row with borders
             print(f"     {Colors.NEON_GREEN}║{Colors.RESET}", end="")
-            print(f"{Colors.RESET} │ {Colors.RESET}".join(row), end="")
-            print(f" {Colors.NEON_GREEN}║{Colors.RESET}")
+            print(f"{Colors.RESET}│{Colors.RESET}".join(row), end="")
+            print(f"{Colors.NEON_GREEN}║{Colors.RESET}")
             
-            if i < 6:
-                print(f"     {Colors.NEON_GREEN}║───┼───┼───║{Colors.RESET}")
+            if i < self.cells - self.size:
+                print(f"     {Colors.NEON_GREEN}║{'┼'.join(['─' * width] * self.size)}║{Colors.RESET}")
         
         print(f"{Colors.NEON_CYAN}{'─' * 60}{Colors.RESET}\n")
     
@@ -190,6 +334,22 @@ class TicTacToeAI:
         """Get list of available moves"""
         return [i for i, cell in enumerate(board_state) if cell == '']
     
+    def evaluate(self, line_counts: Dict[str, List[int]]) -> float:
+        """
+        Heuristic score of a non-terminal position from O's point of view
+        
+        Every line still open for only one player is worth 3^marks to that
+        player. The total is squashed into (-1, 1) so that any forced win
+        (at least win_score - cells >= 1) still outranks it.
+        """
+        raw = 0
+        for x_count, o_count in zip(line_counts['X'], line_counts['O']):
+            if x_count == 0 and o_count:
+                raw += 3 ** o_count
+            elif o_count == 0 and x_count:
+                raw -= 3 ** x_count
+        return raw / (abs(raw) + 1.0)
+    
     def minimax(self, board_state: List[str], player: str, depth: int, 
                 alpha: float, beta: float, states_evaluated: List[int]) -> Dict:
         """
@@ -206,90 +366,518 @@ class TicTacToeAI:
         Returns:
             Dictionary with 'score' and optionally 'index'
         """
+        board = board_state.copy()
+        line_counts = self.lines.count_lines(board)
+        empty = board.count('')
+        winner = self.lines.winner_from_counts(line_counts)
+        key = self.zobrist.key(board)
+        
+        def search(lower: float, upper: float) -> Dict:
+            return self.alpha_beta(board, line_counts, player, depth, lower, upper, states_evaluated,
+                                   winner, empty, key)
+        
+        if self.strategy in ('aspiration', 'mtdf') and self.use_pruning and winner is None and empty > 0:
+            return self.iterative_deepening(search, player, empty)
+        return search(alpha, beta)
+    
+    def iterative_deepening(self, search: Callable[[float, float], Dict], player: str, empty: int) -> Dict:
+        """
+        Search one ply deeper per iteration up to the depth cap
+        
+        Each iteration starts from the previous iteration's score: as the
+        centre of an aspiration window, or as the first guess of MTD(f). The
+        transposition table carries bounds and best moves between iterations.
+        """
+        saved_depth = self.max_depth
+        final = empty if saved_depth is None else min(saved_depth, empty)
+        guess = None
+        try:
+            for iteration in range(1, final + 1):
+                self.max_depth = saved_depth if iteration == final else iteration
+                if self.progress is not None:
+                    self.progress.update(depth=iteration)
+                if self.strategy == 'mtdf':
+                    result = self.mtdf(search, player, 0.0 if guess is None else guess)
+                else:
+                    result = self.aspiration(search, guess)
+                guess = result['score']
+        finally:
+            self.max_depth = saved_depth
+        return result
+    
+    def aspiration(self, search: Callable[[float, float], Dict], guess: Optional[float]) -> Dict:
+        """Search a window around guess, opening the failing side until the score falls inside"""
+        if guess is None:
+            return search(float('-inf'), float('inf'))
+        lower, upper = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        while True:
+            result = search(lower, upper)
+            if result['score'] <= lower:
+                lower = float('-inf')
+            elif result['score'] >= upper:
+                upper = float('inf')
+            else:
+                return result
+    
+    def mtdf(self, search: Callable[[float, float], Dict], player: str, guess: float) -> Dict:
+        """
+        MTD(f): null-window searches that close in on the score from guess
+        
+        Every search proves the score is at least or below its bound, so the
+        bounds meet at the exact score. The root move is taken from the last
+        search that proved it (a fail-high for O, a fail-low for X).
+        """
+        lower, upper = float('-inf'), float('inf')
+        score = guess
+        best = None
+        while lower < upper:
+            beta = score if score > lower else math.nextafter(lower, math.inf)
+            result = search(math.nextafter(beta, -math.inf), beta)
+            score = result['score']
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+            if (score >= beta) == (player == 'O'):
+                best = result
+        return dict(best, score=score)
+    
+    def alpha_beta(self, board: List[str], line_counts: Dict[str, List[int]], player: str,
+                   depth: int, alpha: float, beta: float, states_evaluated: List[int],
+                   winner: Optional[str], empty: int, key: int) -> Dict:
+        """
+        Alpha-beta search on a board updated in place with place()/unplace()
+        
+        Terminal detection only looks at the lines through the last move
+        (reported by place() as winner) instead of rescanning every pattern.
+        key is the board's Zobrist key, passed down with one XOR per move.
+        """
         states_evaluated[0] += 1
+        if not states_evaluated[0] & 0x3FF:
+            if self.interrupt is not None and self.interrupt():
+                raise SearchInterrupted()
+            if self.progress is not None:
+                self.progress.tick(states_evaluated[0])
         
         # Terminal state checks
-        if self.check_winner(board_state, 'X'):
-            return {'score': -10 + depth}
-        if self.check_winner(board_state, 'O'):
-            return {'score': 10 - depth}
-        if self.is_board_full(board_state):
+        if winner == 'X':
+            return {'score': -self.win_score + depth}
+        if winner == 'O':
+            return {'score': self.win_score - depth}
+        if empty == 0:
             return {'score': 0}
+        if self.endgame is not None and depth > 0 and empty <= self.endgame.max_empty:
+            return {'score': self.endgame_score(board, player, depth)}
+        if self.max_depth is not None and depth >= self.max_depth:
+            return {'score': self.evaluate(line_counts)}
+        if self.evaluator is not None and self.max_depth is not None and depth == self.max_depth - 1:
+            return self.evaluate_frontier(board, line_counts, player, depth, states_evaluated, empty)
+        
+        # Transposition table lookup (stored scores are alpha-beta bounds,
+        # so the table is only used with pruning on; never at the root)
+        tt = self.tt if self.use_pruning and depth > 0 else None
+        draft = empty if self.max_depth is None else min(empty, self.max_depth - depth)
+        window = (alpha, beta)
+        tt_move = -1
+        if tt is not None:
+            entry = tt.probe(key)
+            if entry is not None:
+                stored_draft, stored, flag, tt_move = entry
+                if stored_draft >= draft:
+                    score = score_from_table(stored, depth)
+                    if (flag == EXACT or (flag == LOWER and score >= beta)
+                            or (flag == UPPER and score <= alpha)):
+                        return {'score': score}
         
-        available_moves = self.get_available_moves(board_state)
+        available_moves = self.get_available_moves(board)
+        if depth == 0 and self.root_moves is not None:
+            available_moves = [move for move in available_moves if move in self.root_moves]
+        if self.evaluator is not None and self.max_depth is not None and self.max_depth - depth >= 3:
+            available_moves = neural_net.policy_order(self.evaluator, board, player, available_moves)
+        if tt_move >= 0 and board[tt_move] == '':
+            available_moves.remove(tt_move)
+            available_moves.insert(0, tt_move)
+        
+        # Symmetric moves have equal scores; the neural evaluator is not
+        # symmetric, so they are only skipped without it
+        if self.use_symmetry and depth < self.symmetry_depth and self.evaluator is None:
+            unique = self.symmetry.unique_moves(board, available_moves)
+            self.symmetric_moves += len(available_moves) - len(unique)
+            available_moves = unique
+        
+        values = self.zobrist.values[player]
+        
+        # PVS: after the first move, prove each move is no better with a null
+        # window, and search the full window only when the proof fails
+        scout = self.strategy == 'pvs' and self.use_pruning
         
         if player == 'O':  # Maximizing player (AI)
             best = {'score': float('-inf')}
             
             for move in available_moves:
-                new_board = board_state.copy()
-                new_board[move] = player
-                
-                result = self.minimax(new_board, 'X', depth + 1, alpha, beta, states_evaluated)
+                won = self.lines.place(board, line_counts, move, player)
+                window_beta = math.nextafter(alpha, math.inf) if scout and best['score'] > float('-inf') else beta
+                result = self.alpha_beta(board, line_counts, 'X', depth + 1, alpha, window_beta, states_evaluated,
+                                         player if won else None, empty - 1, key ^ values[move])
+                if alpha < result['score'] < beta and window_beta < beta:
+                    result = self.alpha_beta(board, line_counts, 'X', depth + 1, alpha, beta, states_evaluated,
+                                             player if won else None, empty - 1, key ^ values[move])
+                self.lines.unplace(board, line_counts, move, player)
                 
                 if result['score'] > best['score']:
                     best = {'score': result['score'], 'index': move}
+                    if depth == 0 and self.progress is not None:
+                        self.progress.update(move=move, score=result['score'])
                 
                 alpha = max(alpha, result['score'])
                 
                 if self.use_pruning and beta <= alpha:
                     break  # Beta cutoff
-            
-            return best
         
         else:  # Minimizing player (Human)
             best = {'score': float('inf')}
             
             for move in available_moves:
-                new_board = board_state.copy()
-                new_board[move] = player
-                
-                result = self.minimax(new_board, 'O', depth + 1, alpha, beta, states_evaluated)
+                won = self.lines.place(board, line_counts, move, player)
+                window_alpha = math.nextafter(beta, -math.inf) if scout and best['score'] < float('inf') else alpha
+                result = self.alpha_beta(board, line_counts, 'O', depth + 1, window_alpha, beta, states_evaluated,
+                                         player if won else None, empty - 1, key ^ values[move])
+                if alpha < result['score'] < beta and window_alpha > alpha:
+                    result = self.alpha_beta(board, line_counts, 'O', depth + 1, alpha, beta, states_evaluated,
+                                             player if won else None, empty - 1, key ^ values[move])
+                self.lines.unplace(board, line_counts, move, player)
                 
                 if result['score'] < best['score']:
                     best = {'score': result['score'], 'index': move}
+                    if depth == 0 and self.progress is not None:
+                        self.progress.update(move=move, score=result['score'])
                 
                 beta = min(beta, result['score'])
                 
                 if self.use_pruning and beta <= alpha:
                     break  # Alpha cutoff
-            
-            return best
+        
+        if tt is not None:
+            score = best['score']
+            flag = UPPER if score <= window[0] else LOWER if score >= window[1] else EXACT
+            tt.store(key, draft, score_to_table(score, depth), flag, best['index'])
+        
+        return best
     
-    def ai_move(self) -> Tuple[int, Dict]:
-        """Execute AI move and return statistics"""
-        MatrixEffect.print_thinking()
+    def endgame_score(self, board: List[str], player: str, depth: int) -> float:
+        """Exact score of a tablebase position on the search's scale (O maximises)"""
+        value = self.endgame.probe(board)
+        if value == 0:
+            return 0
+        score = self.win_score - depth - (abs(value) - 1)
+        return score if (value > 0) == (player == 'O') else -score
+    
+    def score_root_moves(self, player: str, max_depth: Optional[int], states_evaluated: List[int],
+                         board: Optional[List[str]] = None) -> Dict[int, float]:
+        """Score every legal move of player (on board, default the current one) with a depth-capped search"""
+        states_evaluated[0] += 1
+        board = (self.board if board is None else board).copy()
+        line_counts = self.lines.count_lines(board)
+        empty = board.count('')
+        key = self.zobrist.key(board)
+        opponent = 'X' if player == 'O' else 'O'
+        
+        saved_depth = self.max_depth
+        if max_depth is not None and (saved_depth is None or max_depth < saved_depth):
+            self.max_depth = max_depth
+        
+        moves = self.get_available_moves(board)
+        if self.use_symmetry and self.evaluator is None:
+            orbits = self.symmetry.move_orbits(board, moves)
+        else:
+            orbits = {move: [move] for move in moves}
+        self.symmetric_moves += len(moves) - len(orbits)
+        
+        scores = {}
+        try:
+            for move, equivalent in orbits.items():
+                won = self.lines.place(board, line_counts, move, player)
+                result = self.alpha_beta(board, line_counts, opponent, 1, float('-inf'), float('inf'),
+                                         states_evaluated, player if won else None, empty - 1,
+                                         self.zobrist.toggle(key, move, player))
+                self.lines.unplace(board, line_counts, move, player)
+                for same in equivalent:
+                    scores[same] = result['score']
+                if self.progress is not None:
+                    best = (max if player == 'O' else min)(scores, key=scores.get)
+                    self.progress.update(move=best, score=scores[best])
+        finally:
+            self.max_depth = saved_depth
         
+        return scores
+    
+    def choose_move(self, scores: Dict[int, float], player: str,
+                    noise: float, temperature: float) -> int:
+        """Pick a root move from noisy scores, greedily or by softmax sampling"""
+        sign = 1 if player == 'O' else -1
+        values = {move: sign * score + self.rng.gauss(0, noise) for move, score in scores.items()}
+        
+        if temperature <= 0:
+            return max(values, key=values.get)
+        
+        top = max(values.values())
+        moves = list(values)
+        weights = [math.exp((values[move] - top) / temperature) for move in moves]
+        return self.rng.choices(moves, weights)[0]
+    
+    def evaluate_frontier(self, board: List[str], line_counts: Dict[str, List[int]], player: str,
+                          depth: int, states_evaluated: List[int], empty: int) -> Dict:
+        """Score every child of a node just above the depth cap with one network call"""
+        opponent = 'X' if player == 'O' else 'O'
+        scores = {}
+        pending_moves = []
+        pending_boards = []
+        
+        for move in self.get_available_moves(board):
+            states_evaluated[0] += 1
+            if self.lines.place(board, line_counts, move, player):
+                scores[move] = self.win_score - depth - 1 if player == 'O' else -self.win_score + depth + 1
+            elif empty == 1:
+                scores[move] = 0
+            else:
+                pending_moves.append(move)
+                pending_boards.append(board.copy())
+            self.lines.unplace(board, line_counts, move, player)
+        
+        if pending_boards:
+            values = neural_net.frontier_scores(self.evaluator, pending_boards, opponent)
+            scores.update(zip(pending_moves, values))
+        
+        pick = max if player == 'O' else min
+        move = pick(scores, key=scores.get)
+        return {'score': scores[move], 'index': move}
+    
+    def experience_key(self, player: str) -> Tuple[str, int]:
+        """
+        Experience cache key of the current board for this engine configuration
+        
+        Symmetric boards share one entry keyed by their canonical form; the
+        returned symmetry maps moves between the real and the canonical board.
+        """
+        variant = f"{self.size}x{self.size}k{self.win_length}"
+        if self.max_depth is not None:
+            variant += f"d{self.max_depth}" + ("nn" if self.evaluator is not None else "")
+        board, symmetry = self.symmetry.canonical(self.board)
+        return position_key(board, player, variant), symmetry
+    
+    def compute_move(self, player: str = 'O') -> Tuple[int, Dict]:
+        """Search the current board for player without any terminal output"""
         start_time = time.time()
         states_evaluated = [0]
+        level = DIFFICULTY_LEVELS[self.difficulty]
+        extra = {}
         
-        result = self.minimax(
-            self.board.copy(), 
-            'O', 
-            0, 
-            float('-inf'), 
-            float('inf'), 
-            states_evaluated
-        )
+        # A pondered answer: searched while the human was thinking
+        answer = None
+        if self.ponderer is not None and self.engine == 'minimax':
+            answer = self.ponderer.take(self.board)
+            extra['ponder'] = 'miss' if answer is None else 'hit'
+            if answer is not None:
+                states_evaluated[0] = answer['states']
+                extra['saved_ms'] = answer['time']
+        
+        self.tt.new_search()
+        self.symmetric_moves = 0
+        if self.progress is not None and self.engine == 'mcts':
+            self.progress.start()
+        elif self.progress is not None:
+            self.progress.start(depth=level['max_depth'] or self.max_depth or self.board.count(''))
+        
+        if self.engine == 'mcts':
+            if self.mcts is None:
+                self.mcts = MCTSEngine(self.win_patterns, self.cells, playout=self.mcts_playout, rng=self.rng)
+            self.mcts.progress = self.progress
+            move, extra = self.mcts.search(self.board, player, self.move_history,
+                                           iterations=self.mcts_iterations, time_ms=self.mcts_time_ms)
+            states_evaluated[0] = extra['playouts']
+            result = {'index': move, 'score': extra.pop('score')}
+        elif level['max_depth'] is None:
+            key, symmetry = self.experience_key(player)
+            cached = self.experience.lookup(key) if self.learning_mode else None
+            if cached:
+                result = {'index': self.symmetry.from_canonical(cached[0], symmetry), 'score': cached[1]}
+                extra['cache'] = 'hit'
+            else:
+                if answer is not None:
+                    result = {'index': answer['index'], 'score': answer['score']}
+                    extra.update(answer.get('threat', {}))
+                else:
+                    result = self.threat_minimax(self.board.copy(), player, states_evaluated, extra)
+                if self.learning_mode:
+                    self.experience.store(key, self.symmetry.to_canonical(result['index'], symmetry),
+                                          result['score'])
+        else:
+            key = (tuple(self.board), player, level['max_depth'])
+            scores = self.analysis_cache.get(key)
+            if scores is None:
+                if answer is not None:
+                    scores = answer['scores']
+                else:
+                    scores = self.score_root_moves(player, level['max_depth'], states_evaluated)
+                self.analysis_cache.put(key, scores)
+            else:
+                extra['cache'] = 'hit'
+            move = self.choose_move(scores, player, level['noise'], level['temperature'])
+            result = {'index': move, 'score': scores[move]}
         
         compute_time = (time.time() - start_time) * 1000  # Convert to ms
+        if self.progress is not None:
+            self.progress.finish(states_evaluated[0], move=result['index'], score=result['score'])
         
         # Update statistics
         self.stats['total_states'] += states_evaluated[0]
         self.stats['total_time'] += compute_time
         self.stats['decisions'] += 1
         
+        if self.engine == 'minimax':
+            level_stats = self.stats['levels'].setdefault(
+                self.difficulty, {'decisions': 0, 'total_states': 0, 'total_time': 0}
+            )
+            level_stats['decisions'] += 1
+            level_stats['total_states'] += states_evaluated[0]
+            level_stats['total_time'] += compute_time
+        
         move_stats = {
             'move': result['index'],
             'score': result['score'],
             'states': states_evaluated[0],
             'time': compute_time
         }
+        if self.symmetric_moves:
+            move_stats['symmetric_moves'] = self.symmetric_moves
+        move_stats.update(extra)
+        
+        self.decision_log.append(dict(move_stats, ply=len(self.move_history), player=player,
+                                      difficulty=self.difficulty))
+        
+        return result['index'], move_stats
+    
+    def threat_minimax(self, board: List[str], player: str, states_evaluated: List[int], extra: Dict) -> Dict:
+        """
+        minimax() from the root, preceded by the threat-space check if enabled
+        
+        A forced win by continuous threats is played without searching (its
+        score is that of the line found, which may not be the fastest win).
+        If the opponent has a line of fours, only the moves that can stop it
+        are searched. The threat line and nodes go into extra.
+        """
+        if self.threat_space is None:
+            return self.minimax(board, player, 0, float('-inf'), float('inf'), states_evaluated)
+        
+        win = self.threat_space.find_win(board, player)
+        states_evaluated[0] += self.threat_space.nodes
+        if win is not None:
+            extra.update(threat='win', threat_line=win['line'], threat_nodes=win['nodes'])
+            score = self.win_score - win['plies']
+            return {'index': win['line'][0], 'score': score if player == 'O' else -score}
+        
+        defence = self.threat_space.find_defence(board, player)
+        states_evaluated[0] += self.threat_space.nodes
+        if defence is None:
+            return self.minimax(board, player, 0, float('-inf'), float('inf'), states_evaluated)
+        extra.update(threat='defence', threat_line=defence['line'], threat_moves=len(defence['moves']))
+        self.root_moves = defence['moves']
+        try:
+            return self.minimax(board, player, 0, float('-inf'), float('inf'), states_evaluated)
+        finally:
+            self.root_moves = None
+    
+    def ponder_search(self, board: List[str], player: str) -> Dict:
+        """
+        Search board for player on the ponder thread, as compute_move() would
+        
+        Returns the hard level's 'index' and 'score', or the root 'scores' of
+        a capped level, plus 'states'. Raises SearchInterrupted when the
+        ponderer is stopped mid-search.
+        """
+        level = DIFFICULTY_LEVELS[self.difficulty]
+        states_evaluated = [0]
+        self.interrupt = self.ponderer.interrupted
+        try:
+            if level['max_depth'] is None:
+                threat = {}
+                answer = self.threat_minimax(board, player, states_evaluated, threat)
+                answer['threat'] = threat
+            else:
+                answer = {'scores': self.score_root_moves(player, level['max_depth'], states_evaluated, board)}
+        finally:
+            self.interrupt = None
+        answer['states'] = states_evaluated[0]
+        return answer
+    
+    def ponder_replies(self, player: str) -> List[int]:
+        """Legal moves of player on the current board, likeliest first"""
+        moves = self.get_available_moves(self.board)
+        sign = 1 if player == 'O' else -1
+        
+        # Static evaluation after each move; a winning move comes first
+        values = {}
+        for move in moves:
+            won = self.lines.place(self.board, self.line_counts, move, player)
+            values[move] = float('inf') if won else sign * self.evaluate(self.line_counts)
+            self.lines.unplace(self.board, self.line_counts, move, player)
+        order = sorted(moves, key=lambda move: -values[move])
+        
+        # LEARNING mode: the human's habits in this position go first
+        if self.learning_mode:
+            key, symmetry = self.experience_key(player)
+            habits = [self.symmetry.from_canonical(move, symmetry) for move, _ in self.experience.likely_replies(key)]
+            habits = [move for move in habits if move in values]
+            order = habits + [move for move in order if move not in habits]
+        return order
+    
+    def start_pondering(self, player: str = 'O'):
+        """Search player's answers to every reply of the opponent in the background"""
+        if self.ponderer is None or self.engine != 'minimax' or not self.game_active:
+            return
+        opponent = 'X' if player == 'O' else 'O'
+        self.ponderer.start(self.board, self.ponder_replies(opponent), opponent, player)
+    
+    def solve_position(self, player: str) -> Dict:
+        """Decide the current board with player to move by proof-number search"""
+        if self.solver is None:
+            self.solver = ProofNumberSearch(self.win_patterns, self.cells, method=self.solver_method,
+                                            memory_mb=self.solver_mb,
+                                            symmetry=self.symmetry if self.use_symmetry else None,
+                                            symmetry_depth=self.symmetry_depth)
+        return self.solver.solve(self.board, player, max_nodes=self.solve_nodes)
+    
+    def print_solve(self, result: Dict, player: str):
+        """Show a solve() result: proved win/loss/draw with node counts"""
+        verdicts = {
+            'win': (f"PROVED WIN FOR {player}", Colors.NEON_GREEN),
+            'loss': (f"PROVED LOSS FOR {player}", Colors.NEON_PINK),
+            'draw': ("PROVED DRAW", Colors.NEON_YELLOW),
+            'unknown': ("UNDECIDED", Colors.NEON_CYAN),
+            'memory': ("UNDECIDED", Colors.NEON_PINK)
+        }
+        verdict, color = verdicts[result['result']]
+        MatrixEffect.print_status(
+            f"{verdict} • {result['total_nodes']:,} NODES ({result['nodes']:,} THIS CALL) • "
+            f"{result['time_ms']:.0f}ms • {result['entries']:,} {self.solver_method.upper()} ENTRIES", color
+        )
+        if result['result'] == 'unknown':
+            MatrixEffect.print_terminal_prompt(f"Node budget spent ({self.solve_nodes:,}); solve again to resume")
+        elif result['result'] == 'memory':
+            MatrixEffect.print_terminal_prompt(
+                f"PNS tree full ({self.solver_mb:g} MB); raise --solve-mb or use --solver dfpn"
+            )
+    
+    def ai_move(self) -> Tuple[int, Dict]:
+        """Execute AI move and return statistics"""
+        MatrixEffect.print_thinking()
+        
+        move, move_stats = self.compute_move('O')
         
         # Log the decision
         self.log_decision(move_stats)
         
-        return result['index'], move_stats
+        return move, move_stats
     
     def log_decision(self, stats: Dict):
         """Log AI decision to terminal"""
@@ -301,22 +889,52 @@ class TicTacToeAI:
             f"{Colors.NEON_CYAN}STATES[{stats['states']}]{Colors.RESET} "
             f"{Colors.NEON_PINK}TIME[{stats['time']:.1f}ms]{Colors.RESET}"
         )
+        if stats.get('cache') == 'hit':
+            log_entry += f" {Colors.NEON_GREEN}CACHE[HIT]{Colors.RESET}"
+        if stats.get('symmetric_moves'):
+            log_entry += f" {Colors.NEON_CYAN}SYMMETRY[-{stats['symmetric_moves']} MOVES]{Colors.RESET}"
+        if stats.get('threat') == 'win':
+            line = ' '.join(map(str, stats['threat_line']))
+            log_entry += f" {Colors.NEON_PINK}THREATS[WIN {line}]{Colors.RESET}"
+        elif stats.get('threat') == 'defence':
+            line = ' '.join(map(str, stats['threat_line']))
+            log_entry += f" {Colors.NEON_YELLOW}THREATS[BLOCK {line} • {stats['threat_moves']} MOVES]{Colors.RESET}"
+        if stats.get('ponder') == 'hit':
+            log_entry += f" {Colors.NEON_GREEN}PONDER[HIT -{stats['saved_ms']:.1f}ms]{Colors.RESET}"
+        elif stats.get('ponder') == 'miss':
+            log_entry += f" {Colors.NEON_PINK}PONDER[MISS]{Colors.RESET}"
+        if 'playouts_per_sec' in stats:
+            log_entry += (
+                f" {Colors.NEON_GREEN}PLAYOUTS/S[{stats['playouts_per_sec']:,.0f}]{Colors.RESET}"
+                f" {Colors.NEON_CYAN}TREE[{stats['tree_size']}]{Colors.RESET}"
+            )
         MatrixEffect.print_terminal_prompt(log_entry)
     
     def make_move(self, position: int, player: str) -> bool:
         """Make a move on the board"""
-        if position < 0 or position > 8 or self.board[position] != '':
+        if position < 0 or position >= self.cells or self.board[position] != '':
             return False
         
-        self.board[position] = player
+        self.lines.place(self.board, self.line_counts, position, player)
+        self.key = self.zobrist.toggle(self.key, position, player)
+        self.move_history.append(position)
         return True
     
+    def undo_move(self) -> Optional[int]:
+        """Take back the last move on the board"""
+        if not self.move_history:
+            return None
+        
+        position = self.move_history.pop()
+        self.key = self.zobrist.toggle(self.key, position, self.board[position])
+        self.lines.unplace(self.board, self.line_counts, position, self.board[position])
+        return position
+    
     def check_game_over(self) -> Optional[str]:
         """Check if game is over and return winner or 'draw'"""
-        if self.check_winner(self.board, 'X'):
-            return 'X'
-        if self.check_winner(self.board, 'O'):
-            return 'O'
+        winner = self.lines.winner_from_counts(self.line_counts)
+        if winner:
+            return winner
         if self.is_board_full(self.board):
             return 'draw'
         return None
@@ -339,16 +957,135 @@ class TicTacToeAI:
     ║  AI WINS:         {Colors.NEON_GREEN}{self.stats['ai_wins']:>6}{Colors.NEON_CYAN}                     ║
     ║  PLAYER WINS:     {Colors.NEON_PINK}{self.stats['player_wins']:>6}{Colors.NEON_CYAN}                     ║
     ║  DRAWS:           {Colors.NEON_YELLOW}{self.stats['draws']:>6}{Colors.NEON_CYAN}                     ║
-    ║  TOTAL STATES:    {Colors.NEON_GREEN}{self.stats['total_states']:>6}{Colors.NEON_CYAN}                     ║
+    ║  TOTAL STATES:    {Colors.NEON_GREEN}{self.stats['total_states']:>6}{Colors.NEON_CYAN}                     ║"""
+        
+        # Per-difficulty cost, for sizing capacity by difficulty mix
+        levels = [(name, self.stats['levels'][name]) for name in DIFFICULTY_LEVELS
+                  if name in self.stats['levels']]
+        if levels:
+            stats_display += f"""
+    ╠══════════════════════════════════════════════╣
+    ║  LEVEL        AVG STATES      AVG LATENCY    ║"""
+            for name, level in levels:
+                level_states = level['total_states'] // level['decisions']
+                level_time = level['total_time'] / level['decisions']
+                stats_display += (
+                    f"\n    ║  {Colors.NEON_YELLOW}{name.upper():<13}{Colors.NEON_CYAN}"
+                    f"{Colors.NEON_PINK}{level_states:>10}{Colors.NEON_CYAN}"
+                    f"  {Colors.NEON_GREEN}{level_time:>13.2f}ms{Colors.NEON_CYAN}    ║"
+                )
+        
+        if self.learning_mode:
+            cache = self.experience.summary()
+            stats_display += f"""
+    ╠══════════════════════════════════════════════╣
+    ║  CACHE ENTRIES:   {Colors.NEON_GREEN}{cache['positions']:>6}{Colors.NEON_CYAN}                     ║
+    ║  CACHE HIT RATE:  {Colors.NEON_PINK}{cache['hit_rate']:>6.1f}%{Colors.NEON_CYAN}                    ║
+    ║  CACHE LOAD:      {Colors.NEON_YELLOW}{cache['load_ms']:>6.1f}ms{Colors.NEON_CYAN}                   ║"""
+        
+        if self.engine == 'minimax':
+            tt = self.tt.summary()
+            lru = self.analysis_cache.summary()
+            stats_display += f"""
+    ╠══════════════════════════════════════════════╣
+    ║  TT ENTRIES:      {Colors.NEON_GREEN}{tt['entries']:>9,}{Colors.NEON_CYAN} / {tt['capacity']:<9,}      ║
+    ║  TT FOOTPRINT:    {Colors.NEON_YELLOW}{tt['megabytes']:>9.1f}MB{Colors.NEON_CYAN}                ║
+    ║  TT HITS/MISSES:  {Colors.NEON_GREEN}{tt['hits']:>9,}{Colors.NEON_CYAN} / {Colors.NEON_PINK}{tt['misses']:<9,}{Colors.NEON_CYAN}      ║
+    ║  TT COLLISIONS:   {Colors.NEON_PINK}{tt['collisions']:>9,}{Colors.NEON_CYAN}                  ║
+    ║  TT EVICTIONS:    {Colors.NEON_PINK}{tt['evictions']:>9,}{Colors.NEON_CYAN}                  ║
+    ║  ANALYSIS LRU:    {Colors.NEON_GREEN}{lru['entries']:>9,}{Colors.NEON_CYAN} / {lru['capacity']:<9,}      ║"""
+        
+        if self.endgame is not None:
+            endgame = self.endgame.summary()
+            stats_display += f"""
+    ║  ENDGAME PROBES:  {Colors.NEON_GREEN}{endgame['probes']:>9,}{Colors.NEON_CYAN}                  ║"""
+        
+        if self.threat_space is not None:
+            threats = self.threat_space.summary()
+            stats_display += f"""
+    ║  THREAT WINS:     {Colors.NEON_GREEN}{threats['wins']:>9,}{Colors.NEON_CYAN}                  ║
+    ║  THREAT BLOCKS:   {Colors.NEON_YELLOW}{threats['defences']:>9,}{Colors.NEON_CYAN}                  ║
+    ║  THREAT NODES:    {Colors.NEON_PINK}{threats['nodes_per_search']:>9,.0f}{Colors.NEON_CYAN}/search           ║"""
+        
+        if self.progress is not None:
+            progress = self.progress.summary()
+            stats_display += f"""
+    ╠══════════════════════════════════════════════╣
+    ║  PROGRESS EVENTS: {Colors.NEON_GREEN}{progress['events']:>9,}{Colors.NEON_CYAN}                  ║
+    ║  PROGRESS COST:   {Colors.NEON_YELLOW}{progress['overhead_pct']:>9.3f}%{Colors.NEON_CYAN}                 ║"""
+        
+        if self.ponderer is not None:
+            ponder = self.ponderer.summary()
+            stats_display += f"""
+    ╠══════════════════════════════════════════════╣
+    ║  PONDER HITS:     {Colors.NEON_GREEN}{ponder['hit_rate']:>9.1f}%{Colors.NEON_CYAN}                 ║
+    ║  SAVED/MOVE:      {Colors.NEON_YELLOW}{ponder['saved_per_move_ms']:>9.1f}ms{Colors.NEON_CYAN}                ║"""
+        
+        stats_display += f"""
     ╚══════════════════════════════════════════════╝{Colors.RESET}
         """
         print(stats_display)
     
     def reset_game(self):
         """Reset the game board"""
-        self.board = [''] * 9
+        self.board = [''] * self.cells
+        self.line_counts = self.lines.count_lines(self.board)
+        self.key = 0
         self.current_player = 'X'
         self.game_active = True
+        self.move_history = []
+        self.decision_log = []
+        self.game_start_time = time.time()
+        if self.ponderer is not None:
+            self.ponderer.discard()
+        # The analysis LRU survives: its root scores do not depend on the game
+        self.tt.clear()
+        if self.mcts:
+            self.mcts.reset()
+    
+    def game_record(self, result: str, mode: str = 'human') -> Dict:
+        """Build the history record of the current game"""
+        return {
+            'mode': mode,
+            'size': self.size,
+            'depth': self.max_depth,
+            'engine': self.engine,
+            'started_at': datetime.fromtimestamp(self.game_start_time).isoformat(timespec='seconds'),
+            'moves': list(self.move_history),
+            'result': result,
+            'duration_ms': (time.time() - self.game_start_time) * 1000,
+            'decisions': list(self.decision_log)
+        }
+    
+    def play_self_game(self, rng: Optional[random.Random] = None, random_plies: int = 1) -> Dict:
+        """Play one AI-vs-AI game and return its history record
+        
+        The first random_plies moves are drawn at random so that repeated
+        self-play covers different openings instead of one perfect line.
+        """
+        rng = rng or random.Random()
+        self.reset_game()
+        player = 'X'
+        result = None
+        
+        while result is None:
+            if len(self.move_history) < random_plies:
+                move = rng.choice(self.get_available_moves(self.board))
+            else:
+                move, _ = self.compute_move(player)
+            self.make_move(move, player)
+            result = self.check_game_over()
+            player = 'O' if player == 'X' else 'X'
+        
+        return self.game_record(result, mode='self-play')
+    
+    def save_game_record(self, record: Dict):
+        """Append a finished game to the history file"""
+        try:
+            with open(HISTORY_FILE, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except Exception as e:
+            print(f"{Colors.NEON_PINK}[ERROR] Could not save game history: {e}{Colors.RESET}")
     
     def save_stats(self):
         """Save statistics to file"""
@@ -357,6 +1094,11 @@ class TicTacToeAI:
                 json.dump(self.stats, f, indent=2)
         except Exception as e:
             print(f"{Colors.NEON_PINK}[ERROR] Could not save stats: {e}{Colors.RESET}")
+        
+        try:
+            self.experience.save()
+        except Exception as e:
+            print(f"{Colors.NEON_PINK}[ERROR] Could not save experience cache: {e}{Colors.RESET}")
     
     def load_stats(self):
         """Load statistics from file"""
@@ -364,6 +1106,7 @@ class TicTacToeAI:
             if os.path.exists('tictactoe_matrix_stats.json'):
                 with open('tictactoe_matrix_stats.json', 'r') as f:
                     self.stats = json.load(f)
+                self.stats.setdefault('levels', {})
                 print(f"{Colors.NEON_GREEN}[LOADED] Previous statistics restored{Colors.RESET}")
         except Exception as e:
             print(f"{Colors.NEON_PINK}[ERROR] Could not load stats: {e}{Colors.RESET}")
@@ -371,9 +1114,14 @@ class TicTacToeAI:
     def play_game(self):
         """Main game loop"""
         MatrixEffect.print_header()
+        if self.progress_ms > 0:
+            self.progress = SearchProgress(MatrixEffect.print_progress, self.progress_ms)
         
         print(f"{Colors.NEON_GREEN}[SYSTEM ONLINE]{Colors.RESET}")
-        print(f"{Colors.NEON_CYAN}> NEURAL NETWORK ACTIVE{Colors.RESET}\n")
+        if self.evaluator is not None:
+            print(f"{Colors.NEON_CYAN}> NEURAL NETWORK ACTIVE{Colors.RESET}\n")
+        else:
+            print(f"{Colors.NEON_CYAN}> {self.engine.upper()} ENGINE ACTIVE{Colors.RESET}\n")
         
         time.sleep(1)
         
@@ -389,16 +1137,26 @@ class TicTacToeAI:
                     MatrixEffect.print_status("YOUR MOVE", Colors.NEON_CYAN)
                     
                     try:
-                        move = input(f"{Colors.NEON_GREEN}> Enter position (0-8) or 'q' to quit: {Colors.RESET}")
+                        move = input(f"{Colors.NEON_GREEN}> Enter position (0-{self.cells - 1}), 's' to solve or 'q' to quit: {Colors.RESET}")
+                        if self.ponderer is not None:
+                            self.ponderer.stop()
                         
                         if move.lower() == 'q':
                             self.save_stats()
                             print(f"\n{Colors.NEON_YELLOW}[SYSTEM] Shutting down...{Colors.RESET}\n")
                             return
                         
+                        if move.lower() == 's':
+                            self.print_solve(self.solve_position('X'), 'X')
+                            self.start_pondering('O')
+                            continue
+                        
                         move = int(move)
                         
+                        key, symmetry = self.experience_key('X')
                         if self.make_move(move, 'X'):
+                            if self.learning_mode:
+                                self.experience.observe(key, self.symmetry.to_canonical(move, symmetry))
                             result = self.check_game_over()
                             if result:
                                 self.handle_game_end(result)
@@ -427,6 +1185,7 @@ class TicTacToeAI:
                         break
                     
                     self.current_player = 'X'
+                    self.start_pondering('O')
             
             # Show stats after each game
             self.display_board()
@@ -461,13 +1220,421 @@ class TicTacToeAI:
             self.stats['draws'] += 1
             MatrixEffect.print_status("≈ DRAW ≈", Colors.NEON_YELLOW)
         
+        self.save_game_record(self.game_record(result))
         self.save_stats()
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe Neural Net - Matrix Edition")
+    parser.add_argument('--size', type=int, default=3, help="board size N for an N x N board (default: 3)")
+    parser.add_argument('--win-length', type=int, default=None, metavar='K',
+                        help="marks in a row needed to win (default: board size)")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="search depth cap; deeper positions use the line-count heuristic "
+                             "(default: full depth on 3x3, 4 on larger boards)")
+    parser.add_argument('--difficulty', choices=list(DIFFICULTY_LEVELS), default='hard',
+                        help="AI strength; easy/medium use cheap capped searches (default: hard)")
+    parser.add_argument('--engine', choices=['minimax', 'mcts'], default='minimax',
+                        help="search engine; mcts scales to large boards (default: minimax)")
+    parser.add_argument('--strategy', choices=list(STRATEGIES), default='alphabeta',
+                        help="minimax search driver: alpha-beta, PVS, aspiration windows or MTD(f) "
+                             "(default: alphabeta)")
+    parser.add_argument('--playouts', type=int, default=None, metavar='N',
+                        help="MCTS playouts per move (default: 10000 unless --think-ms is set)")
+    parser.add_argument('--think-ms', type=float, default=None, metavar='MS',
+                        help="MCTS (and --ultimate) time budget per move in milliseconds "
+                             "(--ultimate default: 1000)")
+    parser.add_argument('--playout-policy', choices=['random', 'heuristic', 'batch'], default='random',
+                        help="MCTS playout policy (default: random)")
+    parser.add_argument('--nn-weights', metavar='PATH', default=None,
+                        help="neural network weights used as leaf evaluator when searching with a depth cap "
+                             "(default: tictactoe_nn_<N>x<N>.npz if it exists)")
+    parser.add_argument('--nn-train', type=int, default=0, metavar='GAMES',
+                        help="train the network on GAMES minimax-labelled self-play games, save it and exit")
+    parser.add_argument('--endgame', type=int, default=0, metavar='K',
+                        help="score positions with at most K empty cells exactly from an endgame table "
+                             "(built with --workers processes and saved on first use)")
+    parser.add_argument('--threats', action='store_true',
+                        help="check for forced wins and defences by continuous threats before each search "
+                             "(for k-in-a-row boards larger than 3x3)")
+    parser.add_argument('--threat-depth', type=int, default=2, metavar='N',
+                        help="threes allowed in a threat line; 0 looks for fours only (default: 2)")
+    parser.add_argument('--solve', metavar='MOVES', default=None,
+                        help="decide the position after comma-separated MOVES (X first; '' = empty board) "
+                             "by proof-number search and exit; in a game, 's' solves the current position")
+    parser.add_argument('--solver', choices=list(SOLVER_METHODS), default='dfpn',
+                        help="proof-number method: pns (best-first tree) or dfpn (memory-capped table) "
+                             "(default: dfpn)")
+    parser.add_argument('--solve-nodes', type=int, default=1000000, metavar='N',
+                        help="nodes per solve; an undecided solve resumes on the next one (default: 1000000)")
+    parser.add_argument('--solve-mb', type=float, default=64, metavar='MB',
+                        help="memory cap of the solver's tree or table in megabytes (default: 64)")
+    parser.add_argument('--ultimate', action='store_true',
+                        help="play Ultimate tic-tac-toe (nine 3x3 sub-boards) against the bitboard engine; "
+                             "--think-ms, --depth and --cache-mb set its budget")
+    parser.add_argument('--cache-mb', type=float, default=16, metavar='MB',
+                        help="memory cap for the search caches in megabytes (default: 16)")
+    parser.add_argument('--no-symmetry', action='store_true',
+                        help="search moves leading to symmetric positions separately (for comparisons)")
+    parser.add_argument('--ponder', action='store_true',
+                        help="search answers to your likely replies while you think")
+    parser.add_argument('--ponder-ms', type=float, default=5000, metavar='MS',
+                        help="pondering time budget per turn in milliseconds (default: 5000)")
+    parser.add_argument('--ponder-replies', type=int, default=None, metavar='N',
+                        help="replies pondered per turn, likeliest first (default: all)")
+    parser.add_argument('--progress-ms', type=float, default=100, metavar='MS',
+                        help="show depth, best move and nodes/s of the AI's search on the status line "
+                             "at most every MS milliseconds; 0 turns it off (default: 100)")
+    parser.add_argument('--learning', action='store_true',
+                        help="LEARNING mode: reuse searched positions from previous sessions")
+    parser.add_argument('--export', metavar='PATH',
+                        help="export game and decision history to PATH_games/PATH_decisions and exit")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write games to a compact binary archive (plus index) and exit")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help="export file format (default: csv)")
+    parser.add_argument('--self-play', type=int, default=0, metavar='N',
+                        help="export N freshly generated AI-vs-AI games instead of the history file")
+    parser.add_argument('--chunk-size', type=int, default=10000, metavar='ROWS',
+                        help="rows buffered per write while exporting (default: 10000)")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for self-play openings")
+    parser.add_argument('--generate', metavar='DIR',
+                        help="play --self-play N games in parallel into sharded files under DIR "
+                             "(re-run to resume) and exit; --export/--archive then read the shards")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for --generate and endgame table builds (default: one per CPU)")
+    parser.add_argument('--shard-size', type=int, default=100, metavar='GAMES',
+                        help="games per shard file for --generate (default: 100)")
+    parser.add_argument('--shared-tt', type=float, default=None, metavar='MB',
+                        help="one transposition table of MB megabytes in shared memory for all "
+                             "--generate workers (default: one private table per worker)")
+    args = parser.parse_args(argv)
+    if args.size < 1:
+        parser.error("--size must be at least 1")
+    if args.win_length is not None and not 1 <= args.win_length <= args.size:
+        parser.error(f"--win-length must be between 1 and --size ({args.size})")
+    return args
+
+
+def create_ai(args: argparse.Namespace) -> TicTacToeAI:
+    """Build the engine for the board variant given on the command line"""
+    depth = args.depth
+    if depth is None and args.size > 3:
+        depth = 4
+    ai = TicTacToeAI(size=args.size, win_length=args.win_length, max_depth=depth,
+                     difficulty=args.difficulty, engine=args.engine, cache_mb=args.cache_mb,
+                     strategy=args.strategy)
+    ai.mcts_iterations = args.playouts
+    ai.mcts_time_ms = args.think_ms
+    ai.mcts_playout = args.playout_policy
+    ai.learning_mode = args.learning
+    ai.use_symmetry = not args.no_symmetry
+    ai.progress_ms = args.progress_ms
+    if args.ponder:
+        ai.ponderer = Ponderer(ai.ponder_search, budget_ms=args.ponder_ms, max_replies=args.ponder_replies)
+    
+    weights = nn_weights_path(args)
+    if not args.nn_train and os.path.exists(weights):
+        ai.evaluator = neural_net.NeuralEvaluator.load(weights)
+    if args.endgame > 0:
+        ai.endgame = load_endgame_table(ai, args)
+    if args.threats:
+        ai.threat_space = ThreatSpaceSearch(ai.win_patterns, ai.cells, threat_depth=args.threat_depth)
+    ai.solver_method = args.solver
+    ai.solver_mb = args.solve_mb
+    ai.solve_nodes = args.solve_nodes
+    return ai
+
+
+def endgame_path(args: argparse.Namespace) -> str:
+    """Endgame table file for the board variant given on the command line"""
+    win_length = args.win_length or args.size
+    return f"tictactoe_endgame_{args.size}x{args.size}k{win_length}e{args.endgame}.npz"
+
+
+def load_endgame_table(ai: TicTacToeAI, args: argparse.Namespace) -> EndgameTable:
+    """Load the endgame table, building and saving it first if needed"""
+    path = endgame_path(args)
+    if os.path.exists(path):
+        start_time = time.time()
+        table = EndgameTable.load(path, ai.win_patterns)
+        summary = table.summary()
+        MatrixEffect.print_status(
+            f"ENDGAME TABLE ≤{summary['max_empty']} EMPTY • {summary['positions']:,} POSITIONS • "
+            f"{summary['bytes'] / 1024 / 1024:.1f}MB • LOADED IN {time.time() - start_time:.2f}s",
+            Colors.NEON_GREEN
+        )
+        return table
+    
+    def report(layer: Dict):
+        MatrixEffect.print_terminal_prompt(
+            f"{Colors.NEON_CYAN}{layer['empty']:>2} EMPTY{Colors.RESET} • {layer['positions']:>10,} POSITIONS • "
+            f"{layer['bytes'] / 1024:>8.0f}KB • {Colors.NEON_GREEN}{layer['time']:.2f}s{Colors.RESET}"
+        )
+    
+    MatrixEffect.print_status(
+        f"BUILDING ENDGAME TABLE ≤{args.endgame} EMPTY "
+        f"({EndgameTable.estimate(ai.cells, args.endgame):,} POSITIONS)", Colors.NEON_YELLOW
+    )
+    start_time = time.time()
+    table = EndgameTable.build(ai.win_patterns, ai.cells, args.endgame,
+                               workers=args.workers or os.cpu_count() or 1, on_layer=report)
+    table.save(path)
+    MatrixEffect.print_status(
+        f"ENDGAME TABLE SAVED → {path} • {os.path.getsize(path) / 1024 / 1024:.1f}MB ON DISK • "
+        f"{time.time() - start_time:.2f}s", Colors.NEON_GREEN
+    )
+    return table
+
+
+def nn_weights_path(args: argparse.Namespace) -> str:
+    """Weights file for the board variant given on the command line"""
+    return args.nn_weights or f"tictactoe_nn_{args.size}x{args.size}.npz"
+
+
+def run_nn_training(args: argparse.Namespace):
+    """Train the evaluation network from self-play and save its weights"""
+    ai = create_ai(args)
+    MatrixEffect.print_status(f"TRAINING ON {args.nn_train} SELF-PLAY GAMES", Colors.NEON_GREEN)
+    net, report = neural_net.train_from_self_play(ai, args.nn_train, seed=args.seed)
+    path = nn_weights_path(args)
+    net.save(path)
+    MatrixEffect.print_terminal_prompt(
+        f"{Colors.NEON_CYAN}SAMPLES[{report['samples']}] "
+        f"VALUE LOSS[{report['value_loss']:.3f}] POLICY LOSS[{report['policy_loss']:.3f}] "
+        f"TRAIN[{report['positions_per_sec']:,.0f} pos/s]{Colors.RESET}"
+    )
+    MatrixEffect.print_status(f"WEIGHTS SAVED → {path}", Colors.NEON_GREEN)
+
+
+def select_records(args: argparse.Namespace) -> Tuple[Iterator[Dict], str]:
+    """Pick the game record stream requested on the command line"""
+    if args.generate:
+        return self_play.iter_shards(args.generate), args.generate
+    if args.self_play > 0:
+        ai = create_ai(args)
+        records = analytics_export.iter_self_play(ai, args.self_play, seed=args.seed)
+        return records, f"{args.self_play} self-play games"
+    return analytics_export.iter_history(HISTORY_FILE), HISTORY_FILE
+
+
+def run_export(args: argparse.Namespace):
+    """Stream history or self-play games into analytics files"""
+    records, source = select_records(args)
+    
+    MatrixEffect.print_status(f"EXPORTING {source} → {args.format.upper()}", Colors.NEON_GREEN)
+    summary = analytics_export.export_records(records, args.export, fmt=args.format,
+                                              chunk_size=args.chunk_size)
+    for path in summary['files']:
+        MatrixEffect.print_terminal_prompt(f"{Colors.NEON_CYAN}{path}{Colors.RESET}")
+    MatrixEffect.print_status(
+        f"{summary['games']} GAMES • {summary['decisions']} DECISIONS • {summary['time']:.2f}s",
+        Colors.NEON_GREEN
+    )
+
+
+def run_generate(args: argparse.Namespace):
+    """Play self-play games over a process pool into sharded history files"""
+    if args.self_play <= 0:
+        raise ValueError("--generate needs the number of games as --self-play N")
+    
+    config = {
+        'size': args.size,
+        'win_length': args.win_length or args.size,
+        'depth': args.depth,
+        'difficulty': args.difficulty,
+        'engine': args.engine
+    }
+    
+    def report(shard: Dict):
+        rate = shard['games'] / shard['time'] if shard['time'] > 0 else 0.0
+        MatrixEffect.print_terminal_prompt(
+            f"{Colors.NEON_CYAN}SHARD {shard['shard']:05d}{Colors.RESET} • {shard['games']} GAMES • "
+            f"{Colors.NEON_GREEN}{rate:.1f} GAMES/S{Colors.RESET} • WORKER {shard['worker']}"
+        )
+    
+    if args.endgame > 0 and not os.path.exists(endgame_path(args)):
+        load_endgame_table(TicTacToeAI(args.size, args.win_length), args)  # build once, before the workers
+    
+    MatrixEffect.print_status(f"GENERATING {args.self_play} SELF-PLAY GAMES → {args.generate}", Colors.NEON_GREEN)
+    summary = self_play.run_self_play(
+        create_ai, args, args.generate, args.self_play,
+        shard_size=args.shard_size, workers=args.workers, seed=args.seed,
+        config=config, on_shard=report, shared_tt_mb=args.shared_tt
+    )
+    
+    if summary['skipped_shards']:
+        MatrixEffect.print_terminal_prompt(f"{summary['skipped_shards']} SHARDS ALREADY DONE (RESUMED)")
+    for worker, stats in sorted(summary['workers'].items()):
+        tt = f" • TT HIT RATE {stats['tt_hit_rate']:.1f}%" if 'tt_hit_rate' in stats else ""
+        MatrixEffect.print_terminal_prompt(
+            f"WORKER {worker}: {stats['games']} GAMES • {stats['shards']} SHARDS • "
+            f"{Colors.NEON_GREEN}{stats['games_per_sec']:.1f} GAMES/S{Colors.RESET}{tt}"
+        )
+    if summary['tt'] is not None:
+        MatrixEffect.print_terminal_prompt(
+            f"SHARED TT: {summary['tt']['entries']:,} / {summary['tt']['capacity']:,} ENTRIES • "
+            f"{summary['tt']['megabytes']:.1f}MB FOR ALL WORKERS"
+        )
+    MatrixEffect.print_status(
+        f"{summary['games']} GAMES • {summary['time']:.2f}s • {summary['games_per_sec']:.1f} GAMES/S "
+        f"• SEED {summary['seed']}",
+        Colors.NEON_GREEN
+    )
+
+
+def run_archive(args: argparse.Namespace):
+    """Pack history or self-play games into a binary archive and index it"""
+    records, source = select_records(args)
+    
+    MatrixEffect.print_status(f"ARCHIVING {source} → {args.archive}", Colors.NEON_GREEN)
+    start_time = time.time()
+    count = game_records.write_records(args.archive, records, max_moves=args.size ** 2)
+    archive = game_records.GameArchive(args.archive)
+    game_records.GameIndex.build(archive).save(args.archive + '.idx')
+    archive.close()
+    MatrixEffect.print_status(
+        f"{count} GAMES • {os.path.getsize(args.archive)} BYTES • {time.time() - start_time:.2f}s",
+        Colors.NEON_GREEN
+    )
+
+
+def run_solve(args: argparse.Namespace):
+    """Decide the position given by --solve and print the result"""
+    ai = create_ai(args)
+    player = 'X'
+    for move in [int(m) for m in args.solve.split(',') if m.strip()]:
+        if not ai.make_move(move, player):
+            raise ValueError(f"Illegal move {move} in --solve")
+        player = 'O' if player == 'X' else 'X'
+    
+    ai.display_board()
+    MatrixEffect.print_status(f"SOLVING FOR {player} TO MOVE • {args.solver.upper()}", Colors.NEON_GREEN)
+    ai.print_solve(ai.solve_position(player), player)
+
+
+def display_ultimate(board: UltimateBoard):
+    """Show the 9x9 Ultimate grid; legal cells carry their move number"""
+    legal = set(board.legal_moves()) if board.winner() is None else set()
+    colors = {'X': Colors.NEON_CYAN, 'O': Colors.NEON_PINK}
+    print(f"\n{Colors.NEON_CYAN}{'─' * 60}{Colors.RESET}")
+    print(f"{Colors.NEON_GREEN}{Colors.BOLD}[ULTIMATE INTERFACE]{Colors.RESET}\n")
+    
+    for row in range(9):
+        blocks = []
+        for block in range(3):
+            cells = []
+            for col in range(3):
+                sub_board = (row // 3) * 3 + block
+                move = sub_board * 9 + (row % 3) * 3 + col
+                mark = board.cell(move)
+                owner = board.board_owner(sub_board)
+                if mark:
+                    cells.append(f"{colors[mark]}{Colors.BOLD}{mark:^4}{Colors.RESET}")
+                elif owner in colors:
+                    cells.append(f"{colors[owner]}{Colors.DIM}{owner.lower():^4}{Colors.RESET}")
+                elif move in legal:
+                    cells.append(f"{Colors.NEON_GREEN}{move:^4}{Colors.RESET}")
+                else:
+                    cells.append(f"{Colors.DARK_GRAY}{'·':^4}{Colors.RESET}")
+            blocks.append(''.join(cells))
+        print(f"     {Colors.NEON_GREEN}║{Colors.RESET}" + f"{Colors.NEON_GREEN}║{Colors.RESET}".join(blocks)
+              + f"{Colors.NEON_GREEN}║{Colors.RESET}")
+        if row in (2, 5):
+            print(f"     {Colors.NEON_GREEN}║{'╬'.join(['═' * 12] * 3)}║{Colors.RESET}")
+    
+    print(f"{Colors.NEON_CYAN}{'─' * 60}{Colors.RESET}\n")
+
+
+def play_ultimate(args: argparse.Namespace):
+    """Ultimate tic-tac-toe game loop: the player is X, the engine O"""
+    engine = UltimateEngine(cache_mb=args.cache_mb, time_ms=args.think_ms or 1000, max_depth=args.depth)
+    if args.progress_ms > 0:
+        engine.progress = SearchProgress(MatrixEffect.print_progress, args.progress_ms)
+    MatrixEffect.print_header()
+    print(f"{Colors.NEON_GREEN}[SYSTEM ONLINE]{Colors.RESET}")
+    print(f"{Colors.NEON_CYAN}> ULTIMATE ENGINE ACTIVE • {engine.time_ms:.0f}ms PER MOVE{Colors.RESET}\n")
+    
+    while True:
+        board = UltimateBoard()
+        engine.clear()
+        MatrixEffect.print_status("NEW GAME INITIALIZED", Colors.NEON_GREEN)
+        
+        while board.winner() is None:
+            display_ultimate(board)
+            if board.player == 'X':
+                MatrixEffect.print_status("YOUR MOVE", Colors.NEON_CYAN)
+                move = input(f"{Colors.NEON_GREEN}> Enter position (green numbers) or 'q' to quit: {Colors.RESET}")
+                if move.lower() == 'q':
+                    print(f"\n{Colors.NEON_YELLOW}[SYSTEM] Shutting down...{Colors.RESET}\n")
+                    return
+                try:
+                    move = int(move)
+                except ValueError:
+                    MatrixEffect.print_status("⚠ INVALID INPUT", Colors.NEON_PINK)
+                    continue
+                if move not in board.legal_moves():
+                    MatrixEffect.print_status("⚠ INVALID MOVE", Colors.NEON_PINK)
+                    continue
+                board.play(move)
+            else:
+                MatrixEffect.print_status("AI PROCESSING...", Colors.NEON_YELLOW)
+                move, info = engine.search(board)
+                board.play(move)
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                print(
+                    f"{Colors.DARK_GRAY}[{timestamp}]{Colors.RESET} "
+                    f"{Colors.NEON_GREEN}MOVE[{move}]{Colors.RESET} "
+                    f"{Colors.NEON_YELLOW}SCORE[{info['score']}]{Colors.RESET} "
+                    f"{Colors.NEON_CYAN}DEPTH[{info['depth']}] NODES[{info['nodes']:,}]{Colors.RESET} "
+                    f"{Colors.NEON_PINK}TIME[{info['time_ms']:.1f}ms] NPS[{info['nodes_per_sec']:,.0f}]{Colors.RESET}"
+                )
+        
+        display_ultimate(board)
+        result = board.winner()
+        if result == 'X':
+            MatrixEffect.print_status("⚡ PLAYER VICTORY ⚡", Colors.NEON_CYAN)
+            MatrixEffect.print_explosion()
+        elif result == 'O':
+            MatrixEffect.print_status("⚠ AI DOMINANCE ⚠", Colors.NEON_PINK)
+        else:
+            MatrixEffect.print_status("≈ DRAW ≈", Colors.NEON_YELLOW)
+        summary = engine.summary()
+        MatrixEffect.print_terminal_prompt(
+            f"{summary['searches']} SEARCHES • {summary['nodes']:,} NODES • "
+            f"{Colors.NEON_GREEN}{summary['nodes_per_sec']:,.0f} NODES/S{Colors.RESET} • "
+            f"TT HIT RATE {summary['table']['hit_rate']:.1f}%"
+        )
+        
+        print(f"\n{Colors.NEON_CYAN}> Play again? (y/n): {Colors.RESET}", end="")
+        if input().lower() != 'y':
+            print(f"{Colors.NEON_YELLOW}[SYSTEM] Shutting down neural network...{Colors.RESET}\n")
+            break
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point"""
+    args = parse_args(argv)
     try:
-        game = TicTacToeAI()
+        if args.nn_train:
+            run_nn_training(args)
+            return
+        if args.solve is not None:
+            run_solve(args)
+            return
+        if args.ultimate:
+            play_ultimate(args)
+            return
+        if args.generate or args.export or args.archive:
+            if args.generate:
+                run_generate(args)
+            if args.export:
+                run_export(args)
+            if args.archive:
+                run_archive(args)
+            return
+        game = create_ai(args)
         game.play_game()
     except KeyboardInterrupt:
         print(f"\n\n{Colors.NEON_YELLOW}[SYSTEM] Emergency shutdown...{Colors.RESET}\n")
@@ -0,0 +1,495 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Ultimate tic-tac-toe engine
+
+Nine 3x3 sub-boards arranged as a 3x3 macro board. The cell a player takes
+"sends" the opponent to the sub-board at the same position; when that
+sub-board is already won or full, the opponent may play in any open one.
+Winning a sub-board claims that macro cell, three macro cells in a row win.
+
+Built for speed rather than reuse of the N x N engine:
+- a position is nine 9-bit masks per player plus a macro mask per player
+  and a mask of closed (won or full) sub-boards
+- WINS, CELLS and BOARD_MOVES are lookup tables over all 512 masks, so a
+  sub-board win test or the legal moves of a sub-board are one index
+- LINE_SCORE rates every (own, blocked) mask pair once for the evaluation;
+  the open sub-boards' share of it is updated incrementally by play/undo,
+  and peek() scores a frontier leaf from the masks without making the move
+- alpha-beta (negamax) with iterative deepening under a time budget, the
+  shared TranspositionTable on incremental Zobrist keys, killer moves and
+  a history heuristic for move ordering
+- optional progress.SearchProgress events (depth, best move so far, nodes/s)
+  from the same 1024-node poll that checks the clock; stop() ends a search
+  running on another thread
+
+Moves are numbered sub_board * 9 + cell, both counted row by row.
+NPS_TARGET is the published search speed; `benchmark.py --suite ultimate`
+checks it.
+
+Author: Your Name
+"""
+
+import time
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from search_cache import EXACT, LOWER, UPPER, TranspositionTable, score_from_table, score_to_table
+from zobrist import ZOBRIST_SEED, ZobristKeys
+
+FULL = 0x1FF
+LINES = (0o007, 0o070, 0o700, 0o111, 0o222, 0o444, 0o421, 0o124)
+
+# Indexed by a 9-bit mask: does it hold a line, which cells are set
+WINS = bytes(any(mask & line == line for line in LINES) for mask in range(512))
+CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(512))
+
+# BOARD_MOVES[board][empty mask]: the moves into that sub-board's empty cells
+BOARD_MOVES = tuple(tuple(tuple(board * 9 + cell for cell in CELLS[mask]) for mask in range(512))
+                    for board in range(9))
+
+# Scores of a win (minus plies to it) and of the evaluation scale; heuristic
+# scores stay inside (-1, 1) as score_to_table() expects
+WIN_SCORE = 100
+EVAL_SCALE = 4096.0
+
+# Centre and corner sub-boards sit on more macro lines
+BOARD_WEIGHT = (3, 2, 3, 2, 4, 2, 3, 2, 3)
+MACRO_LINE_WEIGHT = 24
+MACRO_CELL_WEIGHT = 12
+# Move ordering: sending the opponent to a closed sub-board frees it, so
+# those moves go last; SEND_BITS[move] is the sub-board a move sends to
+SEND_BITS = tuple(1 << move % 9 for move in range(81))
+
+# Published search speed (nodes per second, one core, CPython 3.11)
+NPS_TARGET = 100000
+
+SIDES = ('X', 'O')
+
+
+def line_scores() -> List[int]:
+    """
+    LINE_SCORE[own | blocked << 9]: open lines of own, one mark 1, two marks 6
+
+    A line is open when no blocked cell lies on it. Only disjoint pairs are
+    filled in.
+    """
+    table = [0] * (1 << 18)
+    for own in range(512):
+        free = FULL & ~own
+        blocked = free
+        while True:
+            score = 0
+            for line in LINES:
+                if not line & blocked:
+                    marks = bin(own & line).count('1')
+                    score += 6 if marks == 2 else marks
+            table[own | blocked << 9] = score
+            if not blocked:
+                break
+            blocked = (blocked - 1) & free
+    return table
+
+
+LINE_SCORE = line_scores()
+
+# BOARD_SCORE[own | other << 9]: one sub-board from own's point of view
+BOARD_SCORE = [0] * (1 << 18)
+for _own in range(512):
+    _free = FULL & ~_own
+    _other = _free
+    while True:
+        BOARD_SCORE[_own | _other << 9] = LINE_SCORE[_own | _other << 9] - LINE_SCORE[_other | _own << 9]
+        if not _other:
+            break
+        _other = (_other - 1) & _free
+MACRO_WEIGHT = tuple(sum(BOARD_WEIGHT[cell] for cell in CELLS[mask]) for mask in range(512))
+
+# The forced sub-board (-1: free choice) is part of the position key
+_rng = random.Random(f"{ZOBRIST_SEED}:ultimate")
+FORCED_KEYS = tuple(_rng.getrandbits(64) for _ in range(10))
+CELL_KEYS = tuple(tuple(values) for values in ZobristKeys(9).values.values())
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is spent"""
+
+
+class UltimateBoard:
+    """Ultimate position as bitmasks, with make/unmake moves and the send rule"""
+
+    def __init__(self):
+        self.masks = ([0] * 9, [0] * 9)    # per side (0: X, 1: O), one mask per sub-board
+        self.macro = [0, 0]                # sub-boards won per side
+        self.closed = 0                    # sub-boards won or full
+        self.forced = -1                   # sub-board the side to move must play in, -1: any open one
+        self.side = 0
+        self.key = FORCED_KEYS[0]
+        self.score = 0                     # weighted BOARD_SCORE of the open sub-boards, for X
+        self.history = []
+
+    @classmethod
+    def from_moves(cls, moves: Sequence[int]) -> 'UltimateBoard':
+        """Position after a list of moves from the empty board (illegal moves raise ValueError)"""
+        board = cls()
+        for move in moves:
+            if move not in board.legal_moves():
+                raise ValueError(f"Illegal ultimate move {move}")
+            board.play(move)
+        return board
+
+    def copy(self) -> 'UltimateBoard':
+        """Independent copy (move history included)"""
+        board = UltimateBoard()
+        board.masks = (self.masks[0][:], self.masks[1][:])
+        board.macro = self.macro[:]
+        board.closed = self.closed
+        board.forced = self.forced
+        board.side = self.side
+        board.key = self.key
+        board.score = self.score
+        board.history = self.history[:]
+        return board
+
+    @property
+    def player(self) -> str:
+        """Side to move as 'X' or 'O'"""
+        return SIDES[self.side]
+
+    def play(self, move: int) -> bool:
+        """Make a legal move and report whether it wins the game"""
+        board, cell = divmod(move, 9)
+        side = self.side
+        own = self.masks[side]
+        before = own[board]
+        mask = before | 1 << cell
+        own[board] = mask
+        other = self.masks[1 - side][board] << 9
+        closed = self.closed
+        self.history.append((move, self.forced, closed, self.score))
+
+        won = False
+        delta = -BOARD_SCORE[before | other]
+        if WINS[mask]:
+            macro = self.macro[side] | 1 << board
+            self.macro[side] = macro
+            self.closed = closed = closed | 1 << board
+            won = WINS[macro]
+        elif mask | other >> 9 == FULL:
+            self.closed = closed = closed | 1 << board
+        else:
+            delta += BOARD_SCORE[mask | other]
+        self.score += BOARD_WEIGHT[board] * (-delta if side else delta)
+
+        forced = -1 if closed >> cell & 1 else cell
+        self.key ^= CELL_KEYS[side][move] ^ FORCED_KEYS[self.forced + 1] ^ FORCED_KEYS[forced + 1]
+        self.forced = forced
+        self.side = 1 - side
+        return won
+
+    def undo(self):
+        """Take back the last move"""
+        move, forced, closed, self.score = self.history.pop()
+        board, cell = divmod(move, 9)
+        side = 1 - self.side
+        self.masks[side][board] ^= 1 << cell
+        if closed != self.closed:
+            self.macro[side] &= ~(1 << board)
+        self.key ^= CELL_KEYS[side][move] ^ FORCED_KEYS[self.forced + 1] ^ FORCED_KEYS[forced + 1]
+        self.closed = closed
+        self.forced = forced
+        self.side = side
+
+    def legal_moves(self) -> List[int]:
+        """Moves into the forced sub-board, or into every open one"""
+        x, o = self.masks
+        if self.forced >= 0:
+            board = self.forced
+            return list(BOARD_MOVES[board][FULL & ~(x[board] | o[board])])
+        moves = []
+        for board in CELLS[FULL & ~self.closed]:
+            moves += BOARD_MOVES[board][FULL & ~(x[board] | o[board])]
+        return moves
+
+    def winner(self) -> Optional[str]:
+        """'X', 'O', 'draw' or None while the game is on"""
+        if WINS[self.macro[0]]:
+            return 'X'
+        if WINS[self.macro[1]]:
+            return 'O'
+        if self.closed == FULL:
+            return 'draw'
+        return None
+
+    def cell(self, move: int) -> str:
+        """Mark on a cell: 'X', 'O' or ''"""
+        board, cell = divmod(move, 9)
+        if self.masks[0][board] >> cell & 1:
+            return 'X'
+        if self.masks[1][board] >> cell & 1:
+            return 'O'
+        return ''
+
+    def board_owner(self, board: int) -> str:
+        """Winner of a sub-board: 'X', 'O', 'draw' (full) or ''"""
+        if self.macro[0] >> board & 1:
+            return 'X'
+        if self.macro[1] >> board & 1:
+            return 'O'
+        return 'draw' if self.closed >> board & 1 else ''
+
+    def peek(self, move: int) -> Optional[float]:
+        """
+        Score of the position after a legal move, for the side making it,
+        without making it: None when the move wins the game, 0.0 when it
+        ends it drawn, otherwise minus the new position's evaluate()
+        """
+        board, cell = divmod(move, 9)
+        side = self.side
+        before = self.masks[side][board]
+        mask = before | 1 << cell
+        other = self.masks[1 - side][board] << 9
+        x, o = self.macro
+        closed = self.closed
+
+        delta = -BOARD_SCORE[before | other]
+        if WINS[mask]:
+            if side:
+                o |= 1 << board
+                if WINS[o]:
+                    return None
+            else:
+                x |= 1 << board
+                if WINS[x]:
+                    return None
+            closed |= 1 << board
+        elif mask | other >> 9 == FULL:
+            closed |= 1 << board
+        else:
+            delta += BOARD_SCORE[mask | other]
+        if closed == FULL:
+            return 0.0
+
+        drawn = closed & ~(x | o)
+        score = (MACRO_LINE_WEIGHT * (LINE_SCORE[x | (o | drawn) << 9] - LINE_SCORE[o | (x | drawn) << 9])
+                 + MACRO_CELL_WEIGHT * (MACRO_WEIGHT[x] - MACRO_WEIGHT[o])
+                 + self.score + BOARD_WEIGHT[board] * delta * (1 - 2 * side))
+        return (-score if side else score) / EVAL_SCALE
+
+    def evaluate(self) -> float:
+        """Heuristic score in (-1, 1) for the side to move"""
+        x, o = self.macro
+        drawn = self.closed & ~(x | o)
+        score = (MACRO_LINE_WEIGHT * (LINE_SCORE[x | (o | drawn) << 9] - LINE_SCORE[o | (x | drawn) << 9])
+                 + MACRO_CELL_WEIGHT * (MACRO_WEIGHT[x] - MACRO_WEIGHT[o]) + self.score)
+        return (-score if self.side else score) / EVAL_SCALE
+
+
+class UltimateEngine:
+    """Iterative-deepening alpha-beta for UltimateBoard"""
+
+    def __init__(self, cache_mb: float = 16, time_ms: float = 1000, max_depth: Optional[int] = None):
+        """
+        Args:
+            cache_mb: Memory cap of the transposition table
+            time_ms: Default time budget per search
+            max_depth: Default depth cap (None: deepen until time runs out)
+        """
+        self.tt = TranspositionTable(cache_mb)
+        self.time_ms = time_ms
+        self.max_depth = max_depth
+        self.killers = [[-1, -1] for _ in range(82)]
+        self.history = ([0] * 81, [0] * 81)
+        self.nodes = 0
+        self.next_poll = 1024
+        self.deadline = None
+        self.stopped = False
+        self.progress = None
+        self.stats = {'searches': 0, 'nodes': 0, 'time_ms': 0.0, 'depth': 0}
+
+    def clear(self):
+        """Forget the table and ordering tables (e.g. on a new game)"""
+        self.tt.clear()
+        self.killers = [[-1, -1] for _ in range(82)]
+        self.history = ([0] * 81, [0] * 81)
+
+    def order(self, board: UltimateBoard, moves: List[int], first: int, ply: int) -> List[int]:
+        """Table move, killers, then by history score; moves freeing the opponent go last"""
+        moves.sort(key=self.history[board.side].__getitem__, reverse=True)
+        closed = board.closed
+        if closed:
+            moves = ([move for move in moves if not closed & SEND_BITS[move]]
+                     + [move for move in moves if closed & SEND_BITS[move]])
+        for move in reversed((first, *self.killers[ply])):
+            if move >= 0 and move in moves and moves[0] != move:
+                moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def negamax(self, board: UltimateBoard, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """Score of board for the side to move, searched depth plies"""
+        self.nodes += 1
+        if self.nodes >= self.next_poll:
+            self.next_poll = self.nodes + 1024
+            if self.stopped or (self.deadline is not None and time.perf_counter() >= self.deadline):
+                raise SearchTimeout()
+            if self.progress is not None:
+                self.progress.tick(self.nodes)
+        if board.closed == FULL:
+            return 0.0
+        if depth <= 0:
+            return board.evaluate()
+
+        tt = self.tt
+        original_alpha = alpha
+        first = -1
+        entry = tt.probe(board.key)
+        if entry is not None:
+            draft, score, flag, first = entry
+            if draft >= depth:
+                score = score_from_table(score, ply)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        best = float('-inf')
+        best_move = -1
+        for move in self.order(board, board.legal_moves(), first, ply):
+            if depth == 1:
+                # Frontier: score the leaf from the masks, no make/unmake or call
+                score = board.peek(move)
+                if score is None:
+                    score = WIN_SCORE - ply - 1
+                else:
+                    self.nodes += 1
+            elif board.play(move):
+                score = WIN_SCORE - ply - 1
+                board.undo()
+            else:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                board.undo()
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if score < 1:
+                            killers = self.killers[ply]
+                            if killers[0] != move:
+                                killers[1], killers[0] = killers[0], move
+                            self.history[board.side][move] += depth * depth
+                        break
+
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        tt.store(board.key, depth, score_to_table(best, ply), flag, best_move)
+        return best
+
+    def search(self, board: UltimateBoard, time_ms: Optional[float] = None,
+               max_depth: Optional[int] = None) -> Tuple[int, Dict]:
+        """
+        Best move for the side to move
+
+        Deepens one ply at a time until max_depth, a proven result or the
+        time budget; an interrupted iteration still counts once its first
+        (previous best) move was searched.
+
+        Returns:
+            Tuple of (move, info) where info has 'score' (for the side to
+            move), 'depth', 'nodes', 'time_ms' and 'nodes_per_sec'
+        """
+        time_ms = self.time_ms if time_ms is None else time_ms
+        board = board.copy()
+        base = len(board.history)
+        moves = board.legal_moves()
+        if not moves:
+            raise ValueError("No legal moves: the game is over")
+
+        # The game cannot outlast the empty cells of the open sub-boards
+        x, o = board.masks
+        plies_left = sum(9 - len(CELLS[x[b] | o[b]]) for b in CELLS[FULL & ~board.closed])
+        max_depth = min(max_depth or self.max_depth or 81, plies_left)
+
+        self.nodes = 0
+        self.next_poll = 1024
+        self.tt.new_search()
+        start = time.perf_counter()
+        deadline = start + time_ms / 1000.0
+        best_move, best_score, completed = moves[0], 0.0, 0
+        progress = self.progress
+        if progress is not None:
+            progress.start(depth=1)
+
+        for depth in range(1, max_depth + 1):
+            self.deadline = deadline if depth > 1 else None
+            alpha, iteration_move = float('-inf'), -1
+            if progress is not None:
+                progress.update(depth=depth)
+            try:
+                for move in self.order(board, moves[:], best_move, 0):
+                    if board.play(move):
+                        score = WIN_SCORE - 1
+                    else:
+                        score = -self.negamax(board, depth - 1, float('-inf'), -alpha, 1)
+                    board.undo()
+                    if score > alpha:
+                        alpha, iteration_move = score, move
+                        if progress is not None:
+                            progress.update(move=move, score=round(score, 3))
+            except SearchTimeout:
+                while len(board.history) > base:
+                    board.undo()
+                if iteration_move >= 0:
+                    best_move, best_score = iteration_move, alpha
+                break
+            best_move, best_score, completed = iteration_move, alpha, depth
+            if abs(best_score) >= 1 or time.perf_counter() >= deadline:
+                break
+        self.deadline = None
+        self.stopped = False
+        if progress is not None:
+            progress.finish(self.nodes, depth=completed, move=best_move, score=round(best_score, 3))
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['searches'] += 1
+        self.stats['nodes'] += self.nodes
+        self.stats['time_ms'] += elapsed
+        self.stats['depth'] = completed
+        return best_move, {
+            'score': round(best_score, 3),
+            'depth': completed,
+            'nodes': self.nodes,
+            'time_ms': elapsed,
+            'nodes_per_sec': self.nodes / elapsed * 1000 if elapsed > 0 else 0.0
+        }
+
+    def stop(self):
+        """Make a search running on another thread return its best move so far"""
+        self.stopped = True
+
+    def summary(self) -> Dict:
+        """Search totals and speed for the stats displays"""
+        seconds = self.stats['time_ms'] / 1000
+        return {
+            'nodes_per_sec': self.stats['nodes'] / seconds if seconds else 0.0,
+            'table': self.tt.summary(),
+            **self.stats
+        }
+
+
+def perft(board: UltimateBoard, depth: int) -> int:
+    """Leaf positions depth plies ahead (games ending earlier count once); tests move generation"""
+    moves = board.legal_moves()
+    if depth == 0 or not moves:
+        return 1
+    count = 0
+    for move in moves:
+        if board.play(move) or depth == 1:
+            count += 1
+        else:
+            count += perft(board, depth - 1)
+        board.undo()
+    return count
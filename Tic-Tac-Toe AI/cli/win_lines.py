@@ -0,0 +1,86 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Win patterns and incremental line counts
+
+One implementation of the board rules for every N x N, k-in-a-row search:
+the alpha-beta engine, the threat-space search and the proof-number solver.
+- generate_win_patterns(): every run of win_length cells (rows, columns,
+  diagonals)
+- WinLines: the patterns of one variant and, for every cell, the patterns
+  through it; place()/unplace() keep each player's marks per pattern in step
+  with a board, so a move updates only the lines through its cell and
+  reports at once whether it completed one
+
+Author: Your Name
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+
+def generate_win_patterns(size: int, win_length: int) -> List[List[int]]:
+    """All runs of win_length cells on a size x size board (rows, columns, diagonals)"""
+    patterns = []
+    span = size - win_length + 1
+    for r in range(size):                       # Rows
+        for c in range(span):
+            patterns.append([r * size + c + k for k in range(win_length)])
+    for c in range(size):                       # Columns
+        for r in range(span):
+            patterns.append([(r + k) * size + c for k in range(win_length)])
+    for r in range(span):                       # Diagonals
+        for c in range(span):
+            patterns.append([(r + k) * size + c + k for k in range(win_length)])
+    for r in range(span):                       # Anti-diagonals
+        for c in range(win_length - 1, size):
+            patterns.append([(r + k) * size + c - k for k in range(win_length)])
+    return patterns
+
+
+class WinLines:
+    """Win patterns of one variant with incremental per-player line counts"""
+
+    def __init__(self, win_patterns: List[List[int]], cells: int):
+        """
+        Args:
+            win_patterns: Cell lists of every winning line (all of one length)
+            cells: Number of cells on the board
+        """
+        self.win_patterns = win_patterns
+        self.win_length = len(win_patterns[0])
+        self.cells = cells
+        self.cell_lines = [[] for _ in range(cells)]
+        for line, pattern in enumerate(win_patterns):
+            for cell in pattern:
+                self.cell_lines[cell].append(line)
+
+    def count_lines(self, board: Sequence[str]) -> Dict[str, List[int]]:
+        """Count each player's marks on every win pattern from scratch"""
+        return {
+            player: [sum(1 for cell in pattern if board[cell] == player) for pattern in self.win_patterns]
+            for player in ('X', 'O')
+        }
+
+    def winner_from_counts(self, counts: Dict[str, List[int]]) -> Optional[str]:
+        """Return the player owning a complete line, if any"""
+        for player in ('X', 'O'):
+            if self.win_length in counts[player]:
+                return player
+        return None
+
+    def place(self, board: List[str], counts: Dict[str, List[int]], cell: int, player: str) -> bool:
+        """Place a mark, update line counts and report whether it completes a line"""
+        board[cell] = player
+        own = counts[player]
+        won = False
+        for line in self.cell_lines[cell]:
+            own[line] += 1
+            if own[line] == self.win_length:
+                won = True
+        return won
+
+    def unplace(self, board: List[str], counts: Dict[str, List[int]], cell: int, player: str):
+        """Take back a mark placed with place()"""
+        board[cell] = ''
+        own = counts[player]
+        for line in self.cell_lines[cell]:
+            own[line] -= 1
@@ -0,0 +1,101 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Zobrist position keys
+
+64-bit position keys that are updated with one XOR per move instead of
+hashing the whole board at every node:
+- key(board) is the XOR of a fixed random value per (player, occupied cell)
+- placing or removing a mark XORs the same value again (toggle)
+- symmetric keys: the key of the board under each of the 8 rotations and
+  reflections of the square, updated incrementally as well; their minimum
+  is a canonical key shared by all symmetric positions
+
+The random values come from a fixed seed, so keys are identical in every
+process and session. The side to move is not hashed: it follows from the
+number of marks on the board.
+
+Author: Your Name
+"""
+
+import random
+from typing import List, Sequence
+
+ZOBRIST_SEED = 0x7A0B7157
+
+
+def symmetry_permutations(size: int) -> List[List[int]]:
+    """
+    The 8 symmetries of a size x size board as cell permutations
+
+    perm[cell] is where cell goes: identity, rotations by 90/180/270
+    degrees, then mirror left-right, mirror top-bottom and the two
+    diagonal reflections.
+    """
+    n = size - 1
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - r),
+        lambda r, c: (n - r, n - c),
+        lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c),
+        lambda r, c: (n - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - c, n - r)
+    ]
+    perms = []
+    for transform in transforms:
+        perm = []
+        for cell in range(size * size):
+            row, col = transform(*divmod(cell, size))
+            perm.append(row * size + col)
+        perms.append(perm)
+    return perms
+
+
+class ZobristKeys:
+    """Random values per (player, cell) for one board size"""
+
+    def __init__(self, size: int, seed: int = ZOBRIST_SEED):
+        self.size = size
+        self.cells = size * size
+        rng = random.Random(f"{seed}:{size}")
+        self.values = {
+            'X': [rng.getrandbits(64) for _ in range(self.cells)],
+            'O': [rng.getrandbits(64) for _ in range(self.cells)]
+        }
+
+        # symmetric_values[player][cell][s]: value of the mark after symmetry s
+        self.symmetries = symmetry_permutations(size)
+        self.symmetric_values = {
+            player: [[values[perm[cell]] for perm in self.symmetries] for cell in range(self.cells)]
+            for player, values in self.values.items()
+        }
+
+    def key(self, board: Sequence[str]) -> int:
+        """Key of a board computed from scratch"""
+        key = 0
+        for cell, mark in enumerate(board):
+            if mark:
+                key ^= self.values[mark][cell]
+        return key
+
+    def toggle(self, key: int, cell: int, player: str) -> int:
+        """Key after player's mark on cell is placed or removed"""
+        return key ^ self.values[player][cell]
+
+    def symmetric_keys(self, board: Sequence[str]) -> List[int]:
+        """Keys of the board under all 8 symmetries, computed from scratch"""
+        keys = [0] * len(self.symmetries)
+        for cell, mark in enumerate(board):
+            if mark:
+                keys = self.toggle_symmetric(keys, cell, mark)
+        return keys
+
+    def toggle_symmetric(self, keys: List[int], cell: int, player: str) -> List[int]:
+        """Symmetric keys after player's mark on cell is placed or removed"""
+        return [key ^ value for key, value in zip(keys, self.symmetric_values[player][cell])]
+
+    @staticmethod
+    def canonical(keys: List[int]) -> int:
+        """Canonical key: the same for every rotation and reflection of a board"""
+        return min(keys)
@@ -0,0 +1,207 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Analytics dashboard
+
+Streamlit dashboard over the AI decision history:
+- decision latency distribution (log-scaled histogram with p50/p90/p99)
+- states evaluated per move by game phase and board size
+- pruning efficiency over time: how much of the unpruned game tree the
+  minimax search skipped, as a rolling median
+- latency over the recorded decisions
+
+Stays responsive with millions of decisions: the history is read
+incrementally (only lines appended since the last refresh are parsed), the
+aggregates are cached per data version, and series are downsampled before
+they reach the browser.
+
+Usage:
+    streamlit run dashboard/analytics_dashboard.py
+    streamlit run dashboard/analytics_dashboard.py -- --history games.jsonl --history selfplay_dir
+
+Author: Your Name
+"""
+
+import os
+import sys
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import history_data
+from history_data import HistoryStore
+from tic_tac_toe_matrix_cli import HISTORY_FILE
+
+GREEN = '#00ff41'
+DARK_GREEN = '#008f11'
+CYAN = '#00ffff'
+YELLOW = '#ffff00'
+RED = '#ff0040'
+BG = '#0d0d0d'
+MAX_POINTS = 2000
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Options given after `--` on the streamlit command line"""
+    parser = argparse.ArgumentParser(description='Tic-Tac-Toe AI analytics dashboard')
+    parser.add_argument('--history', action='append',
+                        help=f'History file or --generate directory (repeatable; default {HISTORY_FILE})')
+    return parser.parse_args(argv)
+
+
+@st.cache_resource
+def get_store(paths: tuple) -> HistoryStore:
+    """One incremental store per set of paths, shared by all sessions"""
+    return HistoryStore(paths)
+
+
+# The store is passed as `_store` so Streamlit does not hash it; `version`
+# changes whenever new decisions were read, invalidating the cached results
+
+@st.cache_data(max_entries=4)
+def latency_view(_store: HistoryStore, paths: tuple, version: int, difficulty: str) -> Dict:
+    """Histogram and percentiles of decision time"""
+    decisions = filter_decisions(_store.decisions, difficulty)
+    times = decisions['time_ms'].to_numpy()
+    edges, counts = history_data.latency_histogram(times)
+    return {'edges': edges, 'counts': counts, **history_data.latency_percentiles(times)}
+
+
+@st.cache_data(max_entries=4)
+def phase_view(_store: HistoryStore, paths: tuple, version: int, difficulty: str) -> pd.DataFrame:
+    """States per move by board size and game phase"""
+    return history_data.phase_summary(filter_decisions(_store.decisions, difficulty))
+
+
+@st.cache_data(max_entries=4)
+def pruning_view(_store: HistoryStore, paths: tuple, version: int, difficulty: str, window: int) -> Dict:
+    """Downsampled rolling pruning efficiency"""
+    x, y = history_data.pruning_series(filter_decisions(_store.decisions, difficulty), window, MAX_POINTS)
+    return {'x': x, 'y': y}
+
+
+@st.cache_data(max_entries=4)
+def timeline_view(_store: HistoryStore, paths: tuple, version: int, difficulty: str) -> Dict:
+    """Downsampled decision time over the recorded decisions"""
+    decisions = filter_decisions(_store.decisions, difficulty)
+    x, y = history_data.downsample(decisions.index.to_numpy(), decisions['time_ms'].to_numpy(), MAX_POINTS)
+    return {'x': x, 'y': y}
+
+
+def filter_decisions(decisions: pd.DataFrame, difficulty: str) -> pd.DataFrame:
+    """Decisions of one difficulty level ('all' keeps every decision)"""
+    if difficulty == 'all':
+        return decisions
+    return decisions[decisions['difficulty'] == difficulty]
+
+
+def matrix_layout(fig: go.Figure, title: str, **axes) -> go.Figure:
+    """Apply the Matrix colour scheme to a chart"""
+    fig.update_layout(
+        title=title, paper_bgcolor=BG, plot_bgcolor=BG, font={'family': 'Courier', 'color': GREEN},
+        margin={'l': 40, 'r': 20, 't': 50, 'b': 40}, showlegend=False, **axes
+    )
+    fig.update_xaxes(gridcolor='#1a1a1a', zerolinecolor='#1a1a1a')
+    fig.update_yaxes(gridcolor='#1a1a1a', zerolinecolor='#1a1a1a')
+    return fig
+
+
+def latency_chart(view: Dict) -> go.Figure:
+    """Log-scaled decision time histogram with percentile markers"""
+    edges = view['edges']
+    centers = np.sqrt(edges[:-1] * edges[1:])
+    fig = go.Figure(go.Bar(x=centers, y=view['counts'], width=np.diff(edges), marker_color=DARK_GREEN))
+    for name, color in (('p50', GREEN), ('p90', YELLOW), ('p99', RED)):
+        if view[name] > 0:
+            fig.add_vline(x=view[name], line_color=color, line_dash='dash',
+                          annotation_text=f"{name} {view[name]:.2f}ms", annotation_font_color=color)
+    return matrix_layout(fig, 'DECISION LATENCY', xaxis={'type': 'log', 'title': 'ms'},
+                         yaxis={'title': 'decisions'})
+
+
+def phase_chart(summary: pd.DataFrame) -> go.Figure:
+    """Box plots of states per move, drawn from precomputed quartiles"""
+    fig = go.Figure()
+    colors = [GREEN, CYAN, YELLOW, RED]
+    for i, (size, rows) in enumerate(summary.groupby('size')):
+        fig.add_trace(go.Box(
+            name=f"{size}x{size}", x=rows['phase'].astype(str), q1=rows['q1'], median=rows['median'],
+            q3=rows['q3'], lowerfence=rows['q1'], upperfence=rows['p90'], mean=rows['mean'],
+            marker_color=colors[i % len(colors)]
+        ))
+    fig = matrix_layout(fig, 'STATES PER MOVE BY PHASE', yaxis={'type': 'log', 'title': 'states'},
+                        boxmode='group')
+    fig.update_layout(showlegend=True)
+    return fig
+
+
+def line_chart(view: Dict, title: str, ytitle: str, color: str, log: bool = False) -> go.Figure:
+    """Line chart of a downsampled series"""
+    fig = go.Figure(go.Scattergl(x=view['x'], y=view['y'], mode='lines', line={'color': color, 'width': 1}))
+    return matrix_layout(fig, title, xaxis={'title': 'decision #'},
+                         yaxis={'title': ytitle, 'type': 'log' if log else 'linear'})
+
+
+def main():
+    """Render the dashboard"""
+    args = parse_args(sys.argv[1:])
+    paths = tuple(args.history or [HISTORY_FILE])
+
+    st.set_page_config(page_title='Tic-Tac-Toe AI Analytics', page_icon='⚡', layout='wide')
+    st.markdown(
+        f"<style>.stApp {{background-color: {BG}; color: {GREEN}; font-family: Courier;}}"
+        f"h1, h2, h3, label, p {{color: {GREEN} !important; font-family: Courier !important;}}</style>",
+        unsafe_allow_html=True
+    )
+    st.title('⚡ NEURAL NET ANALYTICS ⚡')
+
+    store = get_store(paths)
+    with st.sidebar:
+        st.header('CONFIG')
+        st.button('REFRESH')    # any rerun reads the lines appended since the last one
+        if st.button('RELOAD ALL'):
+            with store.lock:
+                store.reset()
+        difficulty = st.selectbox('DIFFICULTY', ['all', 'easy', 'medium', 'hard'])
+        window = st.slider('PRUNING WINDOW', 10, 5000, 200, step=10)
+        st.caption(' • '.join(paths))
+
+    store.refresh()
+    stats = store.stats
+
+    if stats['decisions'] == 0:
+        st.warning('No recorded AI decisions yet. Play some games or run --generate first.')
+        return
+
+    latency = latency_view(store, paths, store.version, difficulty)
+    cols = st.columns(5)
+    cols[0].metric('GAMES', f"{stats['games']:,}")
+    cols[1].metric('DECISIONS', f"{stats['decisions']:,}")
+    cols[2].metric('P50 LATENCY', f"{latency['p50']:.2f}ms")
+    cols[3].metric('P99 LATENCY', f"{latency['p99']:.2f}ms")
+    cols[4].metric('LAST REFRESH', f"{stats['refresh_ms']:.0f}ms")
+
+    left, right = st.columns(2)
+    left.plotly_chart(latency_chart(latency), use_container_width=True)
+    summary = phase_view(store, paths, store.version, difficulty)
+    right.plotly_chart(phase_chart(summary), use_container_width=True)
+
+    left, right = st.columns(2)
+    pruning = pruning_view(store, paths, store.version, difficulty, window)
+    left.plotly_chart(line_chart(pruning, 'PRUNING EFFICIENCY (log10 TREE / STATES)', 'orders of magnitude',
+                                 CYAN), use_container_width=True)
+    timeline = timeline_view(store, paths, store.version, difficulty)
+    right.plotly_chart(line_chart(timeline, 'LATENCY OVER TIME', 'ms', GREEN, log=True),
+                       use_container_width=True)
+
+    with st.expander('PHASE TABLE'):
+        st.dataframe(summary, use_container_width=True)
+
+
+if __name__ == '__main__':
+    main()
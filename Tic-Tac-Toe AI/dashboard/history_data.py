@@ -0,0 +1,284 @@
+"""
+⚡ TIC-TAC-TOE NEURAL NET - MATRIX EDITION ⚡
+Dashboard data layer
+
+Game and decision tables for the analytics dashboard, built to stay fast
+with millions of recorded decisions:
+- HistoryStore reads JSON-lines history files (and --generate shard
+  directories) incrementally: it remembers a byte offset per file and on
+  refresh parses only the lines appended since, keeping a partial last line
+  for the next refresh; a file that shrank is reloaded from scratch
+- series are downsampled before plotting: min/max per bucket, so spikes
+  survive while the number of plotted points stays fixed
+- distributions and per-phase statistics are computed here as histograms
+  and quantiles, so the charts never receive raw rows
+
+Pure pandas/NumPy (no Streamlit), usable from notebooks as well.
+
+Author: Your Name
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Shared engine modules live next to the CLI version
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cli'))
+
+from tic_tac_toe_matrix_cli import DIFFICULTY_LEVELS, HISTORY_FILE
+
+GAME_COLUMNS = ['game', 'started_at', 'mode', 'size', 'depth', 'engine', 'result', 'num_moves', 'duration_ms']
+DECISION_COLUMNS = ['game', 'ply', 'player', 'difficulty', 'engine', 'size', 'empty', 'move', 'score',
+                    'states', 'time_ms', 'cache_hit', 'tree_bound']
+RECORD_FIELDS = ['game', 'ply', 'player', 'difficulty', 'engine', 'size', 'depth', 'move', 'score',
+                 'states', 'time_ms', 'cache_hit']
+PHASES = ('opening', 'middlegame', 'endgame')
+
+# Fixed categories keep the columns categorical (and cheap) across refreshes
+CATEGORIES = {
+    'player': pd.CategoricalDtype(['X', 'O']),
+    'difficulty': pd.CategoricalDtype(list(DIFFICULTY_LEVELS)),
+    'engine': pd.CategoricalDtype(['minimax', 'mcts'])
+}
+DECISION_TYPES = {'game': 'int64', 'ply': 'int16', 'size': 'int8', 'empty': 'int16', 'move': 'int16',
+                  'score': 'float64', 'states': 'int64', 'time_ms': 'float64', 'cache_hit': 'bool',
+                  'tree_bound': 'float64', **CATEGORIES}
+
+
+def infer_size(moves: Sequence[int]) -> int:
+    """Board size of an old record without 'size': the smallest board holding its moves"""
+    return max(3, math.isqrt(max(moves, default=0)) + 1)
+
+
+@lru_cache(maxsize=None)
+def tree_bound(empty: int, depth: Optional[int]) -> float:
+    """
+    Nodes of the unpruned game tree below a position, ignoring early wins
+
+    Every sequence of k moves into `empty` cells, for k up to the depth cap:
+    the most a search without pruning or caching could visit.
+    """
+    plies = empty if depth is None else min(empty, depth)
+    nodes, sequences = 1, 1
+    for k in range(plies):
+        sequences *= empty - k
+        nodes += sequences
+    return float(nodes)
+
+
+def search_depth(game_depth: Optional[int], difficulty: str) -> Optional[int]:
+    """Depth cap of a decision: the engine's cap, lowered by an easy/medium level"""
+    level = DIFFICULTY_LEVELS.get(difficulty, {}).get('max_depth')
+    if level is None:
+        return game_depth
+    return level if game_depth is None else min(level, game_depth)
+
+
+class HistoryStore:
+    """Game and decision tables of history files, read incrementally"""
+
+    def __init__(self, paths: Sequence[str] = (HISTORY_FILE,)):
+        """
+        Args:
+            paths: JSON-lines history files and/or --generate directories
+        """
+        self.paths = list(paths)
+        self.lock = threading.Lock()
+        self.version = 0
+        self.reset()
+
+    def reset(self):
+        """Forget everything read so far (version keeps counting up)"""
+        self.offsets = {}
+        self.games = pd.DataFrame(columns=GAME_COLUMNS)
+        self.decisions = pd.DataFrame(columns=DECISION_COLUMNS).astype(DECISION_TYPES)
+        self.next_game = 0
+        self.version += 1
+        self.stats = {'bytes': 0, 'games': 0, 'decisions': 0, 'refresh_ms': 0.0, 'reloads': 0}
+
+    def files(self) -> List[str]:
+        """History files to read: the given files plus the shards of given directories"""
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files += [os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if name.startswith('shard_') and name.endswith('.jsonl')]
+            elif os.path.exists(path):
+                files.append(path)
+        return files
+
+    def read_new_lines(self, path: str) -> List[bytes]:
+        """Complete lines appended to path since the last read"""
+        offset = self.offsets.get(path, 0)
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1     # a partial last line waits for the next refresh
+        self.offsets[path] = offset + end
+        self.stats['bytes'] += end
+        return data[:end].splitlines()
+
+    def refresh(self) -> int:
+        """
+        Read the games appended since the last refresh
+
+        Safe to call from several dashboard sessions at once.
+
+        Returns:
+            Number of new decisions
+        """
+        with self.lock:
+            return self.read_appended()
+
+    def read_appended(self) -> int:
+        """refresh() without the lock"""
+        start = time.perf_counter()
+        files = self.files()
+        if any(os.path.getsize(path) < self.offsets.get(path, 0) for path in files):
+            reloads = self.stats['reloads'] + 1
+            self.reset()
+            self.stats['reloads'] = reloads
+
+        games, decisions = [], []
+        for path in files:
+            for line in self.read_new_lines(path):
+                if line.strip():
+                    self.add_record(json.loads(line), games, decisions)
+
+        if games:
+            new_games = pd.DataFrame.from_records(games, columns=GAME_COLUMNS)
+            new_games['started_at'] = pd.to_datetime(new_games['started_at'], errors='coerce')
+            self.games = new_games if self.games.empty else pd.concat([self.games, new_games], ignore_index=True)
+        if decisions:
+            new_decisions = decision_frame(decisions)
+            self.decisions = (new_decisions if self.decisions.empty
+                              else pd.concat([self.decisions, new_decisions], ignore_index=True))
+            self.version += 1
+
+        self.stats['games'] = len(self.games)
+        self.stats['decisions'] = len(self.decisions)
+        self.stats['refresh_ms'] = (time.perf_counter() - start) * 1000
+        return len(decisions)
+
+    def add_record(self, record: Dict, games: List[tuple], decisions: List[tuple]):
+        """Append one game record's rows (RECORD_FIELDS tuples for the decisions)"""
+        game = self.next_game
+        self.next_game += 1
+        moves = record.get('moves', [])
+        size = record.get('size') or infer_size(moves)
+        depth = record.get('depth')
+        engine = record.get('engine', 'minimax')
+        games.append((game, record.get('started_at'), record.get('mode', 'human'), size, depth, engine,
+                      record.get('result'), len(moves), record.get('duration_ms', 0.0)))
+        for decision in record.get('decisions', []):
+            decisions.append((game, decision.get('ply', 0), decision.get('player', 'O'),
+                              decision.get('difficulty', 'hard'), engine, size, depth, decision['move'],
+                              decision['score'], decision['states'], decision['time'],
+                              decision.get('cache') == 'hit'))
+
+
+def decision_frame(rows: List[tuple]) -> pd.DataFrame:
+    """Decision table of RECORD_FIELDS rows, with the derived columns filled in"""
+    frame = pd.DataFrame.from_records(rows, columns=RECORD_FIELDS)
+    frame['empty'] = frame['size'] ** 2 - frame['ply']
+    # Rows share few (empty cells, depth cap, level) triples: tree_bound() once per triple
+    depth = frame['depth'].astype(object).where(frame['depth'].notna(), None)
+    keys = list(zip(frame['empty'].tolist(), depth.tolist(), frame['difficulty'].tolist()))
+    bounds = {key: tree_bound(key[0], search_depth(key[1] and int(key[1]), key[2])) for key in set(keys)}
+    frame['tree_bound'] = [bounds[key] for key in keys]
+    return frame[DECISION_COLUMNS].astype(DECISION_TYPES)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    At most max_points points of a series, keeping each bucket's min and max
+
+    x must be sorted. Spikes stay visible, unlike with stride sampling.
+    """
+    if len(x) <= max_points:
+        return x, y
+    buckets = max(1, max_points // 2)
+    edges = np.linspace(0, len(x), buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    order = np.lexsort((y, bucket))
+    first = edges[:-1][np.diff(edges) > 0]
+    last = edges[1:][np.diff(edges) > 0] - 1
+    keep = np.unique(np.concatenate([order[first], order[last]]))
+    return x[keep], y[keep]
+
+
+def latency_histogram(times: np.ndarray, bins: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """Counts of decision times over log-spaced bins (edges in ms)"""
+    times = times[times > 0]
+    if not len(times):
+        return np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64)
+    low, high = times.min(), times.max()
+    edges = np.logspace(np.log10(low), np.log10(high * 1.0001), bins + 1)
+    counts, _ = np.histogram(times, bins=edges)
+    return edges, counts
+
+
+def latency_percentiles(times: np.ndarray) -> Dict[str, float]:
+    """p50, p90 and p99 decision time in ms"""
+    if not len(times):
+        return {'p50': 0.0, 'p90': 0.0, 'p99': 0.0}
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {'p50': float(p50), 'p90': float(p90), 'p99': float(p99)}
+
+
+def game_phase(ply: np.ndarray, size: np.ndarray) -> np.ndarray:
+    """'opening', 'middlegame' or 'endgame': the third of the board's cells the ply falls in"""
+    third = np.minimum(ply * 3 // (size.astype(np.int64) ** 2), 2)
+    return np.array(PHASES)[third]
+
+
+def phase_summary(decisions: pd.DataFrame) -> pd.DataFrame:
+    """
+    States per move by board size and game phase
+
+    One row per (size, phase) with the decision count, quartiles, p90 and
+    mean of states, and the mean time in ms. Cache hits (no search) are left out.
+    """
+    searched = decisions[~decisions['cache_hit']]
+    if searched.empty:
+        return pd.DataFrame(columns=['size', 'phase', 'decisions', 'q1', 'median', 'q3', 'p90',
+                                     'mean', 'time_ms'])
+    phase = pd.Categorical(game_phase(searched['ply'].to_numpy(), searched['size'].to_numpy()),
+                           categories=PHASES, ordered=True)
+    grouped = searched.groupby([searched['size'], phase], observed=True)
+    states = grouped['states']
+    summary = pd.DataFrame({
+        'decisions': states.size(),
+        'q1': states.quantile(0.25),
+        'median': states.median(),
+        'q3': states.quantile(0.75),
+        'p90': states.quantile(0.9),
+        'mean': states.mean(),
+        'time_ms': grouped['time_ms'].mean()
+    })
+    summary.index.names = ['size', 'phase']
+    return summary.reset_index()
+
+
+def pruning_series(decisions: pd.DataFrame, window: int = 200,
+                   max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pruning efficiency over time: orders of magnitude of the unpruned tree skipped
+
+    log10(tree_bound / states) per minimax decision, as a rolling median over
+    `window` decisions in recording order, downsampled for plotting.
+    """
+    searched = decisions[(decisions['engine'] == 'minimax') & ~decisions['cache_hit'] & (decisions['states'] > 0)]
+    if searched.empty:
+        return np.zeros(0), np.zeros(0)
+    saved = np.log10(searched['tree_bound'].to_numpy() / searched['states'].to_numpy())
+    rolling = pd.Series(saved).rolling(window, min_periods=1).median().to_numpy()
+    return downsample(searched.index.to_numpy(), rolling, max_points)
@@ -13,14 +13,48 @@ A cyberpunk-themed Tic-Tac-Toe AI featuring:
 Author: Your Name
 """
 
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import queue
+import threading
 import time
 import random
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
+# Shared engine modules live next to the CLI version
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cli'))
+
+from experience import ExperienceCache, position_key
+from ponder import Ponderer
+from progress import SearchProgress
+from proof_number import ProofNumberSearch
+from symmetry import SymmetryTables
+from tic_tac_toe_matrix_cli import STRATEGIES, TicTacToeAI
+from ultimate import UltimateBoard, UltimateEngine
+
+EXPERIENCE_FILE = 'tictactoe_experience_3x3.json'
+EXPERIENCE_VARIANT = '3x3k3'
+SEARCH_CACHE_MB = 4
+PONDER_BUDGET_MS = 2000
+
+# SOLVE: proof-number search in after() slices of SOLVE_SLICE_NODES nodes,
+# each slice resuming the last, until the position is proved or
+# SOLVE_BUDGET_NODES nodes were spent
+SOLVE_SLICE_NODES = 2000
+SOLVE_BUDGET_NODES = 200000
+
+# ULTIMATE window: thinking time and table size of the bitboard engine
+ULTIMATE_THINK_MS = 1000
+ULTIMATE_CACHE_MB = 16
+# The engine searches on a worker thread; its progress events go through a
+# queue that the window drains every ULTIMATE_POLL_MS
+ULTIMATE_PROGRESS_MS = 100
+ULTIMATE_POLL_MS = 50
+
 
 class MatrixColors:
     """Matrix-themed color palette"""
@@ -38,6 +72,7 @@ class TicTacToeMatrixGUI:
     """Matrix-themed Tic-Tac-Toe GUI application"""
     
     def __init__(self, root):
+        self.startup_time = time.perf_counter()
         self.root = root
         self.root.title("⚡ TIC-TAC-TOE NEURAL NET ⚡")
         self.root.configure(bg=MatrixColors.DARK_BG)
@@ -50,6 +85,8 @@ class TicTacToeMatrixGUI:
         self.use_pruning = tk.BooleanVar(value=True)
         self.learning_mode = tk.BooleanVar(value=False)
         self.show_viz = tk.BooleanVar(value=True)
+        self.ponder_mode = tk.BooleanVar(value=False)
+        self.strategy = tk.StringVar(value='alphabeta')
         
         # Win patterns
         self.win_patterns = [
@@ -69,15 +106,50 @@ class TicTacToeMatrixGUI:
             'decisions': 0
         }
         
-        self.load_stats()
+        # LEARNING mode: remembered positions and opponent habits (loaded on first use)
+        self.experience = ExperienceCache(EXPERIENCE_FILE)
+        
+        # The CLI engine searches the AI's moves with the driver and pruning
+        # selected in CONFIG; its transposition table is cleared every game.
+        # Moves leading to symmetric positions are searched once (root and the
+        # engine's first symmetry_depth plies); cache entries use canonical boards
+        self.ai = TicTacToeAI(3, cache_mb=SEARCH_CACHE_MB)
+        self.symmetry = SymmetryTables(3)
+        self.symmetric_moves = 0
+        
+        # PONDERING: the AI's answers to the player's replies are searched
+        # one reply per after() callback while the player thinks
+        self.ponderer = Ponderer(self.ponder_search, budget_ms=PONDER_BUDGET_MS)
+        self.ponder_job = None
+        
+        # SOLVE button: df-pn proof of the current position, one slice per after() callback
+        self.solver = ProofNumberSearch(self.win_patterns, 9, symmetry=self.symmetry)
+        self.solve_job = None
+        
+        # ULTIMATE button: a separate window for the nine-board variant
+        self.ultimate_window = None
+        
+        # Startup is staged: the board is built and shown first, the
+        # secondary panels and the stats file follow in idle callbacks
+        self.stats_loaded = False
+        self.panels_ready = False
+        self.first_frame_ms = None
+        
+        # Idle animation timers, paused while the window is unfocused or minimised
+        self.cursor_job = None
+        self.visibility_job = None
+        
         self.setup_ui()
-        self.update_stats_display()
+        self.learning_mode.trace_add('write', self.on_learning_toggle)
+        
+        for event in ('<FocusIn>', '<FocusOut>', '<Map>', '<Unmap>'):
+            self.root.bind(event, self.on_visibility_change, add='+')
         
-        # Start Matrix rain animation
-        self.animate_matrix_rain()
+        # First frame: the first Expose after the window is mapped (one-shot)
+        self.first_frame_bind = self.root.bind('<Expose>', self.on_first_frame, add='+')
     
     def setup_ui(self):
-        """Setup the complete user interface"""
+        """Setup the parts of the interface needed for the first frame"""
         # Main container
         main_frame = tk.Frame(self.root, bg=MatrixColors.DARK_BG)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -85,21 +157,57 @@ class TicTacToeMatrixGUI:
         # Header
         self.create_header(main_frame)
         
-        # Stats bar
-        self.create_stats_bar(main_frame)
+        # Stats bar (filled in by build_secondary_panels)
+        self.stats_bar_slot = tk.Frame(main_frame, bg=MatrixColors.DARK_BG)
+        self.stats_bar_slot.pack(fill=tk.X)
         
         # Main game area (3 columns)
-        game_container = tk.Frame(main_frame, bg=MatrixColors.DARK_BG)
-        game_container.pack(fill=tk.BOTH, expand=True, pady=20)
+        self.game_container = tk.Frame(main_frame, bg=MatrixColors.DARK_BG)
+        self.game_container.pack(fill=tk.BOTH, expand=True, pady=20)
         
         # Left: Game board
-        self.create_game_section(game_container)
+        self.create_game_section(self.game_container)
+    
+    def build_secondary_panels(self):
+        """Build the stats bar, visualization and settings panels (once)"""
+        if self.panels_ready:
+            return
+        
+        self.create_stats_bar(self.stats_bar_slot)
         
         # Middle: Visualization panel
-        self.create_viz_panel(game_container)
+        self.create_viz_panel(self.game_container)
         
         # Right: Settings panel
-        self.create_settings_panel(game_container)
+        self.create_settings_panel(self.game_container)
+        
+        self.panels_ready = True
+        if self.first_frame_ms is not None:
+            self.log_message(f">> STARTUP: FIRST FRAME {self.first_frame_ms:.1f}ms\n")
+        self.update_stats_display()
+        self.resume_animations()
+    
+    def ensure_stats(self):
+        """Load statistics from disk the first time they are needed"""
+        if self.stats_loaded:
+            return
+        
+        self.load_stats()
+        self.stats_loaded = True
+        self.update_stats_display()
+    
+    def on_first_frame(self, event=None):
+        """Record time to the first painted frame, then finish startup"""
+        if self.first_frame_ms is not None:
+            return
+        
+        # Expose only schedules the redraw; flush it so the frame is on screen
+        self.root.update_idletasks()
+        self.first_frame_ms = (time.perf_counter() - self.startup_time) * 1000
+        self.root.unbind('<Expose>', self.first_frame_bind)
+        
+        self.root.after_idle(self.build_secondary_panels)
+        self.root.after_idle(self.ensure_stats)
     
     def create_header(self, parent):
         """Create Matrix-styled header"""
@@ -114,6 +222,7 @@ class TicTacToeMatrixGUI:
             bg=MatrixColors.DARK_BG
         )
         title.pack()
+        self.title_label = title
         
         subtitle = tk.Label(
             header_frame,
@@ -123,9 +232,6 @@ class TicTacToeMatrixGUI:
             bg=MatrixColors.DARK_BG
         )
         subtitle.pack()
-        
-        # Animated cursor effect
-        self.animate_title_cursor(title)
     
     def create_stats_bar(self, parent):
         """Create top statistics bar"""
@@ -279,6 +385,36 @@ class TicTacToeMatrixGUI:
             pady=8
         )
         clear_btn.pack(side=tk.LEFT, padx=5)
+        
+        solve_btn = tk.Button(
+            control_frame,
+            text="⊢ SOLVE",
+            font=("Courier New", 10, "bold"),
+            bg=MatrixColors.NEON_YELLOW,
+            fg=MatrixColors.DARK_BG,
+            activebackground=MatrixColors.NEON_YELLOW,
+            command=self.on_solve,
+            relief=tk.RAISED,
+            bd=3,
+            padx=20,
+            pady=8
+        )
+        solve_btn.pack(side=tk.LEFT, padx=5)
+        
+        ultimate_btn = tk.Button(
+            control_frame,
+            text="⊞ ULTIMATE",
+            font=("Courier New", 10, "bold"),
+            bg=MatrixColors.NEON_PINK,
+            fg=MatrixColors.DARK_BG,
+            activebackground=MatrixColors.NEON_PINK,
+            command=self.open_ultimate,
+            relief=tk.RAISED,
+            bd=3,
+            padx=20,
+            pady=8
+        )
+        ultimate_btn.pack(side=tk.LEFT, padx=5)
     
     def create_viz_panel(self, parent):
         """Create visualization panel"""
@@ -409,6 +545,7 @@ class TicTacToeMatrixGUI:
         configs = [
             ("PRUNING", self.use_pruning),
             ("LEARNING", self.learning_mode),
+            ("PONDERING", self.ponder_mode),
             ("VISUALIZATION", self.show_viz)
         ]
         
@@ -439,6 +576,37 @@ class TicTacToeMatrixGUI:
             )
             check.pack(side=tk.RIGHT, padx=10, pady=10)
         
+        # Search driver selector
+        item_frame = tk.Frame(settings_frame, bg=MatrixColors.DARK_BG, relief=tk.RAISED, bd=2)
+        item_frame.pack(pady=5, padx=10, fill=tk.X)
+        
+        tk.Label(
+            item_frame,
+            text="STRATEGY",
+            font=("Courier New", 9),
+            fg=MatrixColors.NEON_YELLOW,
+            bg=MatrixColors.DARK_BG
+        ).pack(side=tk.LEFT, padx=10, pady=10)
+        
+        menu = tk.OptionMenu(item_frame, self.strategy, *STRATEGIES)
+        menu.config(
+            font=("Courier New", 8),
+            bg=MatrixColors.DARK_BG,
+            fg=MatrixColors.NEON_GREEN,
+            activebackground=MatrixColors.GRID_COLOR,
+            activeforeground=MatrixColors.NEON_GREEN,
+            highlightthickness=0,
+            bd=0
+        )
+        menu['menu'].config(
+            font=("Courier New", 8),
+            bg=MatrixColors.DARK_BG,
+            fg=MatrixColors.NEON_GREEN,
+            activebackground=MatrixColors.GRID_COLOR,
+            activeforeground=MatrixColors.NEON_GREEN
+        )
+        menu.pack(side=tk.RIGHT, padx=10, pady=10)
+        
         # Scoreboard
         tk.Label(
             settings_frame,
@@ -456,7 +624,14 @@ class TicTacToeMatrixGUI:
             ("AI WINS", "ai_wins", MatrixColors.NEON_GREEN),
             ("PLAYER WINS", "player_wins", MatrixColors.NEON_PINK),
             ("DRAWS", "draws", MatrixColors.NEON_YELLOW),
-            ("TOTAL STATES", "total_states", MatrixColors.NEON_CYAN)
+            ("TOTAL STATES", "total_states", MatrixColors.NEON_CYAN),
+            ("CACHE ENTRIES", "cache_entries", MatrixColors.NEON_GREEN),
+            ("CACHE HIT RATE", "cache_hit_rate", MatrixColors.NEON_YELLOW),
+            ("TT ENTRIES", "tt_entries", MatrixColors.NEON_CYAN),
+            ("TT HIT RATE", "tt_hit_rate", MatrixColors.NEON_YELLOW),
+            ("TT FOOTPRINT", "tt_footprint", MatrixColors.NEON_PINK),
+            ("PONDER HITS", "ponder_hit_rate", MatrixColors.NEON_GREEN),
+            ("SAVED/MOVE", "ponder_saved", MatrixColors.NEON_YELLOW)
         ]
         
         for name, key, color in scores:
@@ -487,15 +662,23 @@ class TicTacToeMatrixGUI:
         if not self.game_active or self.board[index] != '' or self.current_player != 'X':
             return
         
+        self.stop_pondering()
+        if self.learning_mode.get():
+            board, symmetry = self.symmetry.canonical(self.board)
+            self.experience.observe(position_key(board, 'X', EXPERIENCE_VARIANT),
+                                    self.symmetry.to_canonical(index, symmetry))
+        
         self.make_move(index, 'X')
         
         if self.game_active:
             self.thinking_label.pack(pady=5)
             self.root.update()
-            self.root.after(500, self.ai_move)
+            # A pondered answer is played without the thinking pause
+            self.root.after(1 if self.ponderer.ready(self.board) else 500, self.ai_move)
     
     def make_move(self, index, player):
         """Make a move on the board"""
+        self.stop_solving()
         self.board[index] = player
         
         # Update button
@@ -516,20 +699,37 @@ class TicTacToeMatrixGUI:
     
     def ai_move(self):
         """Execute AI move"""
+        self.build_secondary_panels()
+        self.ensure_stats()
         self.status_label.config(text="AI PROCESSING...")
         self.root.update()
         
         start_time = time.time()
         states_evaluated = [0]
+        self.symmetric_moves = 0
         
-        result = self.minimax(
-            self.board.copy(),
-            'O',
-            0,
-            float('-inf'),
-            float('inf'),
-            states_evaluated
-        )
+        # A pondered answer: searched while the player was thinking
+        answer = self.ponderer.take(self.board) if self.ponder_mode.get() else None
+        ponder = None
+        if self.ponder_mode.get():
+            ponder = 'miss' if answer is None else 'hit'
+        
+        learning = self.learning_mode.get()
+        board, symmetry = self.symmetry.canonical(self.board)
+        key = position_key(board, 'O', EXPERIENCE_VARIANT)
+        cached = self.experience.lookup(key) if learning else None
+        
+        if cached is not None:
+            result = {'index': self.symmetry.from_canonical(cached[0], symmetry), 'score': cached[1]}
+        else:
+            if answer is not None:
+                result = {'index': answer['index'], 'score': answer['score']}
+                states_evaluated[0] = answer['states']
+            else:
+                self.ai.tt.new_search()
+                result = self.search_root(self.board.copy(), 'O', states_evaluated)
+            if learning:
+                self.experience.store(key, self.symmetry.to_canonical(result['index'], symmetry), result['score'])
         
         compute_time = (time.time() - start_time) * 1000
         
@@ -539,7 +739,8 @@ class TicTacToeMatrixGUI:
         self.stats['decisions'] += 1
         
         # Log decision
-        self.log_decision(result['index'], result['score'], states_evaluated[0], compute_time)
+        self.log_decision(result['index'], result['score'], states_evaluated[0], compute_time,
+                          cached is not None, self.symmetric_moves, ponder, answer['time'] if answer else 0)
         
         # Visualize
         if self.show_viz.get():
@@ -550,44 +751,93 @@ class TicTacToeMatrixGUI:
         
         self.thinking_label.pack_forget()
         self.update_stats_display()
+        
+        if self.game_active and self.ponder_mode.get():
+            self.start_pondering()
     
-    def minimax(self, board_state, player, depth, alpha, beta, states_evaluated):
-        """Minimax algorithm with alpha-beta pruning"""
-        states_evaluated[0] += 1
-        
-        if self.check_winner_state(board_state, 'X'):
-            return {'score': -10 + depth}
-        if self.check_winner_state(board_state, 'O'):
-            return {'score': 10 - depth}
-        if all(cell != '' for cell in board_state):
-            return {'score': 0}
-        
-        available = [i for i, cell in enumerate(board_state) if cell == '']
-        
-        if player == 'O':
-            best = {'score': float('-inf')}
-            for move in available:
-                new_board = board_state.copy()
-                new_board[move] = player
-                result = self.minimax(new_board, 'X', depth + 1, alpha, beta, states_evaluated)
-                if result['score'] > best['score']:
-                    best = {'score': result['score'], 'index': move}
-                alpha = max(alpha, result['score'])
-                if self.use_pruning.get() and beta <= alpha:
-                    break
-            return best
-        else:
-            best = {'score': float('inf')}
-            for move in available:
-                new_board = board_state.copy()
-                new_board[move] = player
-                result = self.minimax(new_board, 'O', depth + 1, alpha, beta, states_evaluated)
-                if result['score'] < best['score']:
-                    best = {'score': result['score'], 'index': move}
-                beta = min(beta, result['score'])
-                if self.use_pruning.get() and beta <= alpha:
-                    break
-            return best
+    def ponder_search(self, board, player):
+        """Search board for player while pondering, as ai_move() would"""
+        states_evaluated = [0]
+        answer = self.search_root(board, player, states_evaluated)
+        answer['states'] = states_evaluated[0]
+        return answer
+    
+    def start_pondering(self):
+        """Queue the player's replies (known habits first) and ponder them in after() steps"""
+        replies = [i for i, cell in enumerate(self.board) if cell == '']
+        if self.learning_mode.get():
+            board, symmetry = self.symmetry.canonical(self.board)
+            habits = [self.symmetry.from_canonical(move, symmetry)
+                      for move, _ in self.experience.likely_replies(position_key(board, 'X', EXPERIENCE_VARIANT))]
+            habits = [move for move in habits if move in replies]
+            replies = habits + [move for move in replies if move not in habits]
+        self.ponderer.begin(self.board, replies, 'X', 'O')
+        self.ponder_job = self.root.after(1, self.ponder_step)
+    
+    def ponder_step(self):
+        """Search one pondered reply and reschedule until the session is over"""
+        self.ponder_job = None
+        if self.ponderer.step():
+            self.ponder_job = self.root.after(1, self.ponder_step)
+    
+    def stop_pondering(self):
+        """Cancel the pending ponder step; prepared answers are kept"""
+        if self.ponder_job is not None:
+            self.root.after_cancel(self.ponder_job)
+            self.ponder_job = None
+        self.ponderer.stop()
+    
+    def on_solve(self):
+        """Start proving the current position for the side to move"""
+        self.build_secondary_panels()
+        self.stop_solving()
+        self.status_label.config(text="SOLVING...", fg=MatrixColors.NEON_YELLOW)
+        self.solve_job = self.root.after(1, self.solve_step)
+    
+    def solve_step(self):
+        """Run one solver slice and reschedule until proved or out of budget"""
+        self.solve_job = None
+        player = self.current_player
+        result = self.solver.solve(self.board, player, max_nodes=SOLVE_SLICE_NODES)
+        if result['result'] == 'unknown' and result['total_nodes'] < SOLVE_BUDGET_NODES:
+            self.solve_job = self.root.after(1, self.solve_step)
+            return
+        
+        verdicts = {
+            'win': (f"PROVED WIN FOR {player}", MatrixColors.NEON_GREEN),
+            'loss': (f"PROVED LOSS FOR {player}", MatrixColors.NEON_PINK),
+            'draw': ("PROVED DRAW", MatrixColors.NEON_YELLOW),
+            'unknown': ("UNDECIDED", MatrixColors.NEON_CYAN),
+            'memory': ("UNDECIDED: SOLVER MEMORY FULL", MatrixColors.NEON_PINK)
+        }
+        verdict, color = verdicts[result['result']]
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_message(f"[{timestamp}] SOLVE[{verdict}] NODES[{result['total_nodes']}] "
+                         f"ENTRIES[{result['entries']}]\n")
+        self.status_label.config(text=verdict, fg=color)
+    
+    def stop_solving(self):
+        """Cancel the pending solver slice; proved entries are kept"""
+        if self.solve_job is not None:
+            self.root.after_cancel(self.solve_job)
+            self.solve_job = None
+    
+    def open_ultimate(self):
+        """Open the Ultimate window, or raise it if it is already open"""
+        self.build_secondary_panels()
+        if self.ultimate_window is not None and self.ultimate_window.window.winfo_exists():
+            self.ultimate_window.window.lift()
+            return
+        self.ultimate_window = UltimateWindow(self.root, self.log_message)
+    
+    def search_root(self, board_state, player, states_evaluated):
+        """Search the root position with the engine, using the strategy selected in CONFIG"""
+        self.ai.strategy = self.strategy.get()
+        self.ai.use_pruning = self.use_pruning.get()
+        self.ai.symmetric_moves = 0
+        result = self.ai.minimax(board_state, player, 0, float('-inf'), float('inf'), states_evaluated)
+        self.symmetric_moves += self.ai.symmetric_moves
+        return result
     
     def check_winner_state(self, board_state, player):
         """Check if player won in given board state"""
@@ -608,6 +858,7 @@ class TicTacToeMatrixGUI:
     
     def handle_game_end(self, result):
         """Handle game end"""
+        self.ensure_stats()
         self.game_active = False
         self.stats['games'] += 1
         
@@ -641,6 +892,10 @@ class TicTacToeMatrixGUI:
         self.board = [''] * 9
         self.current_player = 'X'
         self.game_active = True
+        self.stop_pondering()
+        self.stop_solving()
+        self.ponderer.discard()
+        self.ai.tt.clear()
         
         for btn in self.buttons:
             btn.config(
@@ -651,7 +906,8 @@ class TicTacToeMatrixGUI:
             )
         
         self.status_label.config(text="YOUR MOVE", fg=MatrixColors.NEON_CYAN)
-        self.draw_initial_tree()
+        if self.panels_ready:
+            self.draw_initial_tree()
     
     def update_status(self):
         """Update status display"""
@@ -660,28 +916,49 @@ class TicTacToeMatrixGUI:
         else:
             self.status_label.config(text="AI PROCESSING...", fg=MatrixColors.NEON_YELLOW)
     
-    def log_decision(self, move, score, states, time_ms):
+    def log_decision(self, move, score, states, time_ms, cache_hit=False, symmetric_moves=0,
+                     ponder=None, saved_ms=0):
         """Log AI decision"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] MOVE[{move}] SCORE[{score}] STATES[{states}] TIME[{time_ms:.1f}ms]\n"
-        
+        cache = " CACHE[HIT]" if cache_hit else ""
+        symmetry = f" SYMMETRY[-{symmetric_moves} MOVES]" if symmetric_moves else ""
+        if ponder == 'hit':
+            symmetry += f" PONDER[HIT -{saved_ms:.1f}ms]"
+        elif ponder == 'miss':
+            symmetry += " PONDER[MISS]"
+        log_entry = f"[{timestamp}] MOVE[{move}] SCORE[{score}] STATES[{states}] TIME[{time_ms:.1f}ms]{cache}{symmetry}\n"
+        self.log_message(log_entry)
+    
+    def on_learning_toggle(self, *args):
+        """Load the experience cache when LEARNING is switched on"""
+        if self.learning_mode.get() and not self.experience.loaded:
+            self.experience.load()
+            cache = self.experience.summary()
+            self.log_message(f">> EXPERIENCE CACHE: {cache['positions']} POSITIONS "
+                             f"LOADED IN {cache['load_ms']:.1f}ms\n")
+        self.update_stats_display()
+    
+    def log_message(self, text):
+        """Append a line to the system log"""
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, log_entry)
+        self.log_text.insert(tk.END, text)
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
     
     def visualize_tree(self, selected_move, states):
         """Visualize decision tree on canvas"""
         canvas = self.viz_canvas
-        canvas.delete("all")
+        canvas.delete("tree")
         
-        # Draw grid background
-        for i in range(0, 460, 20):
-            canvas.create_line(i, 0, i, 180, fill=MatrixColors.GRID_COLOR)
+        # Grid background is drawn once and only shown/hidden afterwards
+        if not canvas.find_withtag("grid"):
+            for i in range(0, 460, 20):
+                canvas.create_line(i, 0, i, 180, fill=MatrixColors.GRID_COLOR, tags="grid")
+        canvas.itemconfigure("grid", state=tk.NORMAL)
         
         # Root node
-        canvas.create_oval(215, 20, 245, 50, fill=MatrixColors.NEON_CYAN, outline=MatrixColors.NEON_CYAN, width=2)
-        canvas.create_text(230, 35, text="AI", fill=MatrixColors.DARK_BG, font=("Courier New", 10, "bold"))
+        canvas.create_oval(215, 20, 245, 50, fill=MatrixColors.NEON_CYAN, outline=MatrixColors.NEON_CYAN, width=2, tags="tree")
+        canvas.create_text(230, 35, text="AI", fill=MatrixColors.DARK_BG, font=("Courier New", 10, "bold"), tags="tree")
         
         # Branches
         branches = min(len([c for c in self.board if c == '']), 9)
@@ -691,29 +968,33 @@ class TicTacToeMatrixGUI:
             x = 30 + i * spacing + 15
             
             # Line
-            canvas.create_line(230, 50, x, 130, fill=MatrixColors.NEON_GREEN, width=2)
+            canvas.create_line(230, 50, x, 130, fill=MatrixColors.NEON_GREEN, width=2, tags="tree")
             
             # Node
             if i == 0:
-                canvas.create_oval(x-10, 130, x+10, 150, fill=MatrixColors.NEON_YELLOW, outline=MatrixColors.NEON_YELLOW, width=2)
-                canvas.create_text(x, 140, text=str(i), fill=MatrixColors.DARK_BG, font=("Courier New", 9, "bold"))
+                canvas.create_oval(x-10, 130, x+10, 150, fill=MatrixColors.NEON_YELLOW, outline=MatrixColors.NEON_YELLOW, width=2, tags="tree")
+                canvas.create_text(x, 140, text=str(i), fill=MatrixColors.DARK_BG, font=("Courier New", 9, "bold"), tags="tree")
             else:
-                canvas.create_oval(x-8, 132, x+8, 148, fill=MatrixColors.GRID_COLOR, outline=MatrixColors.NEON_GREEN, width=1)
-                canvas.create_text(x, 140, text=str(i), fill=MatrixColors.NEON_GREEN, font=("Courier New", 8))
+                canvas.create_oval(x-8, 132, x+8, 148, fill=MatrixColors.GRID_COLOR, outline=MatrixColors.NEON_GREEN, width=1, tags="tree")
+                canvas.create_text(x, 140, text=str(i), fill=MatrixColors.NEON_GREEN, font=("Courier New", 8), tags="tree")
         
         # Stats
         canvas.create_text(10, 170, text=f"EVALUATED: {states} STATES", anchor="w", 
-                          fill=MatrixColors.NEON_CYAN, font=("Courier New", 8))
+                          fill=MatrixColors.NEON_CYAN, font=("Courier New", 8), tags="tree")
     
     def draw_initial_tree(self):
         """Draw initial tree visualization"""
         canvas = self.viz_canvas
-        canvas.delete("all")
+        canvas.delete("tree")
+        canvas.itemconfigure("grid", state=tk.HIDDEN)
         canvas.create_text(230, 90, text=">> AWAITING AI COMPUTATION <<", 
-                          fill=MatrixColors.TERMINAL_GREEN, font=("Courier New", 10))
+                          fill=MatrixColors.TERMINAL_GREEN, font=("Courier New", 10), tags="tree")
     
     def update_stats_display(self):
         """Update all statistics displays"""
+        if not self.panels_ready:
+            return
+        
         win_rate = (self.stats['ai_wins'] / self.stats['games'] * 100) if self.stats['games'] > 0 else 0
         avg_states = self.stats['total_states'] // self.stats['decisions'] if self.stats['decisions'] > 0 else 0
         avg_time = self.stats['total_time'] / self.stats['decisions'] if self.stats['decisions'] > 0 else 0
@@ -735,9 +1016,24 @@ class TicTacToeMatrixGUI:
         self.score_labels['player_wins'].config(text=str(self.stats['player_wins']))
         self.score_labels['draws'].config(text=str(self.stats['draws']))
         self.score_labels['total_states'].config(text=str(self.stats['total_states']))
+        
+        cache = self.experience.summary()
+        self.score_labels['cache_entries'].config(text=str(cache['positions']))
+        self.score_labels['cache_hit_rate'].config(text=f"{cache['hit_rate']:.0f}%")
+        
+        tt = self.ai.tt.summary()
+        self.score_labels['tt_entries'].config(text=f"{tt['entries']:,}")
+        self.score_labels['tt_hit_rate'].config(text=f"{tt['hit_rate']:.0f}%")
+        self.score_labels['tt_footprint'].config(text=f"{tt['megabytes']:.1f}MB")
+        
+        ponder = self.ponderer.summary()
+        self.score_labels['ponder_hit_rate'].config(text=f"{ponder['hit_rate']:.0f}%")
+        self.score_labels['ponder_saved'].config(text=f"{ponder['saved_per_move_ms']:.1f}ms")
     
     def clear_stats(self):
         """Clear all statistics"""
+        self.build_secondary_panels()
+        self.ensure_stats()
         if messagebox.askyesno("Clear Statistics", "⚠ RESET ALL STATISTICS? ⚠"):
             self.stats = {
                 'games': 0,
@@ -748,6 +1044,8 @@ class TicTacToeMatrixGUI:
                 'total_time': 0,
                 'decisions': 0
             }
+            self.ai.tt.clear()
+            self.ai.analysis_cache.clear()
             self.save_stats()
             self.update_stats_display()
             
@@ -763,6 +1061,11 @@ class TicTacToeMatrixGUI:
                 json.dump(self.stats, f, indent=2)
         except Exception:
             pass
+        
+        try:
+            self.experience.save()
+        except Exception:
+            pass
     
     def load_stats(self):
         """Load statistics from file"""
@@ -779,13 +1082,37 @@ class TicTacToeMatrixGUI:
             label.config(text=current_text[:-1])
         else:
             label.config(text=current_text + "_")
-        self.root.after(500, lambda: self.animate_title_cursor(label))
+        self.cursor_job = self.root.after(500, lambda: self.animate_title_cursor(label))
+    
+    def pause_animations(self):
+        """Stop idle animation timers"""
+        if self.cursor_job is not None:
+            self.root.after_cancel(self.cursor_job)
+            self.cursor_job = None
     
-    def animate_matrix_rain(self):
-        """Animate Matrix rain effect"""
-        # This would add falling code effect in the background
-        # For simplicity, we'll just add a subtle pulse effect to the title
-        self.root.after(2000, self.animate_matrix_rain)
+    def resume_animations(self):
+        """Restart idle animation timers if they are not running"""
+        if self.cursor_job is None:
+            self.animate_title_cursor(self.title_label)
+    
+    def on_visibility_change(self, event=None):
+        """Re-check focus/minimised state once pending focus events settle"""
+        if self.visibility_job is None:
+            self.visibility_job = self.root.after_idle(self.update_animation_state)
+    
+    def update_animation_state(self):
+        """Run idle animations only while the window is visible and focused"""
+        self.visibility_job = None
+        try:
+            focused = self.root.focus_displayof() is not None
+        except KeyError:
+            # Tk dialogs (e.g. messagebox) hold focus under an unknown widget name
+            focused = True
+        
+        if self.root.state() == 'iconic' or not focused:
+            self.pause_animations()
+        elif self.panels_ready:
+            self.resume_animations()
     
     def animate_win(self):
         """Animate win effect"""
@@ -798,6 +1125,168 @@ class TicTacToeMatrixGUI:
             time.sleep(0.1)
 
 
+class UltimateWindow:
+    """Ultimate tic-tac-toe window: the player is X, the bitboard engine O"""
+    
+    def __init__(self, master, log):
+        self.window = tk.Toplevel(master)
+        self.window.title("⚡ ULTIMATE NEURAL NET ⚡")
+        self.window.configure(bg=MatrixColors.DARK_BG)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.log = log
+        self.engine = UltimateEngine(cache_mb=ULTIMATE_CACHE_MB, time_ms=ULTIMATE_THINK_MS)
+        self.board = UltimateBoard()
+        self.ai_job = None
+        self.worker = None
+        self.result = None
+        self.events = queue.Queue()
+        self.engine.progress = SearchProgress(self.events.put, ULTIMATE_PROGRESS_MS)
+        
+        self.status_label = tk.Label(
+            self.window,
+            text="YOUR MOVE",
+            font=("Courier New", 14, "bold"),
+            fg=MatrixColors.NEON_CYAN,
+            bg=MatrixColors.DARK_BG,
+            pady=10
+        )
+        self.status_label.pack()
+        
+        # Nine sub-board frames of nine buttons; button index = move number
+        grid = tk.Frame(self.window, bg=MatrixColors.NEON_GREEN)
+        grid.pack(padx=20, pady=10)
+        self.buttons = [None] * 81
+        for sub_board in range(9):
+            frame = tk.Frame(grid, bg=MatrixColors.DARK_BG)
+            frame.grid(row=sub_board // 3, column=sub_board % 3, padx=2, pady=2)
+            for cell in range(9):
+                move = sub_board * 9 + cell
+                btn = tk.Button(
+                    frame,
+                    text="",
+                    font=("Courier New", 14, "bold"),
+                    width=2,
+                    bg=MatrixColors.GRID_COLOR,
+                    fg=MatrixColors.NEON_GREEN,
+                    activebackground=MatrixColors.NEON_CYAN,
+                    relief=tk.RAISED,
+                    bd=2,
+                    command=lambda m=move: self.on_cell_click(m)
+                )
+                btn.grid(row=cell // 3, column=cell % 3, padx=1, pady=1)
+                self.buttons[move] = btn
+        
+        new_btn = tk.Button(
+            self.window,
+            text="⟳ NEW GAME",
+            font=("Courier New", 10, "bold"),
+            bg=MatrixColors.NEON_GREEN,
+            fg=MatrixColors.DARK_BG,
+            activebackground=MatrixColors.TERMINAL_GREEN,
+            command=self.new_game,
+            relief=tk.RAISED,
+            bd=3,
+            padx=20,
+            pady=8
+        )
+        new_btn.pack(pady=10)
+        self.refresh()
+    
+    def new_game(self):
+        """Start over from the empty board"""
+        self.cancel_ai()
+        self.board = UltimateBoard()
+        self.engine.clear()
+        self.refresh()
+    
+    def on_cell_click(self, move):
+        """Play the player's move and start the engine's search"""
+        if self.ai_job is not None or self.board.winner() is not None or move not in self.board.legal_moves():
+            return
+        self.board.play(move)
+        self.refresh()
+        if self.board.winner() is None:
+            self.status_label.config(text="AI PROCESSING...", fg=MatrixColors.NEON_YELLOW)
+            self.result = None
+            self.worker = threading.Thread(target=self.search, args=(self.board.copy(),), daemon=True)
+            self.worker.start()
+            self.ai_job = self.window.after(ULTIMATE_POLL_MS, self.poll_search)
+    
+    def search(self, board):
+        """Worker thread: search a copy of the board"""
+        self.result = self.engine.search(board)
+    
+    def poll_search(self):
+        """Show the latest progress event; play the move once the worker is done"""
+        event = None
+        while not self.events.empty():
+            event = self.events.get_nowait()
+        if event is not None and event['move'] is not None:
+            self.status_label.config(
+                text=f"DEPTH {event['depth']} • BEST {event['move']} • {event['nodes_per_sec']:,.0f} NODES/S",
+                fg=MatrixColors.NEON_YELLOW)
+        if self.worker.is_alive():
+            self.ai_job = self.window.after(ULTIMATE_POLL_MS, self.poll_search)
+        else:
+            self.ai_move()
+    
+    def ai_move(self):
+        """Play the move the worker found"""
+        self.ai_job = None
+        self.worker = None
+        move, info = self.result
+        self.board.play(move)
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log(f"[{timestamp}] ULTIMATE MOVE[{move}] SCORE[{info['score']}] DEPTH[{info['depth']}] "
+                 f"NODES[{info['nodes']}] TIME[{info['time_ms']:.1f}ms] NPS[{info['nodes_per_sec']:.0f}]\n")
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw marks, won sub-boards and the sub-boards open to the side to move"""
+        result = self.board.winner()
+        legal = set(self.board.legal_moves()) if result is None else set()
+        colors = {'X': MatrixColors.NEON_CYAN, 'O': MatrixColors.NEON_PINK}
+        for move, btn in enumerate(self.buttons):
+            mark = self.board.cell(move)
+            owner = self.board.board_owner(move // 9)
+            if owner in colors:
+                bg = MatrixColors.DARKER_BG
+            elif move in legal:
+                bg = MatrixColors.GRID_COLOR
+            else:
+                bg = MatrixColors.DARK_BG
+            btn.config(text=mark or (owner.lower() if owner in colors else ""),
+                       fg=colors.get(mark or owner, MatrixColors.NEON_GREEN), bg=bg,
+                       state=tk.NORMAL if move in legal else tk.DISABLED)
+        
+        if result == 'X':
+            self.status_label.config(text="⚡ PLAYER VICTORY ⚡", fg=MatrixColors.NEON_CYAN)
+        elif result == 'O':
+            self.status_label.config(text="⚠ AI DOMINANCE ⚠", fg=MatrixColors.NEON_PINK)
+        elif result == 'draw':
+            self.status_label.config(text="≈ DRAW ≈", fg=MatrixColors.NEON_YELLOW)
+        elif self.board.player == 'X':
+            self.status_label.config(text="YOUR MOVE", fg=MatrixColors.NEON_CYAN)
+    
+    def cancel_ai(self):
+        """Stop a running search and drop its move"""
+        if self.ai_job is not None:
+            self.window.after_cancel(self.ai_job)
+            self.ai_job = None
+        if self.worker is not None:
+            self.engine.stop()
+            self.worker.join()
+            self.engine.stopped = False
+            self.worker = None
+        while not self.events.empty():
+            self.events.get_nowait()
+    
+    def close(self):
+        """Close the window"""
+        self.cancel_ai()
+        self.window.destroy()
+
+
 def main():
     """Main entry point"""
     root = tk.Tk()
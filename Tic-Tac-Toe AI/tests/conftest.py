@@ -0,0 +1,6 @@
+"""Make the CLI modules importable the way the scripts import each other"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cli'))
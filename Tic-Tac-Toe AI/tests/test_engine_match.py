@@ -0,0 +1,81 @@
+"""SPRT bookkeeping and decisions on synthetic pair results"""
+
+import math
+
+import pytest
+
+from engine_match import SPRT, elo_from_score, expected_score
+
+
+def run(sprt, stream, max_pairs=10000):
+    """Add pair points from stream until the test decides; return the decision and pairs used"""
+    for pairs in range(1, max_pairs + 1):
+        sprt.add(stream(pairs))
+        status = sprt.status()
+        if status is not None:
+            return status, pairs
+    return None, max_pairs
+
+
+def test_pentanomial_counts():
+    sprt = SPRT()
+    for points in (0, 0.5, 1, 1, 1.5, 2, 2, 2):
+        sprt.add(points)
+    assert sprt.pentanomial == [1, 1, 2, 1, 3]
+    assert sprt.pairs == 8
+
+
+def test_mean_variance_include_one_spread_pseudo_pair():
+    sprt = SPRT()
+    assert sprt.mean_variance() == pytest.approx((0.5, 0.125))
+    for _ in range(4):
+        sprt.add(2)
+    counts = [0.2, 0.2, 0.2, 0.2, 4.2]
+    scores = [0, 0.25, 0.5, 0.75, 1]
+    mean = sum(c * s for c, s in zip(counts, scores)) / 5
+    variance = sum(c * (s - mean) ** 2 for c, s in zip(counts, scores)) / 5
+    assert sprt.mean_variance() == pytest.approx((mean, variance))
+
+
+def test_no_pairs_is_undecided():
+    sprt = SPRT()
+    assert sprt.llr() == 0.0
+    assert sprt.status() is None
+
+
+def test_all_draws_accept_h1_under_the_default_bounds():
+    sprt = SPRT()
+    sprt.add(1)
+    assert sprt.status() is None
+    status, _ = run(sprt, lambda pair: 1)
+    assert status == 'H1'
+    assert sprt.llr() >= sprt.upper
+    low, estimate, high = sprt.elo()
+    assert estimate == pytest.approx(0, abs=1e-6)
+    assert low == pytest.approx(-high)
+    assert low < 0 < high
+
+
+def test_losing_stream_accepts_h0():
+    sprt = SPRT()
+    status, _ = run(sprt, lambda pair: (0, 0.5, 1)[pair % 3])
+    assert status == 'H0'
+    assert sprt.llr() <= sprt.lower
+    low, estimate, high = sprt.elo()
+    assert low < estimate < high < sprt.elo0
+
+
+def test_bounds_follow_the_error_rates():
+    sprt = SPRT(alpha=0.05, beta=0.1)
+    assert sprt.upper == pytest.approx(math.log(0.9 / 0.05))
+    assert sprt.lower == pytest.approx(math.log(0.1 / 0.95))
+
+
+@pytest.mark.parametrize('elo', [-800, -400, -100, -20, 0, 5, 20, 100, 400, 800])
+def test_elo_from_score_inverts_expected_score(elo):
+    assert elo_from_score(expected_score(elo)) == pytest.approx(elo, abs=1e-6)
+
+
+def test_expected_score_is_symmetric():
+    assert expected_score(0) == 0.5
+    assert expected_score(100) + expected_score(-100) == pytest.approx(1)
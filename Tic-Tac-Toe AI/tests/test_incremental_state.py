@@ -0,0 +1,71 @@
+"""Incremental line counts and game-over checks against from-scratch recomputation"""
+
+import random
+
+import pytest
+
+from tic_tac_toe_matrix_cli import TicTacToeAI
+
+
+def expected_result(ai, board):
+    """Game result computed from scratch with check_winner"""
+    for player in ('X', 'O'):
+        if ai.check_winner(board, player):
+            return player
+    if ai.is_board_full(board):
+        return 'draw'
+    return None
+
+
+def assert_consistent(ai):
+    assert ai.line_counts == ai.lines.count_lines(ai.board)
+    assert ai.check_game_over() == expected_result(ai, ai.board)
+
+
+def test_every_reachable_3x3_position():
+    ai = TicTacToeAI(3)
+    seen = set()
+
+    def walk(player):
+        position = tuple(ai.board)
+        if position in seen:
+            return
+        seen.add(position)
+        assert_consistent(ai)
+        if ai.check_game_over() is not None:
+            return
+        for move in ai.get_available_moves(ai.board):
+            assert ai.make_move(move, player)
+            walk('O' if player == 'X' else 'X')
+            assert ai.undo_move() == move
+        assert tuple(ai.board) == position
+
+    walk('X')
+    assert len(seen) == 5478
+    assert ai.line_counts == ai.lines.count_lines([''] * 9)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_4x4_games_with_three_in_a_row(seed):
+    ai = TicTacToeAI(4, 3)
+    rng = random.Random(seed)
+    player = 'X'
+    while ai.check_game_over() is None:
+        move = rng.choice(ai.get_available_moves(ai.board))
+        won = ai.lines.place(ai.board, ai.line_counts, move, player)
+        assert won == ai.check_winner(ai.board, player)
+        ai.lines.unplace(ai.board, ai.line_counts, move, player)
+        assert_consistent(ai)
+
+        assert ai.make_move(move, player)
+        assert_consistent(ai)
+        if ai.move_history and rng.random() < 0.25:
+            ai.undo_move()
+            assert_consistent(ai)
+        player = 'X' if len(ai.move_history) % 2 == 0 else 'O'
+
+
+@pytest.mark.parametrize('size, win_length', [(3, 4), (3, 0), (4, 5)])
+def test_win_length_must_fit_the_board(size, win_length):
+    with pytest.raises(ValueError):
+        TicTacToeAI(size, win_length)
@@ -0,0 +1,89 @@
+"""Proof-number solver results against brute force on every reachable 3x3 position"""
+
+from functools import lru_cache
+
+import pytest
+
+from proof_number import METHODS, ProofNumberSearch
+from symmetry import SymmetryTables
+from win_lines import generate_win_patterns
+
+PATTERNS = generate_win_patterns(3, 3)
+OTHER = {'X': 'O', 'O': 'X'}
+
+
+def winner(board):
+    """Owner of a complete line, if any"""
+    for pattern in PATTERNS:
+        marks = {board[cell] for cell in pattern}
+        if len(marks) == 1 and '' not in marks:
+            return marks.pop()
+    return None
+
+
+@lru_cache(maxsize=None)
+def brute_force(board, player):
+    """'win', 'loss' or 'draw' for player to move, by full minimax"""
+    won = winner(board)
+    if won is not None:
+        return 'win' if won == player else 'loss'
+    if '' not in board:
+        return 'draw'
+    results = set()
+    for cell, mark in enumerate(board):
+        if mark == '':
+            child = board[:cell] + (player,) + board[cell + 1:]
+            results.add(brute_force(child, OTHER[player]))
+    if 'loss' in results:
+        return 'win'
+    return 'draw' if 'draw' in results else 'loss'
+
+
+def reachable_positions():
+    """Every position reachable from the empty board, with the side to move"""
+    seen = {}
+
+    def walk(board, player):
+        if board in seen:
+            return
+        seen[board] = player
+        if winner(board) is not None:
+            return
+        for cell, mark in enumerate(board):
+            if mark == '':
+                walk(board[:cell] + (player,) + board[cell + 1:], OTHER[player])
+
+    walk(('',) * 9, 'X')
+    return list(seen.items())
+
+
+POSITIONS = reachable_positions()
+
+
+@pytest.mark.parametrize('use_symmetry', [False, True])
+@pytest.mark.parametrize('method', METHODS)
+def test_every_reachable_position(method, use_symmetry):
+    symmetry = SymmetryTables(3) if use_symmetry else None
+    solver = ProofNumberSearch(PATTERNS, 9, method=method, symmetry=symmetry)
+    assert len(POSITIONS) == 5478
+    for board, player in POSITIONS:
+        result = solver.solve(list(board), player)
+        assert result['result'] == brute_force(board, player), (board, player)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_resumed_solves_agree(method):
+    # max_nodes=1 is raised to cells + 1 = 10; a pns expansion may add its
+    # children (up to 9) past the budget
+    limit = 10 if method == 'dfpn' else 18
+    solver = ProofNumberSearch(PATTERNS, 9, method=method, symmetry=SymmetryTables(3))
+    for board, player in POSITIONS[::97]:
+        total = 0
+        for _ in range(10000):
+            result = solver.solve(list(board), player, max_nodes=1)
+            total += result['nodes']
+            assert result['nodes'] <= limit
+            assert result['total_nodes'] == total
+            if result['result'] != 'unknown':
+                break
+        assert result['result'] == brute_force(board, player), (board, player)
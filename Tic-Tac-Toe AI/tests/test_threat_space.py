@@ -0,0 +1,95 @@
+"""Threat-space wins and defences checked against every defender reply on random positions"""
+
+import random
+
+import pytest
+
+from threat_space import ThreatSpaceSearch
+from win_lines import WinLines, generate_win_patterns
+
+OTHER = {'X': 'O', 'O': 'X'}
+
+VARIANTS = [
+    # size, win_length, stones on the random positions, positions
+    (4, 3, (2, 7), 300),
+    (5, 4, (4, 11), 100),
+]
+
+
+def random_position(lines, rng, stones):
+    """A position reached by random moves without a completed line, and the side to move"""
+    while True:
+        board = [''] * lines.cells
+        counts = lines.count_lines(board)
+        player = 'X'
+        for _ in range(rng.randint(*stones)):
+            cell = rng.choice([cell for cell, mark in enumerate(board) if mark == ''])
+            if lines.place(board, counts, cell, player):
+                break
+            player = OTHER[player]
+        else:
+            return board, player
+
+
+def forced_win(search, lines, board, attacker, memo):
+    """
+    Whether attacker (to move) wins by playing find_win()'s first move
+    against every defender reply, again and again until a line is complete
+    """
+    key = (tuple(board), attacker)
+    if key not in memo:
+        found = search.find_win(board, attacker)
+        won = False
+        if found is not None:
+            move = found['line'][0]
+            assert board[move] == ''
+            if lines.place(board, lines.count_lines(board), move, attacker):
+                won = True
+            elif '' in board:
+                won = True
+                for reply in [cell for cell, mark in enumerate(board) if mark == '']:
+                    lost = lines.place(board, lines.count_lines(board), reply, OTHER[attacker])
+                    won = not lost and forced_win(search, lines, board, attacker, memo)
+                    board[reply] = ''
+                    if not won:
+                        break
+            board[move] = ''
+        memo[key] = won
+    return memo[key]
+
+
+@pytest.mark.parametrize('size, win_length, stones, positions', VARIANTS)
+def test_find_win_lines_are_forced_wins(size, win_length, stones, positions):
+    patterns = generate_win_patterns(size, win_length)
+    lines = WinLines(patterns, size * size)
+    search = ThreatSpaceSearch(patterns, size * size)
+    rng = random.Random(size * 10 + win_length)
+    found = 0
+    for _ in range(positions):
+        board, player = random_position(lines, rng, stones)
+        if search.find_win(board, player) is not None:
+            found += 1
+            assert forced_win(search, lines, board, player, {}), (board, player)
+    assert found > positions // 5
+
+
+@pytest.mark.parametrize('size, win_length, stones, positions', VARIANTS)
+def test_moves_outside_find_defence_lose(size, win_length, stones, positions):
+    patterns = generate_win_patterns(size, win_length)
+    lines = WinLines(patterns, size * size)
+    search = ThreatSpaceSearch(patterns, size * size)
+    rng = random.Random(size * 10 + win_length + 1)
+    checked = 0
+    for _ in range(positions):
+        board, player = random_position(lines, rng, stones)
+        defence = search.find_defence(board, player)
+        if defence is None:
+            continue
+        memo = {}
+        for cell, mark in enumerate(board):
+            if mark == '' and cell not in defence['moves']:
+                board[cell] = player
+                assert forced_win(search, lines, board, OTHER[player], memo), (board, player, cell)
+                board[cell] = ''
+                checked += 1
+    assert checked > positions
@@ -0,0 +1,69 @@
+"""Ultimate move generation (perft) and make/undo against from-scratch state"""
+
+import random
+
+import pytest
+
+from ultimate import BOARD_SCORE, BOARD_WEIGHT, CELL_KEYS, FORCED_KEYS, UltimateBoard, perft
+
+
+def snapshot(board):
+    """Everything play() changes and undo() must restore"""
+    return (board.masks[0][:], board.masks[1][:], board.macro[:], board.closed, board.forced,
+            board.side, board.key, board.score)
+
+
+def scratch_key(board):
+    """Zobrist key from the masks and the forced sub-board"""
+    key = FORCED_KEYS[board.forced + 1]
+    for side in (0, 1):
+        for move in range(81):
+            if board.masks[side][move // 9] >> move % 9 & 1:
+                key ^= CELL_KEYS[side][move]
+    return key
+
+
+def scratch_score(board):
+    """Weighted BOARD_SCORE of the open sub-boards, for X"""
+    x, o = board.masks
+    return sum(BOARD_WEIGHT[b] * BOARD_SCORE[x[b] | o[b] << 9] for b in range(9) if not board.closed >> b & 1)
+
+
+@pytest.mark.parametrize('depth, leaves', [(1, 81), (2, 720), (3, 6336), (4, 55080)])
+def test_perft(depth, leaves):
+    assert perft(UltimateBoard(), depth) == leaves
+
+
+def test_make_undo_round_trip_over_random_games():
+    rng = random.Random(49)
+    for _ in range(200):
+        board = UltimateBoard()
+        states = []
+        while board.winner() is None:
+            move = rng.choice(board.legal_moves())
+            states.append(snapshot(board))
+            board.play(move)
+            assert board.key == scratch_key(board)
+            assert board.score == scratch_score(board)
+        while states:
+            board.undo()
+            assert snapshot(board) == states.pop()
+        assert board.history == []
+
+
+def test_peek_matches_play():
+    rng = random.Random(490)
+    for _ in range(50):
+        board = UltimateBoard()
+        while board.winner() is None:
+            for move in board.legal_moves():
+                peeked = board.peek(move)
+                won = board.play(move)
+                if won:
+                    assert peeked is None
+                elif board.winner() == 'draw':
+                    assert peeked == 0.0
+                else:
+                    assert peeked == pytest.approx(-board.evaluate())
+                board.undo()
+            board.play(rng.choice(board.legal_moves()))
@@ -0,0 +1,63 @@
+"""Zobrist keys on every 3x3 board: collisions, symmetry and incremental updates"""
+
+import itertools
+import random
+
+import pytest
+
+from tic_tac_toe_matrix_cli import TicTacToeAI
+from zobrist import ZobristKeys
+
+ALL_BOARDS = [list(cells) for cells in itertools.product(('', 'X', 'O'), repeat=9)]
+
+
+def transform(board, perm):
+    """The board with every cell moved to perm[cell]"""
+    result = [''] * len(board)
+    for cell, mark in enumerate(board):
+        result[perm[cell]] = mark
+    return result
+
+
+def test_distinct_boards_have_distinct_keys():
+    zobrist = ZobristKeys(3)
+    keys = {zobrist.key(board) for board in ALL_BOARDS}
+    assert len(keys) == len(ALL_BOARDS)
+
+
+def test_symmetric_boards_share_the_canonical_key():
+    zobrist = ZobristKeys(3)
+    classes = {}
+    for board in ALL_BOARDS:
+        keys = zobrist.symmetric_keys(board)
+        assert keys[0] == zobrist.key(board)
+        canonical = zobrist.canonical(keys)
+        for perm in zobrist.symmetries:
+            image = transform(board, perm)
+            assert zobrist.key(image) in keys
+            assert zobrist.canonical(zobrist.symmetric_keys(image)) == canonical
+        orbit = min(tuple(transform(board, perm)) for perm in zobrist.symmetries)
+        classes.setdefault(canonical, set()).add(orbit)
+
+    # One canonical key per symmetry class and no two classes sharing one
+    assert all(len(orbits) == 1 for orbits in classes.values())
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_keys_match_recomputation(seed):
+    ai = TicTacToeAI(3)
+    rng = random.Random(seed)
+    symmetric = [0] * 8
+    for _ in range(200):
+        moves = ai.get_available_moves(ai.board)
+        if ai.move_history and (not moves or ai.check_game_over() or rng.random() < 0.4):
+            cell = ai.move_history[-1]
+            symmetric = ai.zobrist.toggle_symmetric(symmetric, cell, ai.board[cell])
+            ai.undo_move()
+        else:
+            player = 'X' if len(ai.move_history) % 2 == 0 else 'O'
+            cell = rng.choice(moves)
+            ai.make_move(cell, player)
+            symmetric = ai.zobrist.toggle_symmetric(symmetric, cell, player)
+        assert ai.key == ai.zobrist.key(ai.board)
+        assert symmetric == ai.zobrist.symmetric_keys(ai.board)